@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Maintain archives/manifest.json, the inventory of archive snapshots.
+
+Every writer of an ``archives/`` snapshot calls ``record_snapshot`` and every
+reader asks ``snapshots`` instead of globbing and regex-filtering the folder.
+Each entry records the file name, date, kind (daily/podcast), byte size,
+sha256 and, for v7 daily snapshots, the ids of the rows it shows per feed
+(``content_row_id``, the same ids the search index uses). The manifest is
+rebuilt from the folder only when it is missing or when ``--refresh`` is run
+by hand; entries whose file was deleted are dropped (and the manifest
+rewritten) the next time it is read. It carries no timestamp, so it only
+changes when a snapshot does.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SNAPSHOT_PATTERNS = (
+    ("daily", re.compile(r"^(\d{4}-\d{2}-\d{2})\.html$")),
+    ("podcast", re.compile(r"^podcast-(\d{4}-\d{2}-\d{2})\.html$")),
+)
+ARCHIVE_FEEDS_RE = re.compile(r"\bconst\s+archiveFeeds\s*=\s*")
+
+
+def snapshot_kind(name):
+    """Return ``(kind, date)`` for an archive file name, or ``(None, None)``."""
+    for kind, pattern in SNAPSHOT_PATTERNS:
+        match = pattern.match(name)
+        if match:
+            return kind, match.group(1)
+    return None, None
+
+
+def manifest_path(archive_dir):
+    return Path(archive_dir) / MANIFEST_NAME
+
+
+def content_row_id(kind, url, title):
+    """Stable id of a feed row, derived from its URL (or title when it has none)."""
+    return hashlib.sha1(f"{kind}|{url or title}".encode("utf-8")).hexdigest()[:10]
+
+
+def feed_row_ids(deep_rows, podcast_rows, x_rows):
+    """Row ids per feed for the rows a v7 daily snapshot shows."""
+    return {
+        "deep": [content_row_id("analysis", row.get("url") or "", row.get("title") or "") for row in deep_rows],
+        "podcast": [
+            content_row_id("podcast", row.get("original_link") or "", row.get("title") or "") for row in podcast_rows
+        ],
+        "x": [content_row_id("x", row.get("post_url") or "", f"@{row.get('handle') or 'x'}") for row in x_rows],
+    }
+
+
+def snapshot_row_ids(path, content):
+    """Resolve the ``archiveFeeds`` chunk descriptor a v7 daily snapshot embeds into row ids."""
+    text = content.decode("utf-8", errors="ignore")
+    match = ARCHIVE_FEEDS_RE.search(text)
+    if not match:
+        return None
+    try:
+        feeds, _end = json.JSONDecoder().raw_decode(text[match.end():])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(feeds, dict):
+        return None
+
+    chunk_dir = Path(path).parent.parent / "data" / "chunks"
+    rows_by_feed = {}
+    for feed in ("deep", "podcast", "x"):
+        rows = []
+        for chunk in (feeds.get(feed) or {}).get("chunks", []):
+            try:
+                rows.extend(json.loads((chunk_dir / f"{chunk}.json").read_text(encoding="utf-8")))
+            except (OSError, json.JSONDecodeError):
+                return None
+        # Chunks are stored oldest first; snapshots show rows newest first.
+        rows_by_feed[feed] = list(reversed(rows))
+    return feed_row_ids(rows_by_feed["deep"], rows_by_feed["podcast"], rows_by_feed["x"])
+
+
+def snapshot_entry(path, row_ids=None):
+    content = path.read_bytes()
+    kind, date = snapshot_kind(path.name)
+    if row_ids is None and kind == "daily":
+        row_ids = snapshot_row_ids(path, content)
+    entry = {
+        "file": path.name,
+        "date": date,
+        "kind": kind,
+        "bytes": len(content),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+    if row_ids:
+        entry["row_ids"] = row_ids
+    return entry
+
+
+def read_manifest(archive_dir):
+    path = manifest_path(archive_dir)
+    if not path.exists():
+        return None
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    if not isinstance(manifest.get("snapshots"), dict):
+        return None
+    return manifest
+
+
+def write_manifest(archive_dir, manifest):
+    """Atomically replace the manifest; skip the write when nothing changed."""
+    path = manifest_path(archive_dir)
+    snapshots_by_file = dict(sorted(manifest["snapshots"].items()))
+    current = read_manifest(archive_dir)
+    if current and current["snapshots"] == snapshots_by_file and "updated_at" not in current:
+        return False
+    payload = {
+        "version": MANIFEST_VERSION,
+        "snapshots": snapshots_by_file,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp_path, path)
+    return True
+
+
+def refresh_manifest(archive_dir):
+    """Rebuild the manifest by rescanning and rehashing the folder."""
+    archive_dir = Path(archive_dir)
+    snapshots_by_file = {}
+    if archive_dir.exists():
+        for path in archive_dir.iterdir():
+            if snapshot_kind(path.name)[0] and path.is_file():
+                snapshots_by_file[path.name] = snapshot_entry(path)
+    manifest = {"snapshots": snapshots_by_file}
+    write_manifest(archive_dir, manifest)
+    return manifest
+
+
+def load_manifest(archive_dir):
+    return read_manifest(archive_dir) or refresh_manifest(archive_dir)
+
+
+def snapshots(archive_dir, kind=None):
+    """Return manifest entries (oldest first), optionally limited to one kind."""
+    manifest = load_manifest(archive_dir)
+    missing = [name for name in manifest["snapshots"] if not (Path(archive_dir) / name).is_file()]
+    if missing:
+        for name in missing:
+            del manifest["snapshots"][name]
+        write_manifest(archive_dir, manifest)
+    entries = manifest["snapshots"].values()
+    return sorted(
+        (entry for entry in entries if kind is None or entry.get("kind") == kind),
+        key=lambda entry: (entry.get("date") or "", entry.get("file") or ""),
+    )
+
+
+def snapshot_paths(archive_dir, kind=None):
+    return [Path(archive_dir) / entry["file"] for entry in snapshots(archive_dir, kind)]
+
+
+def record_snapshot(path, row_ids=None):
+    """Add or update one snapshot after it has been written."""
+    path = Path(path)
+    if snapshot_kind(path.name)[0] is None:
+        return None
+    manifest = read_manifest(path.parent)
+    if manifest is None:
+        manifest = refresh_manifest(path.parent)
+    entry = snapshot_entry(path, row_ids=row_ids)
+    manifest["snapshots"][path.name] = entry
+    write_manifest(path.parent, manifest)
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or rebuild archives/manifest.json.")
+    parser.add_argument("--archive-dir", default="archives", help="Archive folder (default: archives).")
+    parser.add_argument("--refresh", action="store_true", help="Rescan the folder and rewrite the manifest.")
+    args = parser.parse_args()
+
+    manifest = refresh_manifest(args.archive_dir) if args.refresh else load_manifest(args.archive_dir)
+    entries = list(manifest["snapshots"].values())
+    for kind, _pattern in SNAPSHOT_PATTERNS:
+        matching = [entry for entry in entries if entry.get("kind") == kind]
+        total = sum(entry.get("bytes", 0) for entry in matching)
+        print(f"📦 {kind}: {len(matching)} snapshots, {total / 1024 / 1024:.1f} MB")
+    print(f"✅ {manifest_path(args.archive_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
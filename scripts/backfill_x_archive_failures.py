@@ -8,16 +8,11 @@ from datetime import datetime, timedelta
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 
+from x_archive_store import XArchiveStore
+from x_decode_cache import build_cache_entry, load_decode_cache, save_decode_cache
 
-DISCOVER_SCRIPT = Path(__file__).resolve().with_name("discover_public_x_posts.py")
-
-
-def load_json(path):
-    return json.loads(Path(path).read_text(encoding="utf-8"))
 
-
-def write_json(path, payload):
-    Path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+DISCOVER_SCRIPT = Path(__file__).resolve().with_name("discover_public_x_posts.py")
 
 
 def load_discover_module():
@@ -49,26 +44,6 @@ def parse_iso_datetime(value):
         return None
 
 
-def build_cache_entry(row, generated_at):
-    return {
-        "cached_from_generated_at": generated_at,
-        "google_news_url": row.get("google_news_url"),
-        "decoded_source_url": row.get("decoded_source_url"),
-        "post_url": row.get("post_url"),
-        "post_id": row.get("post_id"),
-        "screen_name": row.get("screen_name"),
-        "author_name": row.get("author_name"),
-        "author_url": row.get("author_url"),
-        "text": row.get("text"),
-        "text_length": row.get("text_length", 0),
-        "is_truncated": row.get("is_truncated", False),
-        "full_text_confident": row.get("full_text_confident", False),
-        "extraction_status": row.get("extraction_status"),
-        "oembed_status_code": row.get("oembed_status_code"),
-        "oembed_endpoint": row.get("oembed_endpoint"),
-    }
-
-
 def select_retry_candidates(rows, limit, min_age_minutes):
     now = datetime.now().astimezone()
     cutoff = now - timedelta(minutes=min_age_minutes)
@@ -134,13 +109,14 @@ def main():
     parser.add_argument("--retry-delays", default="3,8,20,45")
     args = parser.parse_args()
 
-    archive = load_json(args.archive_json)
-    decode_cache = load_json(args.decode_cache_json)
+    archive_store = XArchiveStore(args.archive_json)
+    decode_cache = load_decode_cache(args.decode_cache_json)
     mod = load_discover_module()
     retry_delays = mod.parse_retry_delays(args.retry_delays)
     now_iso = datetime.now().astimezone().isoformat()
 
-    rows = archive.get("rows", [])
+    rows = archive_store.rows
+    positions = {id(row): position for position, row in enumerate(rows)}
     selected = select_retry_candidates(rows, args.limit, args.min_age_minutes)
     attempted = 0
     recovered = 0
@@ -149,24 +125,25 @@ def main():
     for row in selected:
         attempted += 1
         success, error = retry_row(row, mod, retry_delays, now_iso)
+        archive_store.put_row(positions[id(row)], row)
         if success:
             recovered += 1
             handle = row.get("screen_name") or row.get("query", "").rsplit("/", 1)[-1]
             recovered_handles.setdefault(handle, 0)
             recovered_handles[handle] += 1
-            decode_cache.setdefault("entries", {})[row["google_news_url"]] = build_cache_entry(row, now_iso)
+            entry = build_cache_entry(row, now_iso)
+            entry["last_used_at"] = now_iso
+            decode_cache["entries"][row["google_news_url"]] = entry
         time.sleep(args.row_throttle_seconds)
 
-    archive["generated_at"] = now_iso
-    archive["backfill_stats"] = {
+    backfill_stats = {
         "attempted": attempted,
         "recovered": recovered,
         "remaining_failed": sum(1 for row in rows if row.get("extraction_status") != "text_extracted"),
     }
-    decode_cache["generated_at"] = now_iso
-
-    write_json(args.archive_json, archive)
-    write_json(args.decode_cache_json, decode_cache)
+    archive_store.set_meta(generated_at=now_iso, backfill_stats=backfill_stats)
+    archive_store.flush()
+    save_decode_cache(args.decode_cache_json, decode_cache)
 
     print(json.dumps(
         {
@@ -174,7 +151,7 @@ def main():
             "decode_cache_json": args.decode_cache_json,
             "attempted": attempted,
             "recovered": recovered,
-            "remaining_failed": archive["backfill_stats"]["remaining_failed"],
+            "remaining_failed": backfill_stats["remaining_failed"],
             "min_age_minutes": args.min_age_minutes,
             "recovered_handles": recovered_handles,
         },
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""Benchmark build_section_pages and build_site_v7 on synthetic corpora.
+
+Every corpus is generated offline into a temporary directory: N daily archive
+snapshots (legacy inline ``deepRows`` format), N deep analysis rows, N X posts
+and N/5 podcast snapshots. Each scenario runs in a fresh interpreter so peak
+RSS belongs to that scenario alone. The site_v7 ``warm`` run only measures the
+build-manifest short-circuit; ``touch`` adds one X post to an already built
+and precompressed corpus and measures the incremental rebuild (chunks, search
+index, precompression). Results are written as JSON and can be diffed against
+an earlier run with --compare.
+
+    python3 scripts/benchmark_site_build.py --sizes 50,200,800
+    python3 scripts/benchmark_site_build.py --compare reports/benchmarks/site_build_<old>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT / "scripts"
+BENCHMARK_DIR = ROOT / "reports" / "benchmarks"
+DEFAULT_SIZES = "50,200,800"
+ARCHIVE_WINDOW = 40
+START_DATE = date(2024, 1, 1)
+
+# Scenario -> (target, run kind). Section feeds run first, like the daily pipeline.
+SCENARIOS = (
+    ("section_pages", "cold"),
+    ("section_pages", "warm"),
+    ("site_v7", "cold"),
+    ("site_v7", "warm"),
+    ("site_v7", "touch"),
+)
+
+# Leaf functions whose exclusive time is attributed to each phase.
+PHASES = {
+    "section_pages": {
+        "load": ("read_text", "load_parse_cache", "podcast_rows_from_existing_feed"),
+        "parse": (
+            "parse_deep_cards_from_html",
+            "parse_podcast_cards_from_html",
+            "deep_rows_from_current_json",
+            "podcast_rows_from_current_json",
+        ),
+        "merge": ("build_deep_feed", "build_podcast_feed"),
+        "serialize": ("render_page",),
+        "write": ("write_json", "save_parse_cache"),
+    },
+    "site_v7": {
+        "load": ("read_json", "load_deep_rows", "load_podcast_rows", "load_x_posts", "load_news_data", "build_inputs"),
+        "parse": ("search_terms",),
+        "merge": ("write_row_chunks", "write_search_index"),
+        "serialize": ("module_json", "page_html", "archive_page_html"),
+        "write": ("write_file", "save_build_manifest"),
+        "precompress": ("precompress_outputs",),
+    },
+}
+
+
+def git_commit():
+    result = subprocess.run(
+        ["git", "-C", str(ROOT), "rev-parse", "--short", "HEAD"],
+        capture_output=True,
+        text=True,
+    )
+    commit = result.stdout.strip() or "unknown"
+    dirty = subprocess.run(["git", "-C", str(ROOT), "diff", "--quiet", "HEAD", "--", "scripts"])
+    return f"{commit}-dirty" if dirty.returncode == 1 else commit
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def paragraph(seed, words=60):
+    vocabulary = (
+        "AI 模型 晶片 infrastructure 供應鏈 agents 雲端 pricing 開源 regulation "
+        "資料中心 inference 投資 platform 半導體 startup 訂閱 distribution"
+    ).split()
+    return " ".join(vocabulary[(seed * 7 + index * 3) % len(vocabulary)] for index in range(words))
+
+
+def synthetic_deep_row(index):
+    day = START_DATE + timedelta(days=index)
+    body = "".join(f"<p>{paragraph(index + part)}</p>" for part in range(6))
+    return {
+        "source": f"Source {index % 7}",
+        "title": f"Synthetic analysis {index}: {paragraph(index, 8)}",
+        "url": f"https://example.com/analysis/{index}",
+        "article_date": day.isoformat(),
+        "first_seen_date": day.isoformat(),
+        "latest_seen_date": day.isoformat(),
+        "content_html": body,
+    }
+
+
+def synthetic_archive(index, deep_rows):
+    snapshot = deep_rows[max(0, index - ARCHIVE_WINDOW + 1):index + 1]
+    snapshot = list(reversed(snapshot))
+    return (
+        "<!DOCTYPE html><html><body><main id=\"app\"></main><script type=\"module\">\n"
+        f"const newsData = {json.dumps({'date': (START_DATE + timedelta(days=index)).isoformat()})};\n"
+        f"const deepRows = {json.dumps(snapshot, ensure_ascii=False)};\n"
+        "const podcastRows = [];\nconst xRows = [];\n</script></body></html>\n"
+    )
+
+
+def synthetic_podcast_archive(index):
+    cards = []
+    for card in range(3):
+        number = index * 3 + card
+        cards.append(
+            '<div class="podcast-highlight-card">\n'
+            f"<h2>Synthetic episode {number}</h2>\n"
+            f"<p>{paragraph(number, 40)}</p>\n"
+            f'<div id="podcast-chapters-content-{number}" class="chapters">\n'
+            f'<div class="podcast-chapter"><h3><span>00:00</span>Intro</h3><p>{paragraph(number, 80)}</p></div>\n'
+            "</div>\n"
+            f'<a href="https://example.com/podcast/{number}">收聽原始節目</a>\n'
+            "</div>\n"
+        )
+    return (
+        "<html><body><!-- PODCAST_HIGHLIGHTS_START -->\n"
+        + "".join(cards)
+        + "<!-- PODCAST_HIGHLIGHTS_END --></body></html>\n"
+    )
+
+
+def generate_corpus(directory, size):
+    """Write a synthetic site source tree with ``size`` archives, deep rows and X posts."""
+    deep_rows = [synthetic_deep_row(index) for index in range(size)]
+    archive_dir = directory / "archives"
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(size):
+        day = START_DATE + timedelta(days=index)
+        (archive_dir / f"{day.isoformat()}.html").write_text(synthetic_archive(index, deep_rows), encoding="utf-8")
+    for index in range(max(1, size // 5)):
+        day = START_DATE + timedelta(days=index * 5)
+        (archive_dir / f"podcast-{day.isoformat()}.html").write_text(synthetic_podcast_archive(index), encoding="utf-8")
+
+    last_day = (START_DATE + timedelta(days=size - 1)).isoformat()
+    write_json(
+        directory / "daily_news_temp.json",
+        {
+            "fetch_date": last_day,
+            "techmeme": [
+                {"title_en": f"Techmeme story {index}", "title_zh": f"科技新聞 {index}", "url": f"https://example.com/t/{index}"}
+                for index in range(15)
+            ],
+            "wsj": [
+                {"title_en": f"WSJ story {index}", "title_zh": f"華爾街日報 {index}", "url": f"https://example.com/w/{index}"}
+                for index in range(10)
+            ],
+            "deep_analysis": {},
+        },
+    )
+
+    x_rows = []
+    translations = {}
+    for index in range(size):
+        post_url = f"https://x.com/user{index % 25}/status/{10**15 + index}"
+        posted = datetime(2024, 1, 1) + timedelta(hours=index * 3)
+        x_rows.append(
+            {
+                "query": f"from:user{index % 25}",
+                "screen_name": f"user{index % 25}",
+                "post_url": post_url,
+                "extraction_status": "text_extracted",
+                "text": paragraph(index, 30),
+                "rss_pub_date": posted.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+            }
+        )
+        translations[post_url] = f"譯文 {index}：{paragraph(index + 1, 30)}"
+    write_json(directory / "reports" / "x_watch_archive_latest.json", {"rows": x_rows})
+    write_json(
+        directory / "reports" / "x_watch_translations_latest.json",
+        {"success_translations": translations, "failed_candidate_translations": {}},
+    )
+    return {
+        "archives": size,
+        "podcast_archives": max(1, size // 5),
+        "deep_rows": size,
+        "x_posts": size,
+        "bytes": sum(path.stat().st_size for path in directory.rglob("*") if path.is_file()),
+    }
+
+
+def touch_corpus(directory):
+    """Add one translated X post, the smallest input change a daily run makes."""
+    archive_path = directory / "reports" / "x_watch_archive_latest.json"
+    translations_path = directory / "reports" / "x_watch_translations_latest.json"
+    archive = json.loads(archive_path.read_text(encoding="utf-8"))
+    translations = json.loads(translations_path.read_text(encoding="utf-8"))
+    index = len(archive["rows"])
+    post_url = f"https://x.com/user{index % 25}/status/{10**15 + index}"
+    posted = datetime(2024, 1, 1) + timedelta(hours=index * 3)
+    archive["rows"].append(
+        {
+            "query": f"from:user{index % 25}",
+            "screen_name": f"user{index % 25}",
+            "post_url": post_url,
+            "extraction_status": "text_extracted",
+            "text": paragraph(index, 30),
+            "rss_pub_date": posted.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        }
+    )
+    translations["success_translations"][post_url] = f"譯文 {index}：{paragraph(index + 1, 30)}"
+    write_json(archive_path, archive)
+    write_json(translations_path, translations)
+
+
+class PhaseTimer:
+    """Exclusive wall time per phase; nested instrumented calls pause their parent."""
+
+    def __init__(self):
+        self.totals = {}
+        self.stack = []
+
+    def wrap(self, phase, function):
+        def timed(*args, **kwargs):
+            now = time.perf_counter()
+            if self.stack:
+                self.charge(self.stack[-1], now)
+            self.stack.append([phase, now])
+            try:
+                return function(*args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                self.charge(self.stack.pop(), finished)
+                if self.stack:
+                    self.stack[-1][1] = finished
+
+        return timed
+
+    def charge(self, frame, now):
+        phase, resumed_at = frame
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - resumed_at
+        frame[1] = now
+
+
+def instrument(module, target):
+    timer = PhaseTimer()
+    for phase, names in PHASES[target].items():
+        for name in names:
+            function = getattr(module, name, None)
+            if callable(function):
+                setattr(module, name, timer.wrap(phase, function))
+    return timer
+
+
+def run_worker(target, corpus, use_tracemalloc, precompress=False):
+    """Run one scenario inside this process and print a JSON result line."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    os.chdir(corpus)
+    os.environ["DAILY_CURATION_SOURCE"] = str(corpus)
+    os.environ["DAILY_CURATION_OUT_DIR"] = str(corpus)
+    if use_tracemalloc:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    if target == "section_pages":
+        import build_section_pages as module
+
+        timer = instrument(module, target)
+        module.main()
+    else:
+        import build_site_v7 as module
+
+        timer = instrument(module, target)
+        module.build(precompress=precompress)
+    wall = time.perf_counter() - started
+
+    phases = {phase: round(seconds, 4) for phase, seconds in sorted(timer.totals.items())}
+    phases["other"] = round(max(0.0, wall - sum(timer.totals.values())), 4)
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+    result = {"wall_s": round(wall, 4), "phases": phases, "peak_rss_kb": peak_rss}
+    if use_tracemalloc:
+        result["tracemalloc_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+    print("BENCHMARK_RESULT " + json.dumps(result))
+
+
+def run_scenario(target, corpus, use_tracemalloc, precompress=False):
+    command = [sys.executable, str(Path(__file__).resolve()), "--worker", target, "--corpus", str(corpus)]
+    if use_tracemalloc:
+        command.append("--tracemalloc")
+    if precompress:
+        command.append("--precompress")
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{target} worker failed:\n{result.stderr.strip() or result.stdout.strip()}")
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("BENCHMARK_RESULT "):
+            return json.loads(line.split(" ", 1)[1])
+    raise RuntimeError(f"{target} worker printed no result:\n{result.stdout[-2000:]}")
+
+
+def result_key(result):
+    return (result["size"], result["target"], result["scenario"])
+
+
+def print_results(results):
+    print(f"{'size':>6}  {'target':<14} {'run':<5} {'wall_s':>8} {'rss_mb':>8}  phases")
+    for result in results:
+        phases = " ".join(f"{name}={seconds:.3f}" for name, seconds in result["phases"].items() if seconds >= 0.0005)
+        print(
+            f"{result['size']:>6}  {result['target']:<14} {result['scenario']:<5} "
+            f"{result['wall_s']:>8.3f} {result['peak_rss_kb'] / 1024:>8.1f}  {phases}"
+        )
+
+
+def compare_results(baseline_path, results, baseline_label=""):
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    old = {result_key(result): result for result in baseline.get("results", [])}
+    print(f"\n📊 Compared with {baseline_label or baseline_path} ({baseline.get('git_commit', 'unknown')}):")
+    print(f"{'size':>6}  {'target':<14} {'run':<5} {'old_s':>8} {'new_s':>8} {'delta':>8} {'rss_delta_mb':>13}")
+    for result in results:
+        before = old.get(result_key(result))
+        if not before:
+            continue
+        delta = (result["wall_s"] - before["wall_s"]) / before["wall_s"] * 100 if before["wall_s"] else 0.0
+        rss_delta = (result["peak_rss_kb"] - before["peak_rss_kb"]) / 1024
+        print(
+            f"{result['size']:>6}  {result['target']:<14} {result['scenario']:<5} "
+            f"{before['wall_s']:>8.3f} {result['wall_s']:>8.3f} {delta:>+7.1f}% {rss_delta:>+13.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the static site generators on synthetic corpora.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated corpus sizes (default: {DEFAULT_SIZES}).")
+    parser.add_argument("--output", help="Result JSON path (default: reports/benchmarks/site_build_<timestamp>.json).")
+    parser.add_argument("--compare", help="Earlier result JSON to compare this run against.")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also record the Python heap peak (slower).")
+    parser.add_argument("--keep-corpus", action="store_true", help="Leave generated corpora in place for inspection.")
+    parser.add_argument("--worker", choices=sorted(PHASES), help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    parser.add_argument("--precompress", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, Path(args.corpus), args.tracemalloc, args.precompress)
+        return 0
+
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    results = []
+    corpora = {}
+    workspace = Path(tempfile.mkdtemp(prefix="site-build-bench-"))
+    try:
+        for size in sizes:
+            corpus = workspace / f"corpus-{size}"
+            print(f"🏗️ Generating synthetic corpus: {size} archives / deep rows / X posts...")
+            corpora[size] = generate_corpus(corpus, size)
+            for target, scenario in SCENARIOS:
+                if scenario == "touch":
+                    # Unmeasured: leave every output and its .gz/.br sibling in place, then change one input.
+                    run_scenario(target, corpus, False, precompress=True)
+                    touch_corpus(corpus)
+                result = run_scenario(target, corpus, args.tracemalloc, precompress=scenario == "touch")
+                result.update({"size": size, "target": target, "scenario": scenario})
+                results.append(result)
+                print(f"   ⏱️ {target} {scenario}: {result['wall_s']:.3f}s, peak RSS {result['peak_rss_kb'] / 1024:.1f} MB")
+    finally:
+        if args.keep_corpus:
+            print(f"📁 Corpora kept in {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    report = {
+        "schema": 1,
+        "created_at": datetime.now().astimezone().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "archive_window": ARCHIVE_WINDOW,
+        "corpora": {str(size): stats for size, stats in corpora.items()},
+        "results": results,
+    }
+    output = Path(args.output) if args.output else BENCHMARK_DIR / f"site_build_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    write_json(output, report)
+    print()
+    print_results(results)
+    print(f"\n✅ Benchmark results written to {output}")
+    if args.compare:
+        compare_results(args.compare, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
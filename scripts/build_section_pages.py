@@ -1,16 +1,27 @@
 import argparse
+import hashlib
 import html
 import json
 import os
 import re
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
 
+from archive_manifest import snapshot_paths
+from content_store import open_store
+
 
 ROOT = Path(".")
 ARCHIVE_DIR = ROOT / "archives"
+CHUNK_DIR = ROOT / "data" / "chunks"
 INDEX_FILE = ROOT / "index.html"
+PARSE_CACHE_PATH = ROOT / ".build-cache" / "section_archive_rows.json"
+PARSE_CACHE_VERSION = 1
+# Large HTML fields repeat across nearly every snapshot; the cache stores each body once.
+PARSE_CACHE_BLOB_FIELDS = ("content_html", "summary_html", "details_html")
 
 DEEP_FEED_JSON = ROOT / "deep_analysis_feed.json"
 PODCAST_FEED_JSON = ROOT / "podcast_highlights_feed.json"
@@ -144,6 +155,163 @@ def extract_inline_json_const(content, const_name):
         return None
 
 
+def load_archive_feed_rows(content, feed_name):
+    """Resolve the shared data chunks a v7 archive snapshot references."""
+    feeds = extract_inline_json_const(content, "archiveFeeds")
+    if not isinstance(feeds, dict):
+        return None
+
+    feed = feeds.get(feed_name) or {}
+    rows = []
+    for chunk_id in feed.get("chunks") or []:
+        path = CHUNK_DIR / f"{chunk_id}.json"
+        try:
+            block = json.loads(read_text(path))
+        except (OSError, json.JSONDecodeError):
+            print(f"⚠️ Missing or unreadable data chunk: {path}")
+            continue
+        if isinstance(block, list):
+            rows.extend(block)
+    rows.reverse()
+    return rows
+
+
+def parser_fingerprint():
+    return hashlib.sha256(Path(__file__).resolve().read_bytes()).hexdigest()
+
+
+def load_parse_cache():
+    empty = {"version": PARSE_CACHE_VERSION, "parser": parser_fingerprint(), "files": {}, "blobs": {}}
+    if not PARSE_CACHE_PATH.exists():
+        return empty
+    try:
+        cache = json.loads(read_text(PARSE_CACHE_PATH))
+    except (OSError, json.JSONDecodeError):
+        return empty
+    if (
+        not isinstance(cache, dict)
+        or cache.get("version") != PARSE_CACHE_VERSION
+        or cache.get("parser") != empty["parser"]
+    ):
+        return empty
+    cache.setdefault("files", {})
+    cache.setdefault("blobs", {})
+    return cache
+
+
+def save_parse_cache(cache):
+    used = {
+        row[field]["blob"]
+        for entry in cache["files"].values()
+        for row in entry.get("rows", [])
+        for field in PARSE_CACHE_BLOB_FIELDS
+        if isinstance(row.get(field), dict)
+    }
+    cache["blobs"] = {digest: body for digest, body in cache["blobs"].items() if digest in used}
+    PARSE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = PARSE_CACHE_PATH.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(cache, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(temp_path, PARSE_CACHE_PATH)
+
+
+def pack_cached_row(row, blobs):
+    packed = dict(row)
+    for field in PARSE_CACHE_BLOB_FIELDS:
+        body = packed.get(field)
+        if not isinstance(body, str):
+            continue
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        blobs.setdefault(digest, body)
+        packed[field] = {"blob": digest}
+    return packed
+
+
+def unpack_cached_row(packed, blobs):
+    row = dict(packed)
+    for field in PARSE_CACHE_BLOB_FIELDS:
+        if isinstance(row.get(field), dict):
+            row[field] = blobs[row[field]["blob"]]
+    return row
+
+
+def parse_archive_file(kind, path):
+    """Parse one archive snapshot. Runs in worker processes when --jobs is above 1."""
+    source_file = f"archives/{path.name}"
+    content = read_text(path)
+    if kind == "podcast":
+        date_match = re.search(r"podcast-(\d{4}-\d{2}-\d{2})", path.name)
+        date_str = date_match.group(1) if date_match else path.stem
+        return parse_podcast_cards_from_html(content, date_str, source_file)
+    return parse_deep_cards_from_html(content, path.stem, source_file)
+
+
+def file_sha256(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def cached_archive_rows(cache, path):
+    stat = path.stat()
+    entry = cache["files"].get(f"archives/{path.name}")
+    if not entry:
+        return stat, None
+    same_stat = entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+    # A changed stat (checkout, copy) is re-checked against the hash of the bytes that were parsed.
+    if not same_stat and (entry.get("size") != stat.st_size or entry.get("sha256") != file_sha256(path)):
+        return stat, None
+    try:
+        rows = [unpack_cached_row(row, cache["blobs"]) for row in entry["rows"]]
+    except KeyError:
+        return stat, None
+    if not same_stat:
+        entry["mtime_ns"] = stat.st_mtime_ns
+        cache["dirty"] = True
+    return stat, rows
+
+
+def archive_rows(cache, kind, paths, jobs=1):
+    """Return ``(path, rows)`` in path order, parsing only snapshots the cache cannot answer.
+
+    Cache misses are fanned out over a process pool when ``jobs`` > 1; results
+    come back in submission order, so merging stays deterministic.
+    """
+    results = {}
+    stale = []
+    for path in paths:
+        stat, rows = cached_archive_rows(cache, path)
+        if rows is None:
+            stale.append((path, stat))
+        else:
+            results[path] = rows
+
+    stale_paths = [path for path, _stat in stale]
+    if jobs > 1 and len(stale_paths) > 1:
+        workers = min(jobs, len(stale_paths))
+        print(f"🧵 Parsing {len(stale_paths)} {kind} archive snapshots with {workers} workers...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(parse_archive_file, repeat(kind), stale_paths))
+    else:
+        parsed = [parse_archive_file(kind, path) for path in stale_paths]
+
+    for (path, stat), rows in zip(stale, parsed):
+        cache["files"][f"archives/{path.name}"] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(path),
+            "rows": [pack_cached_row(row, cache["blobs"]) for row in rows],
+        }
+        cache["dirty"] = True
+        results[path] = rows
+    return [(path, results[path]) for path in paths]
+
+
+def prune_parse_cache(cache, pattern, paths):
+    """Drop cache entries for archives matching ``pattern`` that no longer exist."""
+    live = {f"archives/{path.name}" for path in paths}
+    for key in [key for key in cache["files"] if Path(key).match(pattern) and key not in live]:
+        del cache["files"][key]
+        cache["dirty"] = True
+
+
 def deep_feed_row_from_item(item, snapshot_date, source_file):
     if not isinstance(item, dict):
         return None
@@ -194,6 +362,8 @@ def deep_feed_row_from_item(item, snapshot_date, source_file):
 
 def parse_inline_deep_rows_from_html(content, snapshot_date, source_file):
     deep_rows = extract_inline_json_const(content, "deepRows")
+    if not isinstance(deep_rows, list):
+        deep_rows = load_archive_feed_rows(content, "deep")
     if not isinstance(deep_rows, list):
         return []
 
@@ -376,12 +546,13 @@ def deep_rows_from_current_json():
     return rows
 
 
-def build_deep_feed():
+def build_deep_feed(cache=None, jobs=1):
     by_key = {}
-    archive_files = sorted(ARCHIVE_DIR.glob("????-??-??.html"))
-    for path in archive_files:
-        snapshot_date = path.stem
-        for row in parse_deep_cards_from_html(read_text(path), snapshot_date, f"archives/{path.name}"):
+    cache = cache if cache is not None else load_parse_cache()
+    archive_files = snapshot_paths(ARCHIVE_DIR, "daily")
+    prune_parse_cache(cache, "????-??-??.html", archive_files)
+    for _path, rows in archive_rows(cache, "deep", archive_files, jobs):
+        for row in rows:
             existing = by_key.get(row["key"])
             if existing:
                 existing["latest_seen_date"] = row["latest_seen_date"]
@@ -651,15 +822,16 @@ def podcast_rows_from_existing_feed():
     return rows
 
 
-def build_podcast_feed():
+def build_podcast_feed(cache=None, jobs=1):
     by_key = {}
+    cache = cache if cache is not None else load_parse_cache()
     for row in podcast_rows_from_existing_feed():
         by_key[row["key"]] = row
 
-    for path in sorted(ARCHIVE_DIR.glob("podcast-????-??-??.html")):
-        date_match = re.search(r"podcast-(\d{4}-\d{2}-\d{2})", path.name)
-        date_str = date_match.group(1) if date_match else path.stem
-        for row in parse_podcast_cards_from_html(read_text(path), date_str, f"archives/{path.name}"):
+    archive_files = snapshot_paths(ARCHIVE_DIR, "podcast")
+    prune_parse_cache(cache, "podcast-????-??-??.html", archive_files)
+    for _path, rows in archive_rows(cache, "podcast", archive_files, jobs):
+        for row in rows:
             by_key.setdefault(row["key"], row)
 
     for row in podcast_rows_from_current_json():
@@ -1103,8 +1275,8 @@ def write_json(path, data):
     path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def build_deep_outputs():
-    deep_rows = build_deep_feed()
+def build_deep_outputs(cache=None, jobs=1):
+    deep_rows = build_deep_feed(cache, jobs)
     write_json(DEEP_FEED_JSON, deep_rows)
     DEEP_PAGE.write_text(
         render_page(
@@ -1123,8 +1295,8 @@ def build_deep_outputs():
     return deep_rows
 
 
-def build_podcast_outputs():
-    podcast_rows = build_podcast_feed()
+def build_podcast_outputs(cache=None, jobs=1):
+    podcast_rows = build_podcast_feed(cache, jobs)
     write_json(PODCAST_FEED_JSON, podcast_rows)
     PODCAST_PAGE.write_text(
         render_page(
@@ -1143,11 +1315,21 @@ def build_podcast_outputs():
     return podcast_rows
 
 
-def main(only="all"):
+def main(only="all", use_cache=True, jobs=1):
+    cache = load_parse_cache() if use_cache else {"files": {}, "blobs": {}}
+    store = open_store()
     if only in ("all", "deep"):
-        build_deep_outputs()
+        deep_rows = build_deep_outputs(cache, jobs)
+        if store:
+            store.sync_feed("deep", deep_rows)
     if only in ("all", "podcast"):
-        build_podcast_outputs()
+        podcast_rows = build_podcast_outputs(cache, jobs)
+        if store:
+            store.sync_feed("podcast", podcast_rows)
+    if store:
+        store.close()
+    if use_cache and cache.pop("dirty", False):
+        save_parse_cache(cache)
 
 
 if __name__ == "__main__":
@@ -1158,5 +1340,17 @@ if __name__ == "__main__":
         default="all",
         help="Limit output to one section. Defaults to rebuilding every section page.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every archive snapshot instead of reusing .build-cache/section_archive_rows.json.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse uncached archive snapshots across N worker processes (0 = one per CPU).",
+    )
     args = parser.parse_args()
-    main(args.only)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    main(args.only, use_cache=not args.no_cache, jobs=jobs)
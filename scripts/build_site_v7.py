@@ -7,22 +7,51 @@ Bodoni wordmark, featured news cards, and shared chrome on section pages.
 
 from __future__ import annotations
 
+import argparse
+import gzip
+import hashlib
 import html
 import json
 import os
 import re
+import unicodedata
 from datetime import datetime
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz siblings are written.
+    brotli = None
+
+import archive_manifest
+import x_archive_store
+
 
 SITE_ROOT = Path(__file__).resolve().parents[1]
 SOURCE_ROOT = Path(os.environ.get("DAILY_CURATION_SOURCE", str(SITE_ROOT))).resolve()
 OUT_DIR = Path(os.environ.get("DAILY_CURATION_OUT_DIR", str(SITE_ROOT))).resolve()
 X_ARCHIVE_PATH = SOURCE_ROOT / "reports" / "x_watch_archive_latest.json"
 X_TRANSLATIONS_PATH = SOURCE_ROOT / "reports" / "x_watch_translations_latest.json"
+CHUNK_DIR = OUT_DIR / "data" / "chunks"
+CHUNK_ROWS = 50
+BUILD_CACHE_DIR = OUT_DIR / ".build-cache"
+BUILD_MANIFEST_PATH = BUILD_CACHE_DIR / "site_v7_manifest.json"
+BUILD_MANIFEST_VERSION = 1
+SEARCH_DIR = OUT_DIR / "data" / "search"
+SEARCH_SHARD_DIR = SEARCH_DIR / "shards"
+SEARCH_TERMS_CACHE_PATH = BUILD_CACHE_DIR / "search_terms.json"
+SEARCH_INDEX_VERSION = 1
+SEARCH_SNIPPET_CHARS = 160
+# CJK runs are indexed as overlapping bigrams, everything else as [a-z0-9] words.
+SEARCH_TOKEN_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[a-z0-9]+")
+PRECOMPRESS_ENV = "DAILY_CURATION_PRECOMPRESS"
+PRECOMPRESS_SUFFIXES = {".css", ".html", ".js", ".json"}
+
+# Outputs touched by the current build: path relative to OUT_DIR -> stat + hash.
+BUILD_OUTPUTS: dict[str, dict[str, Any]] = {}
 
 
 def read_json(path: Path) -> Any:
@@ -69,34 +98,87 @@ def module_json(data: Any) -> str:
     return json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
 
 
-def write_file(path: Path, content: str) -> None:
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    return sha256_bytes(path.read_bytes()) if path.is_file() else ""
+
+
+def output_key(path: Path) -> str:
+    try:
+        return path.relative_to(OUT_DIR).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def record_output(path: Path, digest: str) -> None:
+    stat = path.stat()
+    BUILD_OUTPUTS[output_key(path)] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_file(path: Path, content: str) -> bool:
+    """Write ``content`` unless the file already holds exactly these bytes."""
+    data = content.encode("utf-8")
+    digest = sha256_bytes(data)
+    if path.is_file() and path.stat().st_size == len(data) and file_digest(path) == digest:
+        record_output(path, digest)
+        return False
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    path.write_bytes(data)
+    record_output(path, digest)
     try:
         label = path.relative_to(SITE_ROOT)
     except ValueError:
         label = path
     print(f"Wrote {label}")
+    return True
+
+
+def chunk_id(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:20]
+
 
+def write_row_chunks(rows: list[dict[str, Any]], chunk_rows: int = CHUNK_ROWS) -> dict[str, Any]:
+    """Store rows as immutable, hash-named chunks and return a feed descriptor.
 
-def archive_rows(include_date: str = "") -> list[dict[str, str]]:
+    Blocks are cut from the oldest row forward, so a day's new rows only touch
+    the newest block and every older block keeps its hash across snapshots.
+    Positional ``id`` fields are left out; pages reassign them after loading.
+    """
+    oldest_first = [{key: value for key, value in row.items() if key != "id"} for row in reversed(rows)]
+    chunk_ids = []
+    for start in range(0, len(oldest_first), chunk_rows):
+        content = module_json(oldest_first[start : start + chunk_rows])
+        identifier = chunk_id(content)
+        path = CHUNK_DIR / f"{identifier}.json"
+        if path.exists():
+            record_output(path, identifier)
+        else:
+            write_file(path, content + "\n")
+        chunk_ids.append(identifier)
+    return {"total": len(rows), "chunks": chunk_ids}
+
+
+def archive_dir_for_listing() -> Path:
     archive_dir = SOURCE_ROOT / "archives"
-    rows: list[dict[str, str]] = []
-    seen_dates: set[str] = set()
-    if not archive_dir.exists():
-        archive_dir = OUT_DIR / "archives"
-    if archive_dir.exists():
-        for path in archive_dir.glob("*.html"):
-            if not re.fullmatch(r"\d{4}-\d{2}-\d{2}\.html", path.name):
-                continue
-            seen_dates.add(path.stem)
-            rows.append(
-                {
-                    "date": path.stem,
-                    "label": path.stem,
-                    "href": f"https://mobbymobbym-arch.github.io/daily-curation/archives/{path.name}",
-                }
-            )
+    return archive_dir if archive_dir.exists() else OUT_DIR / "archives"
+
+
+def archive_rows(include_date: str = "") -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for entry in archive_manifest.snapshots(archive_dir_for_listing(), "daily"):
+        row = {
+            "date": entry["date"],
+            "label": entry["date"],
+            "href": f"https://mobbymobbym-arch.github.io/daily-curation/archives/{entry['file']}",
+        }
+        # Today's snapshot embeds this list, so its own size is left out to keep rebuilds stable.
+        if entry["date"] != include_date:
+            row["bytes"] = entry["bytes"]
+        rows.append(row)
+    seen_dates = {row["date"] for row in rows}
     if include_date and re.fullmatch(r"\d{4}-\d{2}-\d{2}", include_date) and include_date not in seen_dates:
         rows.append(
             {
@@ -208,7 +290,7 @@ def x_translation(row: dict[str, Any], translations: dict[str, Any]) -> str:
 def load_x_posts_from_archive() -> list[dict[str, Any]]:
     if not X_ARCHIVE_PATH.exists():
         return []
-    archive = read_json(X_ARCHIVE_PATH)
+    archive = x_archive_store.load_archive(X_ARCHIVE_PATH)
     translations = read_json(X_TRANSLATIONS_PATH) if X_TRANSLATIONS_PATH.exists() else {}
     rows = archive.get("rows") if isinstance(archive, dict) else []
     if not isinstance(rows, list):
@@ -294,6 +376,156 @@ def load_news_data(deep_rows: list[dict[str, Any]], podcast_rows: list[dict[str,
     }
 
 
+def search_terms(text: str) -> set[str]:
+    """Tokenize like APP_JS searchTerms(): CJK bigrams plus lowercase words of 2+ chars."""
+    terms: set[str] = set()
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    for run in SEARCH_TOKEN_RE.findall(normalized):
+        if run[0].isascii():
+            if len(run) >= 2:
+                terms.add(run)
+        elif len(run) == 1:
+            terms.add(run)
+        else:
+            terms.update(run[index:index + 2] for index in range(len(run) - 1))
+    return terms
+
+
+def search_shard_key(term: str) -> str:
+    if term[0].isascii():
+        return term[:2]
+    return f"c{ord(term[0]) % 64:02x}"
+
+
+def search_documents(
+    deep_rows: list[dict[str, Any]],
+    podcast_rows: list[dict[str, Any]],
+    x_rows: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Flatten feed rows into search documents with stable, content-derived ids."""
+    docs: list[dict[str, Any]] = []
+    for row in deep_rows:
+        docs.append(
+            {
+                "kind": "analysis",
+                "title": row.get("title") or "",
+                "source": row.get("source") or "",
+                "date": normalize_date(row.get("article_date") or row.get("first_seen_date") or ""),
+                "url": row.get("url") or "",
+                "text": row.get("preview") or "",
+            }
+        )
+    for row in podcast_rows:
+        docs.append(
+            {
+                "kind": "podcast",
+                "title": row.get("title") or "",
+                "source": row.get("show_name") or "",
+                "date": normalize_date(row.get("date") or ""),
+                "url": row.get("original_link") or "",
+                "text": row.get("preview") or "",
+            }
+        )
+    for row in x_rows:
+        docs.append(
+            {
+                "kind": "x",
+                "title": f"@{row.get('handle') or 'x'}",
+                "source": "X",
+                "date": normalize_date(row.get("display_time") or ""),
+                "url": row.get("post_url") or "",
+                "text": row.get("translation") or "",
+                "extra": row.get("primary_text") or "",
+            }
+        )
+
+    unique: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for doc in docs:
+        doc["id"] = archive_manifest.content_row_id(doc["kind"], doc["url"], doc["title"])
+        if doc["id"] in seen:
+            continue
+        seen.add(doc["id"])
+        unique.append(doc)
+    return unique
+
+
+def load_search_terms_cache() -> dict[str, Any]:
+    if not SEARCH_TERMS_CACHE_PATH.exists():
+        return {}
+    try:
+        cache = read_json(SEARCH_TERMS_CACHE_PATH)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != SEARCH_INDEX_VERSION:
+        return {}
+    return cache.get("docs") or {}
+
+
+def write_search_index(
+    deep_rows: list[dict[str, Any]],
+    podcast_rows: list[dict[str, Any]],
+    x_rows: list[dict[str, Any]],
+) -> dict[str, int]:
+    """Write data/search/{index,docs}.json and term-prefix shards.
+
+    Terms per document are cached by a hash of the indexed text, so only new or
+    edited rows are re-tokenized; unchanged shards are left untouched on disk.
+    """
+    docs = search_documents(deep_rows, podcast_rows, x_rows)
+    cached = load_search_terms_cache()
+    terms_by_doc: dict[str, dict[str, Any]] = {}
+    tokenized = 0
+    for doc in docs:
+        indexed_text = "\n".join([doc["title"], doc["source"], doc["text"], doc.get("extra", "")])
+        text_hash = sha256_bytes(indexed_text.encode("utf-8"))[:16]
+        entry = cached.get(doc["id"])
+        if not entry or entry.get("hash") != text_hash:
+            entry = {"hash": text_hash, "terms": sorted(search_terms(indexed_text))}
+            tokenized += 1
+        terms_by_doc[doc["id"]] = entry
+
+    shards: dict[str, dict[str, list[str]]] = {}
+    for doc in docs:
+        for term in terms_by_doc[doc["id"]]["terms"]:
+            shards.setdefault(search_shard_key(term), {}).setdefault(term, []).append(doc["id"])
+
+    for key, postings in shards.items():
+        shard = {term: postings[term] for term in sorted(postings)}
+        write_file(SEARCH_SHARD_DIR / f"{key}.json", json.dumps(shard, ensure_ascii=False, separators=(",", ":")) + "\n")
+    if SEARCH_SHARD_DIR.exists():
+        for path in SEARCH_SHARD_DIR.glob("*.json"):
+            if path.stem not in shards:
+                path.unlink()
+
+    doc_records = [
+        {
+            "id": doc["id"],
+            "k": doc["kind"],
+            "t": doc["title"],
+            "s": doc["source"],
+            "d": doc["date"],
+            "u": doc["url"],
+            "x": text_preview(doc["text"], SEARCH_SNIPPET_CHARS),
+        }
+        for doc in docs
+    ]
+    write_file(SEARCH_DIR / "docs.json", json.dumps(doc_records, ensure_ascii=False, separators=(",", ":")) + "\n")
+    write_file(
+        SEARCH_DIR / "index.json",
+        module_json({"version": SEARCH_INDEX_VERSION, "docs": len(docs), "shards": sorted(shards)}) + "\n",
+    )
+
+    BUILD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    temp_path = SEARCH_TERMS_CACHE_PATH.with_suffix(".tmp")
+    temp_path.write_text(
+        json.dumps({"version": SEARCH_INDEX_VERSION, "docs": terms_by_doc}, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    os.replace(temp_path, SEARCH_TERMS_CACHE_PATH)
+    return {"docs": len(docs), "tokenized": tokenized, "shards": len(shards)}
+
+
 STYLE_CSS = r"""
 :root {
   --bg: #f5f2e8;
@@ -1028,6 +1260,38 @@ button { font: inherit; }
   border-color: var(--ink);
 }
 .open-icon { transform: rotate(45deg); font-size: .7rem; }
+.search-form {
+  display: flex;
+  gap: 10px;
+  margin-bottom: 26px;
+}
+.search-input {
+  flex: 1;
+  min-width: 0;
+  min-height: 48px;
+  border: 1px solid var(--line);
+  border-radius: 999px;
+  background: var(--card);
+  color: var(--ink);
+  padding: 10px 20px;
+  font-family: inherit;
+  font-size: 1rem;
+}
+.search-input:focus-visible {
+  outline: 2px solid color-mix(in srgb, var(--edit) 45%, transparent);
+  outline-offset: 2px;
+}
+.search-status {
+  color: var(--muted);
+  font-size: .88rem;
+  font-weight: 600;
+  margin: 0 0 18px;
+}
+.feed-card h3 a {
+  color: inherit;
+  text-decoration: none;
+}
+.feed-card h3 a:hover { text-decoration: underline; }
 .archive-section {
   max-width: 1320px;
   margin: 40px auto 0;
@@ -1068,6 +1332,12 @@ button { font: inherit; }
   font-weight: 500;
 }
 .archive-list a:hover { color: var(--news); }
+.archive-size {
+  margin-left: auto;
+  color: var(--muted);
+  font-size: .78rem;
+  font-weight: 400;
+}
 .archive-toggle {
   width: 100%;
   margin-top: 16px;
@@ -1137,9 +1407,9 @@ button { font: inherit; }
 
 APP_JS = r"""
 import { newsData } from "../data/news.js";
-import { deepRows } from "../data/deep-analysis.js";
-import { podcastRows } from "../data/podcast-highlights.js";
-import { xRows } from "../data/x-posts.js";
+import { deepFeed } from "../data/deep-analysis.js";
+import { podcastFeed } from "../data/podcast-highlights.js";
+import { xFeed } from "../data/x-posts.js";
 
 const page = document.body.dataset.page || "home";
 const app = document.getElementById("app");
@@ -1155,6 +1425,12 @@ function escapeHtml(value) {
     .replaceAll("'", "&#039;");
 }
 
+function formatBytes(value) {
+  const bytes = Number(value) || 0;
+  if (bytes >= 1024 * 1024) return `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+  return `${Math.max(1, Math.round(bytes / 1024))} KB`;
+}
+
 function externalAttrs(url) {
   return /^https?:\/\//i.test(String(url || "")) ? ' target="_blank" rel="noopener noreferrer"' : "";
 }
@@ -1165,6 +1441,41 @@ function siteUrl(path) {
   return `${basePath}${value}`;
 }
 
+// Feeds are lists of immutable data chunks ordered oldest to newest; pages
+// fetch chunks from the newest end only as far as the visible count needs.
+function createFeed(descriptor, prefix) {
+  const chunks = descriptor?.chunks || [];
+  return { prefix, chunks, total: descriptor?.total || 0, rows: [], nextChunk: chunks.length - 1, pending: Promise.resolve() };
+}
+
+async function loadFeedRows(feed, count) {
+  while (feed.rows.length < Math.min(count, feed.total) && feed.nextChunk >= 0) {
+    const id = feed.chunks[feed.nextChunk];
+    const response = await fetch(siteUrl(`data/chunks/${id}.json`));
+    if (!response.ok) throw new Error(`Failed to load data chunk ${id}: HTTP ${response.status}`);
+    const block = await response.json();
+    feed.nextChunk -= 1;
+    block.reverse().forEach((row) => feed.rows.push({ ...row, id: `${feed.prefix}-${feed.rows.length + 1}` }));
+  }
+  return feed.rows;
+}
+
+function ensureFeedRows(feed, count) {
+  feed.pending = feed.pending.catch(() => {}).then(() => loadFeedRows(feed, count));
+  return feed.pending;
+}
+
+const feeds = {
+  deep: createFeed(deepFeed, "analysis"),
+  podcast: createFeed(podcastFeed, "podcast"),
+  x: createFeed(xFeed, "x"),
+};
+
+const FEED_PAGES = {
+  deep: { feed: feeds.deep, active: "analysis", title: "Deep Analysis", icon: "fa-feather-alt", kind: "analysis" },
+  podcast: { feed: feeds.podcast, active: "podcast", title: "Podcast Highlights", icon: "fa-microphone-alt", kind: "podcast" },
+};
+
 function openIcon() {
   return '<i class="fas fa-arrow-up open-icon" aria-hidden="true"></i>';
 }
@@ -1294,6 +1605,7 @@ function renderNav(active) {
     { key: "analysis", label: "Deep Analysis", href: "deep-analysis.html" },
     { key: "podcast", label: "Podcast", href: "podcast-highlights.html" },
     { key: "x", label: "X Posts", href: "x-posts.html" },
+    { key: "search", label: "Search", href: "search.html" },
   ];
   return `
     <a class="skip-link" href="#app">Skip to content</a>
@@ -1421,7 +1733,7 @@ function renderArchives() {
         <h3><i class="fas fa-folder-open" aria-hidden="true" style="color:var(--news); font-size:1.05rem;"></i>日報存檔</h3>
         <ul class="archive-list${pageState.archiveOpen ? "" : " is-collapsed"}">
           ${visible.map((row) => `
-            <li><a href="${escapeHtml(row.href)}"${externalAttrs(row.href)}><i class="far fa-file-lines" aria-hidden="true" style="color:var(--muted); font-size:.85rem;"></i>${escapeHtml(row.label)}</a></li>
+            <li><a href="${escapeHtml(row.href)}"${externalAttrs(row.href)}><i class="far fa-file-lines" aria-hidden="true" style="color:var(--muted); font-size:.85rem;"></i>${escapeHtml(row.label)}${row.bytes ? `<span class="archive-size">${formatBytes(row.bytes)}</span>` : ""}</a></li>
           `).join("")}
         </ul>
         ${rows.length > 7 ? `<button class="archive-toggle" type="button" data-archive-toggle>${pageState.archiveOpen ? "收合存檔" : "顯示更多存檔"}</button>` : ""}
@@ -1478,17 +1790,21 @@ function renderArticleCard(row, kind) {
   `;
 }
 
-function renderFeedPage({ rows, active, title, icon, kind }) {
+function renderFeedPage({ feed, active, title, icon, kind }) {
   mountMasthead({ active });
   app.className = "reading-shell";
-  const shown = rows.slice(0, pageState.visible);
+  const shown = feed.rows.slice(0, pageState.visible);
   app.innerHTML = `
-    ${sectionHeading({ id: "feed-title", icon, title, edit: active !== "x", count: `目前顯示 ${shown.length} / ${rows.length}` })}
+    ${sectionHeading({ id: "feed-title", icon, title, edit: active !== "x", count: `目前顯示 ${shown.length} / ${feed.total}` })}
     <div class="feed-stack">${shown.map((row) => renderArticleCard(row, kind)).join("")}</div>
-    ${pageState.visible < rows.length ? `<div class="load-row"><button class="pill pill-filled" type="button" data-load-more>載入更多</button></div>` : ""}
+    ${shown.length < feed.total ? `<div class="load-row"><button class="pill pill-filled" type="button" data-load-more>載入更多</button></div>` : ""}
   `;
 }
 
+function showFeedPage(config) {
+  return ensureFeedRows(config.feed, pageState.visible).then(() => renderFeedPage(config));
+}
+
 function xCard(row) {
   return `
     <article class="x-card">
@@ -1507,12 +1823,144 @@ function xCard(row) {
 function renderXPage() {
   mountMasthead({ active: "x" });
   app.className = "reading-shell";
-  const shown = xRows.slice(0, pageState.xVisible);
+  const shown = feeds.x.rows.slice(0, pageState.xVisible);
   app.innerHTML = `
-    ${sectionHeading({ id: "feed-title", icon: "", title: "X Posts", count: `目前顯示 ${shown.length} / ${xRows.length}` })}
+    ${sectionHeading({ id: "feed-title", icon: "", title: "X Posts", count: `目前顯示 ${shown.length} / ${feeds.x.total}` })}
     <div class="feed-stack">${shown.map(xCard).join("")}</div>
-    ${pageState.xVisible < xRows.length ? `<div class="load-row"><button class="pill pill-ink" type="button" data-x-load-more>載入更多</button></div>` : ""}
+    ${shown.length < feeds.x.total ? `<div class="load-row"><button class="pill pill-ink" type="button" data-x-load-more>載入更多</button></div>` : ""}
+  `;
+}
+
+function showXPage() {
+  return ensureFeedRows(feeds.x, pageState.xVisible).then(renderXPage);
+}
+
+const SEARCH_KIND_LABELS = { analysis: "Deep Analysis", podcast: "Podcast", x: "X Posts" };
+const SEARCH_TOKEN_RE = /[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[a-z0-9]+/g;
+const SEARCH_RESULT_LIMIT = 50;
+const searchState = { index: null, docs: null, shards: new Map(), query: new URLSearchParams(location.search).get("q") || "", run: 0, timer: 0 };
+
+// Mirrors search_terms() in build_site_v7.py: CJK bigrams plus lowercase words.
+function searchTerms(text) {
+  const terms = new Set();
+  for (const run of String(text || "").normalize("NFKC").toLowerCase().match(SEARCH_TOKEN_RE) || []) {
+    if (/^[a-z0-9]/.test(run)) {
+      if (run.length >= 2) terms.add(run);
+    } else if (run.length === 1) {
+      terms.add(run);
+    } else {
+      for (let index = 0; index < run.length - 1; index += 1) terms.add(run.slice(index, index + 2));
+    }
+  }
+  return [...terms];
+}
+
+function searchShardKey(term) {
+  return /^[a-z0-9]/.test(term) ? term.slice(0, 2) : `c${(term.codePointAt(0) % 64).toString(16).padStart(2, "0")}`;
+}
+
+async function fetchSearchJson(path) {
+  const response = await fetch(siteUrl(path));
+  if (!response.ok) throw new Error(`Failed to load ${path}: HTTP ${response.status}`);
+  return response.json();
+}
+
+async function loadSearchShard(key) {
+  if (!searchState.index.shards.includes(key)) return {};
+  if (!searchState.shards.has(key)) searchState.shards.set(key, fetchSearchJson(`data/search/shards/${key}.json`));
+  return searchState.shards.get(key);
+}
+
+// Each query term matches index terms that start with it, so "open" finds
+// "openai" and a single CJK character finds the bigrams it begins.
+async function searchDocs(query) {
+  const terms = searchTerms(query);
+  if (!terms.length) return [];
+  searchState.index ||= await fetchSearchJson("data/search/index.json");
+  const [docs, shards] = await Promise.all([
+    searchState.docs || fetchSearchJson("data/search/docs.json"),
+    Promise.all(terms.map((term) => loadSearchShard(searchShardKey(term)))),
+  ]);
+  searchState.docs = docs;
+
+  let matched = null;
+  terms.forEach((term, index) => {
+    const ids = new Set();
+    Object.entries(shards[index]).forEach(([indexed, postings]) => {
+      if (indexed.startsWith(term)) postings.forEach((id) => ids.add(id));
+    });
+    matched = matched ? new Set([...matched].filter((id) => ids.has(id))) : ids;
+  });
+  const titleHits = (doc) => terms.filter((term) => searchTerms(doc.t).some((indexed) => indexed.startsWith(term))).length;
+  return docs
+    .filter((doc) => matched.has(doc.id))
+    .map((doc) => ({ doc, score: titleHits(doc) }))
+    .sort((a, b) => b.score - a.score || String(b.doc.d).localeCompare(String(a.doc.d)))
+    .map((item) => item.doc);
+}
+
+function searchResultCard(doc) {
+  const url = doc.u || "";
+  const title = escapeHtml(doc.t);
+  return `
+    <article class="feed-card">
+      <div class="card-meta"><span class="chip">${escapeHtml(SEARCH_KIND_LABELS[doc.k] || doc.k)}</span>${doc.s && doc.k !== "x" ? `<span class="chip chip-neutral">${escapeHtml(doc.s)}</span>` : ""}<span class="card-date">${dateText(doc.d)}</span></div>
+      <h3>${url ? `<a href="${escapeHtml(url)}"${externalAttrs(url)}>${title}</a>` : title}</h3>
+      <p class="card-summary">${escapeHtml(doc.x)}</p>
+    </article>
+  `;
+}
+
+async function runSearch(query) {
+  const run = ++searchState.run;
+  const status = document.getElementById("search-status");
+  const results = document.getElementById("search-results");
+  const url = new URL(location.href);
+  if (query) url.searchParams.set("q", query);
+  else url.searchParams.delete("q");
+  history.replaceState(null, "", url);
+  if (!searchTerms(query).length) {
+    status.textContent = "輸入關鍵字搜尋 Deep Analysis、Podcast 與 X 貼文";
+    results.innerHTML = "";
+    return;
+  }
+  status.textContent = "搜尋中…";
+  try {
+    const docs = await searchDocs(query);
+    if (run !== searchState.run) return;
+    status.textContent = docs.length > SEARCH_RESULT_LIMIT
+      ? `找到 ${docs.length} 筆結果，顯示前 ${SEARCH_RESULT_LIMIT} 筆`
+      : `找到 ${docs.length} 筆結果`;
+    results.innerHTML = docs.slice(0, SEARCH_RESULT_LIMIT).map(searchResultCard).join("");
+  } catch (error) {
+    if (run !== searchState.run) return;
+    status.textContent = "搜尋索引載入失敗，請稍後再試";
+    results.innerHTML = "";
+  }
+}
+
+function renderSearchPage() {
+  mountMasthead({ active: "search" });
+  app.className = "reading-shell";
+  app.innerHTML = `
+    ${sectionHeading({ id: "feed-title", icon: "fa-search", title: "Search" })}
+    <form class="search-form" role="search" data-search-form>
+      <input class="search-input" type="search" name="q" value="${escapeHtml(searchState.query)}" placeholder="搜尋標題、摘要與翻譯" aria-label="搜尋" autocomplete="off" data-search-input>
+    </form>
+    <p class="search-status" id="search-status" aria-live="polite"></p>
+    <div class="feed-stack" id="search-results"></div>
   `;
+  const input = app.querySelector("[data-search-input]");
+  input.addEventListener("input", () => {
+    clearTimeout(searchState.timer);
+    searchState.timer = setTimeout(() => runSearch(input.value.trim()), 200);
+  });
+  app.querySelector("[data-search-form]").addEventListener("submit", (event) => {
+    event.preventDefault();
+    clearTimeout(searchState.timer);
+    runSearch(input.value.trim());
+  });
+  runSearch(searchState.query.trim());
 }
 
 function setupHomeSpy() {
@@ -1544,32 +1992,34 @@ document.addEventListener("click", (event) => {
   if (toggle) {
     const id = toggle.dataset.toggle;
     pageState.expanded[id] = !pageState.expanded[id];
-    if (page === "deep") renderFeedPage({ rows: deepRows, active: "analysis", title: "Deep Analysis", icon: "fa-feather-alt", kind: "analysis" });
-    if (page === "podcast") renderFeedPage({ rows: podcastRows, active: "podcast", title: "Podcast Highlights", icon: "fa-microphone-alt", kind: "podcast" });
+    if (FEED_PAGES[page]) renderFeedPage(FEED_PAGES[page]);
     return;
   }
 
-  if (event.target.closest("[data-load-more]")) {
+  const loadMore = event.target.closest("[data-load-more]");
+  if (loadMore) {
     pageState.visible += 12;
-    if (page === "deep") renderFeedPage({ rows: deepRows, active: "analysis", title: "Deep Analysis", icon: "fa-feather-alt", kind: "analysis" });
-    if (page === "podcast") renderFeedPage({ rows: podcastRows, active: "podcast", title: "Podcast Highlights", icon: "fa-microphone-alt", kind: "podcast" });
+    loadMore.disabled = true;
+    if (FEED_PAGES[page]) showFeedPage(FEED_PAGES[page]);
     return;
   }
 
-  if (event.target.closest("[data-x-load-more]")) {
+  const xLoadMore = event.target.closest("[data-x-load-more]");
+  if (xLoadMore) {
     pageState.xVisible += 30;
-    renderXPage();
+    xLoadMore.disabled = true;
+    showXPage();
   }
 });
 
 if (page === "home") {
   renderHome();
-} else if (page === "deep") {
-  renderFeedPage({ rows: deepRows, active: "analysis", title: "Deep Analysis", icon: "fa-feather-alt", kind: "analysis" });
-} else if (page === "podcast") {
-  renderFeedPage({ rows: podcastRows, active: "podcast", title: "Podcast Highlights", icon: "fa-microphone-alt", kind: "podcast" });
+} else if (FEED_PAGES[page]) {
+  showFeedPage(FEED_PAGES[page]);
 } else if (page === "x") {
-  renderXPage();
+  showXPage();
+} else if (page === "search") {
+  renderSearchPage();
 }
 """
 
@@ -1597,22 +2047,21 @@ def page_html(title: str, page: str, description: str) -> str:
 """
 
 
-def archive_app_js(news_data: dict[str, Any], deep_rows: list[dict[str, Any]], podcast_rows: list[dict[str, Any]], x_rows: list[dict[str, Any]]) -> str:
+def archive_app_js(news_data: dict[str, Any], archive_feeds: dict[str, Any]) -> str:
     app_without_imports = re.sub(r"^import .+;\n", "", APP_JS, flags=re.M)
     return "\n".join(
         [
             f"const newsData = {module_json(news_data)};",
-            f"const deepRows = {module_json(deep_rows)};",
-            f"const podcastRows = {module_json(podcast_rows)};",
-            f"const xRows = {module_json(x_rows)};",
+            f"const archiveFeeds = {module_json(archive_feeds)};",
+            "const { deep: deepFeed, podcast: podcastFeed, x: xFeed } = archiveFeeds;",
             app_without_imports,
         ]
     )
 
 
-def archive_page_html(news_data: dict[str, Any], deep_rows: list[dict[str, Any]], podcast_rows: list[dict[str, Any]], x_rows: list[dict[str, Any]]) -> str:
+def archive_page_html(news_data: dict[str, Any], archive_feeds: dict[str, Any]) -> str:
     date_label = str(news_data.get("date") or "Daily Archive")
-    inline_app = archive_app_js(news_data, deep_rows, podcast_rows, x_rows)
+    inline_app = archive_app_js(news_data, archive_feeds)
     return f"""<!DOCTYPE html>
 <html lang="zh-TW">
 <head>
@@ -1636,36 +2085,257 @@ def archive_page_html(news_data: dict[str, Any], deep_rows: list[dict[str, Any]]
 """
 
 
-def build() -> None:
+def archive_listing_digest() -> str:
+    names = []
+    for archive_dir in (SOURCE_ROOT / "archives", OUT_DIR / "archives"):
+        if archive_dir.exists():
+            names.extend(
+                f"{archive_dir}:{entry['file']}:{entry['bytes']}"
+                for entry in archive_manifest.snapshots(archive_dir, "daily")
+            )
+    return sha256_bytes("\n".join(sorted(names)).encode("utf-8"))
+
+
+def build_inputs() -> dict[str, str]:
+    """Hash everything the generated site depends on."""
+    inputs = {
+        "builder": file_digest(Path(__file__).resolve()),
+        "out_dir": str(OUT_DIR),
+        "deep_analysis_feed.json": file_digest(SOURCE_ROOT / "deep_analysis_feed.json"),
+        "podcast_highlights_feed.json": file_digest(SOURCE_ROOT / "podcast_highlights_feed.json"),
+        "daily_news_temp.json": file_digest(SOURCE_ROOT / "daily_news_temp.json"),
+        "x_archive": file_digest(X_ARCHIVE_PATH),
+        "x_archive_journal": file_digest(x_archive_store.journal_path_for(X_ARCHIVE_PATH)),
+        "x_translations": file_digest(X_TRANSLATIONS_PATH),
+        "archives": archive_listing_digest(),
+    }
+    if not X_ARCHIVE_PATH.exists():
+        inputs["legacy_x_posts"] = file_digest(SOURCE_ROOT / "x-posts.html")
+    return inputs
+
+
+def load_build_manifest() -> dict[str, Any]:
+    if not BUILD_MANIFEST_PATH.exists():
+        return {}
+    try:
+        manifest = read_json(BUILD_MANIFEST_PATH)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != BUILD_MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_build_manifest(inputs: dict[str, str]) -> None:
+    BUILD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "version": BUILD_MANIFEST_VERSION,
+        "built_at": datetime.now().astimezone().isoformat(),
+        "inputs": inputs,
+        "outputs": dict(sorted(BUILD_OUTPUTS.items())),
+    }
+    temp_path = BUILD_MANIFEST_PATH.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp_path, BUILD_MANIFEST_PATH)
+
+
+def outputs_intact(outputs: dict[str, Any]) -> bool:
+    for key, recorded in outputs.items():
+        path = OUT_DIR / key
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if stat.st_size != recorded.get("size") or stat.st_mtime_ns != recorded.get("mtime_ns"):
+            return False
+    return bool(outputs)
+
+
+def compressed_sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def compressed_is_fresh(path: Path, suffix: str) -> bool:
+    target = compressed_sibling(path, suffix)
+    return target.exists() and target.stat().st_mtime_ns >= path.stat().st_mtime_ns
+
+
+def write_compressed(path: Path, data: bytes, suffix: str, compress) -> int:
+    """Write ``path`` + ``suffix`` from ``data``; return its size."""
+    target = compressed_sibling(path, suffix)
+    target.write_bytes(compress(data))
+    record_output(target, "")
+    return target.stat().st_size
+
+
+def precompress_outputs() -> list[tuple[str, int, int, int | None]]:
+    """Write max-level .gz (and .br when brotli is installed) siblings for text outputs.
+
+    A file is only read when one of its siblings is missing or older than it,
+    so unchanged archive snapshots cost a few stat calls per build.
+    """
+    paths = {OUT_DIR / key for key in BUILD_OUTPUTS if Path(key).suffix in PRECOMPRESS_SUFFIXES}
+    archive_dir = OUT_DIR / "archives"
+    if archive_dir.exists():
+        paths.update(archive_manifest.snapshot_paths(archive_dir, "daily"))
+        paths.update(archive_manifest.snapshot_paths(archive_dir, "podcast"))
+
+    compressors = [(".gz", lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        compressors.append((".br", lambda raw: brotli.compress(raw, quality=11)))
+
+    sizes = []
+    for path in sorted(paths):
+        if not path.is_file():
+            continue
+        data = None
+        compressed_sizes = {}
+        for suffix, compress in compressors:
+            target = compressed_sibling(path, suffix)
+            if compressed_is_fresh(path, suffix):
+                record_output(target, "")
+                compressed_sizes[suffix] = target.stat().st_size
+                continue
+            if data is None:
+                data = path.read_bytes()
+            compressed_sizes[suffix] = write_compressed(path, data, suffix, compress)
+        sizes.append((output_key(path), path.stat().st_size, compressed_sizes[".gz"], compressed_sizes.get(".br")))
+    return sizes
+
+
+def print_size_report(sizes: list[tuple[str, int, int, int | None]]) -> None:
+    rows: dict[str, list[int]] = {}
+    for key, raw, gz, br in sizes:
+        # Individual chunks and archive snapshots are summarized per directory.
+        if key.startswith(("data/chunks/", "archives/")):
+            key = f"{key.rsplit('/', 1)[0]}/*{Path(key).suffix}"
+        total = rows.setdefault(key, [0, 0, 0, 0])
+        total[0] += 1
+        total[1] += raw
+        total[2] += gz
+        total[3] += br or 0
+
+    has_brotli = brotli is not None
+    width = max([len(key) for key in rows] + [8])
+    header = f"{'Artifact':<{width}}  {'Files':>5}  {'Raw':>10}  {'Gzip':>10}"
+    print(header + (f"  {'Brotli':>10}" if has_brotli else ""))
+    for key, (count, raw, gz, br) in sorted(rows.items()):
+        line = f"{key:<{width}}  {count:>5}  {raw:>10,}  {gz:>10,}"
+        print(line + (f"  {br:>10,}" if has_brotli else ""))
+    if not has_brotli:
+        print("Brotli module not installed; wrote .gz siblings only.")
+
+
+def build(force: bool = False, precompress: bool = False) -> None:
+    inputs = build_inputs()
+    if precompress:
+        inputs["precompress"] = "br+gz" if brotli is not None else "gz"
+    manifest = load_build_manifest()
+    if not force and manifest.get("inputs") == inputs and outputs_intact(manifest.get("outputs") or {}):
+        print("Site up to date: inputs and outputs match the build manifest.")
+        return
+
+    BUILD_OUTPUTS.clear()
     deep_rows = load_deep_rows()
     podcast_rows = load_podcast_rows()
     x_rows = load_x_posts()
     news_data = load_news_data(deep_rows, podcast_rows)
+    feeds = {
+        "deep": write_row_chunks(deep_rows),
+        "podcast": write_row_chunks(podcast_rows),
+        "x": write_row_chunks(x_rows),
+    }
+    search_stats = write_search_index(deep_rows, podcast_rows, x_rows)
 
     write_file(OUT_DIR / "assets" / "styles.css", STYLE_CSS.strip() + "\n")
     write_file(OUT_DIR / "assets" / "app.js", APP_JS.strip() + "\n")
     write_file(OUT_DIR / "data" / "news.js", f"export const newsData = {module_json(news_data)};\n")
-    write_file(OUT_DIR / "data" / "deep-analysis.js", f"export const deepRows = {module_json(deep_rows)};\n")
-    write_file(OUT_DIR / "data" / "podcast-highlights.js", f"export const podcastRows = {module_json(podcast_rows)};\n")
-    write_file(OUT_DIR / "data" / "x-posts.js", f"export const xRows = {module_json(x_rows)};\n")
+    write_file(OUT_DIR / "data" / "deep-analysis.js", f"export const deepFeed = {module_json(feeds['deep'])};\n")
+    write_file(OUT_DIR / "data" / "podcast-highlights.js", f"export const podcastFeed = {module_json(feeds['podcast'])};\n")
+    write_file(OUT_DIR / "data" / "x-posts.js", f"export const xFeed = {module_json(feeds['x'])};\n")
     write_file(OUT_DIR / "index.html", page_html("Joyce's Daily", "home", "Daily technology curation by Joyce."))
     write_file(OUT_DIR / "deep-analysis.html", page_html("Deep Analysis", "deep", "Deep Analysis archive."))
     write_file(OUT_DIR / "podcast-highlights.html", page_html("Podcast Highlights", "podcast", "Podcast Highlights archive."))
     write_file(OUT_DIR / "x-posts.html", page_html("X Posts", "x", "Translated public X posts."))
+    write_file(OUT_DIR / "search.html", page_html("Search", "search", "Search Deep Analysis, Podcast Highlights and X posts."))
     if news_data.get("date"):
-        write_file(
-            OUT_DIR / "archives" / f"{news_data['date']}.html",
-            archive_page_html(news_data, deep_rows, podcast_rows, x_rows),
+        archive_path = OUT_DIR / "archives" / f"{news_data['date']}.html"
+        write_file(archive_path, archive_page_html(news_data, feeds))
+        archive_manifest.record_snapshot(
+            archive_path, row_ids=archive_manifest.feed_row_ids(deep_rows, podcast_rows, x_rows)
         )
+    sizes = precompress_outputs() if precompress else []
+    # The build writes today's archive snapshot itself; record the listing it leaves behind.
+    inputs["archives"] = archive_listing_digest()
+    save_build_manifest(inputs)
+    if sizes:
+        print_size_report(sizes)
     print(
         "Site complete: "
         f"{len(news_data['techmeme'])} Techmeme, "
         f"{len(news_data['wsj'])} WSJ, "
         f"{len(deep_rows)} deep analysis, "
         f"{len(podcast_rows)} podcast, "
-        f"{len(x_rows)} X posts."
+        f"{len(x_rows)} X posts; "
+        f"search index {search_stats['docs']} docs in {search_stats['shards']} shards "
+        f"({search_stats['tokenized']} re-tokenized)."
     )
 
 
+def extract_inline_const(content: str, name: str) -> Any:
+    match = re.search(rf"\bconst\s+{re.escape(name)}\s*=\s*", content)
+    if not match:
+        return None
+    try:
+        value, _end = json.JSONDecoder().raw_decode(content[match.end():])
+    except json.JSONDecodeError:
+        return None
+    return value
+
+
+def rechunk_archives() -> None:
+    """Rewrite v7 snapshots that still inline every row set into chunk references."""
+    archive_dir = OUT_DIR / "archives"
+    rewritten = 0
+    for path in archive_manifest.snapshot_paths(archive_dir, "daily"):
+        content = path.read_text(encoding="utf-8", errors="ignore")
+        news_data = extract_inline_const(content, "newsData")
+        deep_rows = extract_inline_const(content, "deepRows")
+        podcast_rows = extract_inline_const(content, "podcastRows")
+        x_rows = extract_inline_const(content, "xRows")
+        if not isinstance(news_data, dict) or not all(isinstance(rows, list) for rows in (deep_rows, podcast_rows, x_rows)):
+            continue
+        archive_feeds = {
+            "deep": write_row_chunks(deep_rows),
+            "podcast": write_row_chunks(podcast_rows),
+            "x": write_row_chunks(x_rows),
+        }
+        write_file(path, archive_page_html(news_data, archive_feeds))
+        archive_manifest.record_snapshot(path, row_ids=archive_manifest.feed_row_ids(deep_rows, podcast_rows, x_rows))
+        rewritten += 1
+    print(f"Rechunked {rewritten} archive snapshot(s).")
+
+
 if __name__ == "__main__":
-    build()
+    parser = argparse.ArgumentParser(description="Build the Joyce's Daily v7 static site.")
+    parser.add_argument(
+        "--rechunk-archives",
+        action="store_true",
+        help="Convert existing archive snapshots with inline row data to shared data chunks, then exit.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every output even when the build manifest says nothing changed.",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        default=os.environ.get(PRECOMPRESS_ENV) == "1",
+        help=f"Also write .gz/.br siblings for gzip_static serving (or set {PRECOMPRESS_ENV}=1).",
+    )
+    args = parser.parse_args()
+    if args.rechunk_archives:
+        rechunk_archives()
+    else:
+        build(force=args.force, precompress=args.precompress)
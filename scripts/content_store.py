@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""Optional SQLite content store for feeds, daily state and the X archive.
+
+The JSON files stay the interchange format every renderer reads, but when
+DAILY_CURATION_CONTENT_DB is set the writers also keep their data here as
+indexed rows, so an update touches the rows that changed instead of rewriting a
+whole file. For the daily news and deep-analysis state the store is the source
+of truth: opening it re-imports daily_news_temp.json or analysis_state.json
+only when the file changed since the store last wrote or read it, and
+export_progress writes both back once a run is done. Exporters rebuild the
+exact JSON shapes on demand:
+
+    DAILY_CURATION_CONTENT_DB=1 python3 scripts/content_store.py import
+    DAILY_CURATION_CONTENT_DB=1 python3 scripts/content_store.py export --out-dir /tmp/export
+    DAILY_CURATION_CONTENT_DB=1 python3 scripts/content_store.py stats
+
+DAILY_CURATION_CONTENT_DB=1 uses content_store.sqlite3 in the repo root; any
+other non-empty value (except 0) is taken as the database path.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from x_archive_store import load_archive
+
+
+ROOT = Path(__file__).resolve().parents[1]
+CONTENT_DB_ENV = "DAILY_CURATION_CONTENT_DB"
+DEFAULT_DB_PATH = ROOT / "content_store.sqlite3"
+SCHEMA_VERSION = 1
+
+NEWS_JSON = Path("daily_news_temp.json")
+STATE_JSON = Path("analysis_state.json")
+DEEP_FEED_JSON = Path("deep_analysis_feed.json")
+PODCAST_FEED_JSON = Path("podcast_highlights_feed.json")
+X_ARCHIVE_JSON = Path("reports") / "x_watch_archive_latest.json"
+X_TRANSLATIONS_JSON = Path("reports") / "x_watch_translations_latest.json"
+NEWS_SECTIONS = ("techmeme", "wsj")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS news_items (
+    fetch_date TEXT NOT NULL,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (fetch_date, section, position)
+);
+CREATE INDEX IF NOT EXISTS news_items_url ON news_items (url);
+CREATE TABLE IF NOT EXISTS deep_analyses (
+    fetch_date TEXT NOT NULL,
+    source_key TEXT NOT NULL,
+    url TEXT,
+    payload TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (fetch_date, source_key)
+);
+CREATE INDEX IF NOT EXISTS deep_analyses_url ON deep_analyses (url);
+CREATE TABLE IF NOT EXISTS analysis_state (
+    source TEXT PRIMARY KEY,
+    url TEXT,
+    title TEXT,
+    payload TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feed_rows (
+    feed TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    sort_date TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (feed, row_key)
+);
+CREATE INDEX IF NOT EXISTS feed_rows_position ON feed_rows (feed, position);
+CREATE TABLE IF NOT EXISTS x_rows (
+    archive_key TEXT PRIMARY KEY,
+    post_url TEXT,
+    google_news_url TEXT,
+    position INTEGER NOT NULL,
+    last_seen_at TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS x_rows_post_url ON x_rows (post_url);
+CREATE INDEX IF NOT EXISTS x_rows_google_news_url ON x_rows (google_news_url);
+CREATE INDEX IF NOT EXISTS x_rows_position ON x_rows (position);
+CREATE TABLE IF NOT EXISTS translations (
+    kind TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    text TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (kind, item_key)
+);
+"""
+
+
+def now_iso():
+    return datetime.now().astimezone().isoformat()
+
+
+def dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=False)
+
+
+def file_digest(path):
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def configured_db_path():
+    value = os.environ.get(CONTENT_DB_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    if value == "1":
+        return DEFAULT_DB_PATH
+    return Path(value).expanduser()
+
+
+def open_store():
+    """Return a ContentStore when DAILY_CURATION_CONTENT_DB is set, else None."""
+    path = configured_db_path()
+    if path is None:
+        return None
+    store = ContentStore(path)
+    store.seed_from_json()
+    store.reconcile_progress()
+    return store
+
+
+def sync_daily_news():
+    """Pull a freshly written daily_news_temp.json into the content store, if one is configured."""
+    store = open_store()
+    if store:
+        store.close()
+
+
+def feed_row_key(feed, row):
+    if feed == "podcast":
+        link = str(row.get("original_link") or row.get("url") or "").strip()
+        if link and link != "#":
+            return link.rstrip("/")
+        return f"{row.get('date') or ''}|{row.get('title') or ''}"
+    url = str(row.get("clean_url") or row.get("url") or "").strip()
+    if url and url != "#":
+        return url.rstrip("/")
+    return f"{row.get('source') or ''}|{row.get('title') or ''}"
+
+
+def x_row_key(row):
+    return str(row.get("archive_key") or row.get("post_url") or row.get("google_news_url") or "")
+
+
+class ContentStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.set_meta("schema_version", SCHEMA_VERSION)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def get_meta(self, name, default=None):
+        row = self.conn.execute("SELECT payload FROM meta WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, name, value):
+        self.conn.execute(
+            "INSERT INTO meta (name, payload) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET payload = excluded.payload",
+            (name, dumps(value)),
+        )
+
+    # --- seeding -----------------------------------------------------------
+
+    def seed_from_json(self, root=None, force=False):
+        """Import the JSON files once, the first time a database is opened."""
+        if self.get_meta("seeded_at") and not force:
+            return False
+        root = Path(root or ".")
+        loaders = (
+            (NEWS_JSON, self.import_daily_news),
+            (STATE_JSON, self.import_analysis_state),
+            (DEEP_FEED_JSON, lambda data: self.sync_feed("deep", data)),
+            (PODCAST_FEED_JSON, lambda data: self.sync_feed("podcast", data)),
+            (X_ARCHIVE_JSON, self.sync_x_archive),
+            (X_TRANSLATIONS_JSON, self.sync_x_translations),
+        )
+        for relative_path, load in loaders:
+            path = root / relative_path
+            if not path.exists():
+                continue
+            try:
+                if relative_path == X_ARCHIVE_JSON:
+                    data = load_archive(path)
+                else:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                print(f"⚠️ Content store skipped {path}: {exc}")
+                continue
+            load(data)
+        self.set_meta("seeded_at", now_iso())
+        self.conn.commit()
+        return True
+
+    # --- daily news and analysis state files --------------------------------
+
+    def reconcile_progress(self, root=None):
+        """Re-import the daily news / analysis state files that changed outside the store."""
+        root = Path(root or ".")
+        loaders = (
+            (NEWS_JSON, lambda data: self.import_daily_news(data, replace=True)),
+            (STATE_JSON, lambda data: self.import_analysis_state(data, replace=True)),
+        )
+        imported = []
+        for relative_path, load in loaders:
+            path = root / relative_path
+            digest = file_digest(path)
+            if digest is None or digest == self.get_meta(f"json_digest:{relative_path}"):
+                continue
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                print(f"⚠️ Content store skipped {path}: {exc}")
+                continue
+            load(data)
+            with self.conn:
+                self.set_meta(f"json_digest:{relative_path}", digest)
+            imported.append(str(path))
+        return imported
+
+    def export_progress(self, root=None, fetch_date=None):
+        """Write daily_news_temp.json and analysis_state.json from the store."""
+        root = Path(root or ".")
+        exports = (
+            (NEWS_JSON, self.export_daily_news(fetch_date)),
+            (STATE_JSON, self.export_analysis_state()),
+        )
+        written = []
+        for relative_path, data in exports:
+            if data is None:
+                continue
+            path = root / relative_path
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+            temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(text, encoding="utf-8")
+            os.replace(temp_path, path)
+            with self.conn:
+                self.set_meta(f"json_digest:{relative_path}", hashlib.sha256(text.encode("utf-8")).hexdigest())
+            written.append(str(path))
+        return written
+
+    # --- daily news --------------------------------------------------------
+
+    def import_daily_news(self, data, replace=False):
+        """Upsert a daily_news_temp.json payload; ``replace`` also drops deep analyses it no longer has."""
+        if not isinstance(data, dict):
+            return
+        fetch_date = str(data.get("fetch_date") or datetime.now().strftime("%Y-%m-%d"))
+        with self.conn:
+            # Keep the top-level key order; sections are filled back in on export.
+            skeleton = {key: None if key in (*NEWS_SECTIONS, "deep_analysis") else value for key, value in data.items()}
+            self.set_meta(f"daily_news:{fetch_date}", skeleton)
+            self.set_meta("daily_news_latest", fetch_date)
+            for section in NEWS_SECTIONS:
+                items = data.get(section) or []
+                self.conn.execute(
+                    "DELETE FROM news_items WHERE fetch_date = ? AND section = ? AND position >= ?",
+                    (fetch_date, section, len(items)),
+                )
+                self.conn.executemany(
+                    "INSERT INTO news_items (fetch_date, section, position, url, payload) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(fetch_date, section, position) DO UPDATE SET url = excluded.url, payload = excluded.payload "
+                    "WHERE news_items.payload != excluded.payload",
+                    [
+                        (fetch_date, section, position, str(item.get("url") or ""), dumps(item))
+                        for position, item in enumerate(items)
+                        if isinstance(item, dict)
+                    ],
+                )
+            analyses = data.get("deep_analysis") or {}
+            for source_key, content in analyses.items():
+                self._upsert_deep_analysis(fetch_date, source_key, content)
+            if replace:
+                stale = [
+                    (fetch_date, source_key)
+                    for (source_key,) in self.conn.execute(
+                        "SELECT source_key FROM deep_analyses WHERE fetch_date = ?", (fetch_date,)
+                    )
+                    if source_key not in analyses
+                ]
+                self.conn.executemany("DELETE FROM deep_analyses WHERE fetch_date = ? AND source_key = ?", stale)
+
+    def upsert_deep_analysis(self, fetch_date, source_key, content):
+        with self.conn:
+            self._upsert_deep_analysis(fetch_date, source_key, content)
+
+    def _upsert_deep_analysis(self, fetch_date, source_key, content):
+        url = str(content.get("url") or "") if isinstance(content, dict) else ""
+        self.conn.execute(
+            "INSERT INTO deep_analyses (fetch_date, source_key, url, payload, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(fetch_date, source_key) DO UPDATE SET url = excluded.url, payload = excluded.payload, "
+            "updated_at = excluded.updated_at WHERE deep_analyses.payload != excluded.payload",
+            (fetch_date, source_key, url, dumps(content), now_iso()),
+        )
+
+    def deep_analyses_for(self, fetch_date):
+        rows = self.conn.execute(
+            "SELECT source_key, payload FROM deep_analyses WHERE fetch_date = ? ORDER BY rowid",
+            (fetch_date,),
+        )
+        return {source_key: json.loads(payload) for source_key, payload in rows}
+
+    def export_daily_news(self, fetch_date=None):
+        fetch_date = fetch_date or self.get_meta("daily_news_latest")
+        skeleton = self.get_meta(f"daily_news:{fetch_date}") if fetch_date else None
+        if skeleton is None:
+            return None
+        data = dict(skeleton)
+        for section in NEWS_SECTIONS:
+            if section in data:
+                data[section] = [
+                    json.loads(payload)
+                    for (payload,) in self.conn.execute(
+                        "SELECT payload FROM news_items WHERE fetch_date = ? AND section = ? ORDER BY position",
+                        (fetch_date, section),
+                    )
+                ]
+        data["deep_analysis"] = self.deep_analyses_for(fetch_date)
+        return data
+
+    # --- analysis state ----------------------------------------------------
+
+    def import_analysis_state(self, state, replace=False):
+        if not isinstance(state, dict):
+            return
+        with self.conn:
+            for source, entry in state.items():
+                self._upsert_analysis_state(source, entry)
+            if replace:
+                stale = [
+                    (source,)
+                    for (source,) in self.conn.execute("SELECT source FROM analysis_state")
+                    if source not in state
+                ]
+                self.conn.executemany("DELETE FROM analysis_state WHERE source = ?", stale)
+
+    def upsert_analysis_state(self, source, entry):
+        with self.conn:
+            self._upsert_analysis_state(source, entry)
+
+    def _upsert_analysis_state(self, source, entry):
+        # Legacy state entries are bare URL strings.
+        url = entry.get("url") if isinstance(entry, dict) else entry
+        title = entry.get("title") if isinstance(entry, dict) else ""
+        self.conn.execute(
+            "INSERT INTO analysis_state (source, url, title, payload, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(source) DO UPDATE SET url = excluded.url, title = excluded.title, payload = excluded.payload, "
+            "updated_at = excluded.updated_at WHERE analysis_state.payload != excluded.payload",
+            (source, str(url or ""), str(title or ""), dumps(entry), now_iso()),
+        )
+
+    def export_analysis_state(self):
+        rows = self.conn.execute("SELECT source, payload FROM analysis_state ORDER BY rowid")
+        return {source: json.loads(payload) for source, payload in rows}
+
+    # --- section feeds -----------------------------------------------------
+
+    def sync_feed(self, feed, rows):
+        """Make feed_rows for ``feed`` match ``rows``, touching only changed rows."""
+        if not isinstance(rows, list):
+            return {"upserted": 0, "deleted": 0}
+        existing = {
+            row_key: (position, payload)
+            for row_key, position, payload in self.conn.execute(
+                "SELECT row_key, position, payload FROM feed_rows WHERE feed = ?", (feed,)
+            )
+        }
+        changes = []
+        seen = set()
+        for position, row in enumerate(rows):
+            if not isinstance(row, dict):
+                continue
+            row_key = feed_row_key(feed, row)
+            if row_key in seen:
+                continue
+            seen.add(row_key)
+            payload = dumps(row)
+            if existing.get(row_key) != (position, payload):
+                sort_date = str(row.get("article_date") or row.get("date") or "")
+                changes.append((feed, row_key, position, sort_date, payload))
+        stale = [(feed, row_key) for row_key in existing if row_key not in seen]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO feed_rows (feed, row_key, position, sort_date, payload) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(feed, row_key) DO UPDATE SET position = excluded.position, "
+                "sort_date = excluded.sort_date, payload = excluded.payload",
+                changes,
+            )
+            self.conn.executemany("DELETE FROM feed_rows WHERE feed = ? AND row_key = ?", stale)
+        return {"upserted": len(changes), "deleted": len(stale)}
+
+    def export_feed(self, feed):
+        return [
+            json.loads(payload)
+            for (payload,) in self.conn.execute(
+                "SELECT payload FROM feed_rows WHERE feed = ? ORDER BY position", (feed,)
+            )
+        ]
+
+    # --- X archive and translations ----------------------------------------
+
+    def sync_x_archive(self, archive):
+        if not isinstance(archive, dict):
+            return {"upserted": 0, "deleted": 0}
+        rows = archive.get("rows") or []
+        existing = {
+            key: (position, payload)
+            for key, position, payload in self.conn.execute("SELECT archive_key, position, payload FROM x_rows")
+        }
+        changes = []
+        seen = set()
+        for position, row in enumerate(rows):
+            key = x_row_key(row) if isinstance(row, dict) else ""
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            payload = dumps(row)
+            if existing.get(key) != (position, payload):
+                changes.append(
+                    (
+                        key,
+                        str(row.get("post_url") or ""),
+                        str(row.get("google_news_url") or ""),
+                        position,
+                        str(row.get("last_seen_at") or ""),
+                        payload,
+                    )
+                )
+        stale = [(key,) for key in existing if key not in seen]
+        with self.conn:
+            self.set_meta("x_archive", {key: value for key, value in archive.items() if key != "rows"})
+            self.conn.executemany(
+                "INSERT INTO x_rows (archive_key, post_url, google_news_url, position, last_seen_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(archive_key) DO UPDATE SET post_url = excluded.post_url, "
+                "google_news_url = excluded.google_news_url, position = excluded.position, "
+                "last_seen_at = excluded.last_seen_at, payload = excluded.payload",
+                changes,
+            )
+            self.conn.executemany("DELETE FROM x_rows WHERE archive_key = ?", stale)
+        return {"upserted": len(changes), "deleted": len(stale)}
+
+    def export_x_archive(self):
+        meta = self.get_meta("x_archive")
+        if meta is None:
+            return None
+        archive = dict(meta)
+        archive["rows"] = [
+            json.loads(payload) for (payload,) in self.conn.execute("SELECT payload FROM x_rows ORDER BY position")
+        ]
+        return archive
+
+    def sync_x_translations(self, translations):
+        if not isinstance(translations, dict):
+            return
+        updated_at = now_iso()
+        with self.conn:
+            self.set_meta("x_translations_synced_at", updated_at)
+            for kind, values in translations.items():
+                if not isinstance(values, dict):
+                    continue
+                self.conn.executemany(
+                    "INSERT INTO translations (kind, item_key, text, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(kind, item_key) DO UPDATE SET text = excluded.text, updated_at = excluded.updated_at "
+                    "WHERE translations.text != excluded.text",
+                    [(kind, key, str(text or ""), updated_at) for key, text in values.items()],
+                )
+
+    def export_x_translations(self):
+        if self.get_meta("x_translations_synced_at") is None:
+            return None
+        translations = {"success_translations": {}, "failed_candidate_translations": {}}
+        for kind, key, text in self.conn.execute("SELECT kind, item_key, text FROM translations ORDER BY rowid"):
+            translations.setdefault(kind, {})[key] = text
+        return translations
+
+    # --- reporting ---------------------------------------------------------
+
+    def stats(self):
+        tables = ("news_items", "deep_analyses", "analysis_state", "feed_rows", "x_rows", "translations")
+        counts = {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+        counts["feed_rows_by_feed"] = dict(self.conn.execute("SELECT feed, COUNT(*) FROM feed_rows GROUP BY feed"))
+        counts["translations_by_kind"] = dict(self.conn.execute("SELECT kind, COUNT(*) FROM translations GROUP BY kind"))
+        return counts
+
+
+def export_all(store, out_dir):
+    out_dir = Path(out_dir)
+    exports = (
+        (NEWS_JSON, store.export_daily_news()),
+        (STATE_JSON, store.export_analysis_state()),
+        (DEEP_FEED_JSON, store.export_feed("deep")),
+        (PODCAST_FEED_JSON, store.export_feed("podcast")),
+        (X_ARCHIVE_JSON, store.export_x_archive()),
+        (X_TRANSLATIONS_JSON, store.export_x_translations()),
+    )
+    written = []
+    for relative_path, data in exports:
+        if data is None:
+            continue
+        path = out_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        written.append(str(path))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the optional SQLite content store.")
+    parser.add_argument("command", choices=("import", "export", "stats"))
+    parser.add_argument("--db", help=f"Database path (default: ${CONTENT_DB_ENV}, or {DEFAULT_DB_PATH.name} when it is 1).")
+    parser.add_argument("--out-dir", default=".", help="Directory for exported JSON files (default: current directory).")
+    args = parser.parse_args()
+
+    path = Path(args.db) if args.db else configured_db_path()
+    if path is None:
+        print(f"❌ Set {CONTENT_DB_ENV} or pass --db to choose a content store.")
+        return 1
+
+    store = ContentStore(path)
+    try:
+        if args.command == "import":
+            store.seed_from_json(force=True)
+            print(f"✅ Imported JSON state into {path}")
+            print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
+        elif args.command == "export":
+            for written in export_all(store, args.out_dir):
+                print(f"💾 Exported {written}")
+        else:
+            print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
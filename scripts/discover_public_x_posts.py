@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
 import difflib
 import email.utils
 import html
@@ -8,13 +9,18 @@ import json
 import math
 import re
 import ssl
-import time
 import urllib.error
 import urllib.parse
-import urllib.request
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from http_pool import ConnectionPool
+from rate_control import AdaptiveRateLimiter, endpoint_family, parse_endpoint_rate_limits, parse_retry_after
+from x_decode_cache import load_decode_cache, touch_entry
+from x_rss_cache import RssCache, body_hash
+from x_watch_trace import TRACER
+
 
 RSS_URL_TEMPLATE = (
     "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
@@ -81,53 +87,74 @@ def parse_optional_float_list(raw_value):
     return values
 
 
-def fetch_text(url, *, method="GET", data=None, headers=None, retry_delays=None):
+# Paces and learns request rates per endpoint family; see rate_control.py.
+RATE_LIMITER = AdaptiveRateLimiter()
+# Validators, parses and resolved rows per RSS URL, for conditional requests.
+RSS_CACHE = RssCache()
+# google_news_url -> already-extracted post (decode cache entry shape); candidates
+# found here skip the decode and oEmbed requests entirely.
+KNOWN_POSTS = {}
+# Persistent per-host connections shared by every fetch_text caller in this process.
+HTTP_POOL = ConnectionPool(max_per_host=6, timeout=30)
+
+
+def fetch_response(url, *, method="GET", data=None, headers=None, retry_delays=None):
+    """Like ``fetch_text`` but also return the response headers."""
     retry_delays = retry_delays or [2.0, 4.0, 8.0]
     request_headers = dict(REQUEST_HEADERS)
     if headers:
         request_headers.update(headers)
 
     for attempt in range(len(retry_delays) + 1):
-        try:
-            with open_request(
-                url,
-                method=method,
-                data=data,
-                headers=request_headers,
-                context=DEFAULT_SSL_CONTEXT,
-            ) as response:
-                body = response.read().decode("utf-8", errors="replace")
-                return body, response.getcode()
-        except urllib.error.URLError as exc:
-            reason = getattr(exc, "reason", None)
-            if not isinstance(reason, ssl.SSLCertVerificationError):
-                raise
-            with open_request(
-                url,
-                method=method,
-                data=data,
-                headers=request_headers,
-                context=INSECURE_SSL_CONTEXT,
-            ) as response:
-                body = response.read().decode("utf-8", errors="replace")
-                return body, response.getcode()
-        except urllib.error.HTTPError as exc:
-            if exc.code in RETRYABLE_HTTP_STATUS and attempt < len(retry_delays):
-                retry_after = exc.headers.get("Retry-After")
-                delay = float(retry_after) if retry_after else retry_delays[attempt]
-                time.sleep(delay)
-                continue
-            raise
+        TRACER.record_sleep(RATE_LIMITER.wait(url), "rate_limit_wait")
+        with TRACER.span(endpoint_family(url) or "http", kind="http", method=method, attempt=attempt) as span:
+            try:
+                try:
+                    with open_request(
+                        url,
+                        method=method,
+                        data=data,
+                        headers=request_headers,
+                        context=DEFAULT_SSL_CONTEXT,
+                    ) as response:
+                        raw = response.read()
+                        span.update(status=response.getcode(), bytes=len(raw))
+                        RATE_LIMITER.record(url, response.getcode())
+                        return raw.decode("utf-8", errors="replace"), response.getcode(), response.headers
+                except urllib.error.URLError as exc:
+                    # Only a certificate failure falls back to the insecure context; HTTP errors go below.
+                    if isinstance(exc, urllib.error.HTTPError) or not isinstance(
+                        getattr(exc, "reason", None), ssl.SSLCertVerificationError
+                    ):
+                        raise
+                    with open_request(
+                        url,
+                        method=method,
+                        data=data,
+                        headers=request_headers,
+                        context=INSECURE_SSL_CONTEXT,
+                    ) as response:
+                        raw = response.read()
+                        span.update(status=response.getcode(), bytes=len(raw), insecure_ssl=True)
+                        RATE_LIMITER.record(url, response.getcode())
+                        return raw.decode("utf-8", errors="replace"), response.getcode(), response.headers
+            except urllib.error.HTTPError as exc:
+                span["status"] = exc.code
+                retry_after = parse_retry_after(exc.headers.get("Retry-After"))
+                RATE_LIMITER.record(url, exc.code, retry_after)
+                if not (exc.code in RETRYABLE_HTTP_STATUS and attempt < len(retry_delays)):
+                    raise
+                delay = retry_after if retry_after is not None else retry_delays[attempt]
+        TRACER.sleep(delay, "http_retry_backoff")
+
+
+def fetch_text(url, *, method="GET", data=None, headers=None, retry_delays=None):
+    body, status, _headers = fetch_response(url, method=method, data=data, headers=headers, retry_delays=retry_delays)
+    return body, status
 
 
 def open_request(url, *, method, data, headers, context):
-    request = urllib.request.Request(
-        url,
-        data=data,
-        headers=headers,
-        method=method,
-    )
-    return urllib.request.urlopen(request, timeout=30, context=context)
+    return HTTP_POOL.request(url, method=method, data=data, headers=headers, context=context)
 
 
 def parse_pub_date(value):
@@ -286,17 +313,51 @@ def search_post_url_via_google_news(handle, rss_title, retry_delays):
     return None
 
 
-def fetch_rss_items(handle, retry_delays, hours):
+def fetch_rss_feed(handle, retry_delays, hours):
+    """Conditionally fetch a handle's RSS feed.
+
+    Returns ``(items, not_modified, outcomes)``: ``not_modified`` is True when
+    the server answered 304 or sent a byte-identical body, in which case the
+    stored parse is reused. ``outcomes`` maps google_news_url to rows already
+    resolved for items still in the feed.
+    """
     rss_url = build_rss_url(handle, hours)
+    cached = RSS_CACHE.get(rss_url)
     try:
-        rss_text, _status = fetch_text(rss_url, retry_delays=retry_delays)
+        rss_text, status, headers = fetch_response(
+            rss_url,
+            headers=RSS_CACHE.conditional_headers(rss_url),
+            retry_delays=retry_delays,
+        )
     except urllib.error.HTTPError as exc:
-        raise ScrapeError(
-            f"google_news_rss_http_{exc.code}",
-            f"Google News RSS returned HTTP {exc.code}",
-            status_code=exc.code,
-        ) from exc
-    return parse_rss_items(rss_text)
+        if exc.code != 304 or not cached:
+            raise ScrapeError(
+                f"google_news_rss_http_{exc.code}",
+                f"Google News RSS returned HTTP {exc.code}",
+                status_code=exc.code,
+            ) from exc
+        status, rss_text, headers = 304, "", exc.headers
+
+    if cached and (status == 304 or cached.get("body_sha256") == body_hash(rss_text)):
+        RSS_CACHE.touch(rss_url)
+        return cached["items"], True, cached.get("outcomes") or {}
+    if status == 304:
+        raise ScrapeError("google_news_rss_http_304", "Google News RSS returned 304 without a cached feed", status_code=304)
+
+    items = parse_rss_items(rss_text)
+    RSS_CACHE.store(
+        rss_url,
+        etag=headers.get("ETag"),
+        last_modified=headers.get("Last-Modified"),
+        digest=body_hash(rss_text),
+        items=items,
+    )
+    return items, False, (RSS_CACHE.get(rss_url) or {}).get("outcomes") or {}
+
+
+def fetch_rss_items(handle, retry_delays, hours):
+    items, _not_modified, _outcomes = fetch_rss_feed(handle, retry_delays, hours)
+    return items
 
 
 def extract_google_news_id(google_news_url):
@@ -477,6 +538,9 @@ def build_empty_summary():
         "no_candidates": False,
         "decode_retries_performed": 0,
         "recovered_after_retry": 0,
+        "rss_not_modified": False,
+        "outcomes_reused": 0,
+        "known_posts_skipped": 0,
     }
 
 
@@ -631,31 +695,72 @@ def process_candidate_attempt(
         return "final_failure", exc
 
 
-def scrape_handle(
-    handle,
-    *,
-    hours,
-    now,
-    limit_per_handle,
-    retry_delays,
-    row_throttle_seconds,
-    decode_retry_cooldowns,
-    debug,
-):
-    handle = canonical_handle(handle)
+def reuse_known_outcome(known_row, now, summary):
+    row = dict(known_row)
+    row["collected_at"] = now.isoformat()
+    row["rss_outcome_reused"] = True
+    summary["text_extracted"] += 1
+    if row.get("full_text_confident"):
+        summary["full_text_confident"] += 1
+    if row.get("is_truncated"):
+        summary["truncated"] += 1
+    summary["rows_emitted"] += 1
+    summary["outcomes_reused"] += 1
+    return row
+
+
+def restore_known_post(row, known, summary):
+    touch_entry(known)
+    row.update(
+        {
+            "decoded_source_url": known.get("decoded_source_url"),
+            "post_url": known.get("post_url"),
+            "post_id": known.get("post_id"),
+            "screen_name": known.get("screen_name"),
+            "author_name": known.get("author_name"),
+            "author_url": known.get("author_url"),
+            "text": known.get("text"),
+            "text_length": known.get("text_length", 0),
+            "is_truncated": known.get("is_truncated", False),
+            "full_text_confident": known.get("full_text_confident", False),
+            "extraction_status": "text_extracted",
+            "oembed_status_code": known.get("oembed_status_code"),
+            "oembed_endpoint": known.get("oembed_endpoint"),
+            "failure_reason": None,
+            "restored_from_cache": True,
+            "cache_source_generated_at": known.get("cached_from_generated_at"),
+        }
+    )
+    summary["text_extracted"] += 1
+    if row["full_text_confident"]:
+        summary["full_text_confident"] += 1
+    if row["is_truncated"]:
+        summary["truncated"] += 1
+    summary["rows_emitted"] += 1
+    summary["known_posts_skipped"] += 1
+    return row
+
+
+def prepare_handle(handle, *, hours, now, limit_per_handle, retry_delays, debug):
+    """Fetch a handle's RSS window and build one pending state per candidate.
+
+    Candidates already resolved on an earlier pass over the same feed, or
+    present in ``KNOWN_POSTS``, are returned as finished rows instead of
+    pending states.
+    Returns ``(summary, reused_rows, pending_states, handle_error)``.
+    """
     cutoff = now - timedelta(hours=hours)
-    rows = []
     summary = build_empty_summary()
-    seen_post_ids = set()
 
     try:
         discovery_query = build_rss_query(handle, hours)
-        items = fetch_rss_items(handle, retry_delays, hours)
+        items, not_modified, outcomes = fetch_rss_feed(handle, retry_delays, hours)
     except ScrapeError as exc:
         summary["failed"] += 1
         if is_rate_limit_label(exc.label):
             summary["rate_limited"] += 1
-        return rows, summary, exc.label
+        return summary, [], [], exc.label
+    summary["rss_not_modified"] = not_modified
 
     summary["rss_items_total"] = len(items)
     candidates = []
@@ -671,60 +776,250 @@ def scrape_handle(
     summary["candidates_in_window"] = len(candidates)
     if not candidates:
         summary["no_candidates"] = True
-        return rows, summary, None
+        return summary, [], [], None
 
     if limit_per_handle is not None:
         candidates = candidates[:limit_per_handle]
 
-    pending_states = [
-        {
-            "item": item,
-            "row": build_candidate_row(handle, item, now, debug, discovery_query),
-        }
-        for item in candidates
-    ]
+    reused_rows = []
+    pending_states = []
+    for item in candidates:
+        known_row = outcomes.get(item["google_news_url"])
+        if known_row:
+            reused_rows.append(reuse_known_outcome(known_row, now, summary))
+            continue
+        row = build_candidate_row(handle, item, now, debug, discovery_query)
+        known = KNOWN_POSTS.get(item["google_news_url"])
+        if known and known.get("extraction_status") == "text_extracted":
+            if known.get("post_id") not in {reused.get("post_id") for reused in reused_rows}:
+                reused_rows.append(restore_known_post(row, known, summary))
+            continue
+        pending_states.append({"item": item, "row": row})
+    return summary, reused_rows, pending_states, None
+
+
+def load_known_posts(entries):
+    """Register extracted posts (google_news_url -> decode cache entry) to skip on discovery."""
+    for google_news_url, entry in entries.items():
+        if google_news_url and entry.get("extraction_status") == "text_extracted":
+            KNOWN_POSTS[google_news_url] = entry
+    return len(KNOWN_POSTS)
+
+
+def settle_attempt(state, status, exc, *, rows, summary, max_decode_attempts):
+    """Record one candidate attempt; return True when it should be retried next round."""
+    row = state["row"]
+    if status == "success":
+        rows.append(row)
+    elif status == "duplicate":
+        pass
+    elif status == "decode_error":
+        if is_retryable_decode_error(exc) and row["decode_attempts"] < max_decode_attempts:
+            summary["decode_retries_performed"] += 1
+            return True
+        finalize_failed_row(row, summary, exc)
+        rows.append(row)
+    else:
+        rows.append(row)
+    return False
+
+
+def scrape_handle(
+    handle,
+    *,
+    hours,
+    now,
+    limit_per_handle,
+    retry_delays,
+    row_throttle_seconds,
+    decode_retry_cooldowns,
+    debug,
+):
+    handle = canonical_handle(handle)
+    with TRACER.bind(handle), TRACER.span("discover_handle", kind="handle"):
+        summary, rows, pending_states, handle_error = prepare_handle(
+            handle,
+            hours=hours,
+            now=now,
+            limit_per_handle=limit_per_handle,
+            retry_delays=retry_delays,
+            debug=debug,
+        )
+        if handle_error:
+            return rows, summary, handle_error
+        seen_post_ids = {row["post_id"] for row in rows if row.get("post_id")}
+
+        max_decode_attempts = 1 + len(decode_retry_cooldowns)
+        round_index = 0
+        while pending_states:
+            if round_index > 0:
+                TRACER.sleep(decode_retry_cooldowns[round_index - 1], "decode_cooldown")
+
+            next_pending_states = []
+            for state in pending_states:
+                status, exc = process_candidate_attempt(
+                    row=state["row"],
+                    item=state["item"],
+                    seen_post_ids=seen_post_ids,
+                    retry_delays=retry_delays,
+                    debug=debug,
+                    summary=summary,
+                )
+                if settle_attempt(state, status, exc, rows=rows, summary=summary, max_decode_attempts=max_decode_attempts):
+                    next_pending_states.append(state)
+
+                TRACER.sleep(row_throttle_seconds, "row_throttle")
+
+            pending_states = next_pending_states
+            round_index += 1
+
+        RSS_CACHE.record_outcomes(build_rss_url(handle, hours), rows)
+        return rows, summary, None
+
+
+def run_bound(handle, func, *args, **kwargs):
+    """Run ``func`` with ``handle`` bound for tracing (executor threads do not inherit it)."""
+    with TRACER.bind(handle):
+        return func(*args, **kwargs)
+
+
+async def scrape_handle_async(
+    handle,
+    *,
+    executor,
+    hours,
+    now,
+    limit_per_handle,
+    retry_delays,
+    decode_retry_cooldowns,
+    debug,
+):
+    """Asyncio twin of ``scrape_handle``.
+
+    Blocking HTTP runs on ``executor`` and is paced by the per-host token
+    buckets instead of a fixed row throttle; decode cool-downs only suspend
+    this handle, so other handles keep going meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    handle = canonical_handle(handle)
+    summary, rows, pending_states, handle_error = await loop.run_in_executor(
+        executor,
+        lambda: run_bound(
+            handle,
+            prepare_handle,
+            handle,
+            hours=hours,
+            now=now,
+            limit_per_handle=limit_per_handle,
+            retry_delays=retry_delays,
+            debug=debug,
+        ),
+    )
+    if handle_error:
+        return rows, summary, handle_error
+    seen_post_ids = {row["post_id"] for row in rows if row.get("post_id")}
 
     max_decode_attempts = 1 + len(decode_retry_cooldowns)
     round_index = 0
     while pending_states:
         if round_index > 0:
-            time.sleep(decode_retry_cooldowns[round_index - 1])
+            await asyncio.sleep(decode_retry_cooldowns[round_index - 1])
+            TRACER.record_sleep(decode_retry_cooldowns[round_index - 1], "decode_cooldown", handle)
 
         next_pending_states = []
         for state in pending_states:
-            row = state["row"]
-            item = state["item"]
-            status, exc = process_candidate_attempt(
-                row=row,
-                item=item,
-                seen_post_ids=seen_post_ids,
-                retry_delays=retry_delays,
-                debug=debug,
-                summary=summary,
+            status, exc = await loop.run_in_executor(
+                executor,
+                lambda state=state: run_bound(
+                    handle,
+                    process_candidate_attempt,
+                    row=state["row"],
+                    item=state["item"],
+                    seen_post_ids=seen_post_ids,
+                    retry_delays=retry_delays,
+                    debug=debug,
+                    summary=summary,
+                ),
             )
-
-            if status == "success":
-                rows.append(row)
-            elif status == "duplicate":
-                pass
-            elif status == "decode_error":
-                if is_retryable_decode_error(exc) and row["decode_attempts"] < max_decode_attempts:
-                    summary["decode_retries_performed"] += 1
-                    next_pending_states.append(state)
-                else:
-                    finalize_failed_row(row, summary, exc)
-                    rows.append(row)
-            else:
-                rows.append(row)
-
-            time.sleep(row_throttle_seconds)
+            if settle_attempt(state, status, exc, rows=rows, summary=summary, max_decode_attempts=max_decode_attempts):
+                next_pending_states.append(state)
 
         pending_states = next_pending_states
         round_index += 1
 
+    RSS_CACHE.record_outcomes(build_rss_url(handle, hours), rows)
     return rows, summary, None
 
 
+async def scrape_handles_async(handles, *, concurrency, **options):
+    """Scrape up to ``concurrency`` handles at once; results keep ``handles`` order."""
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def run(handle):
+            async with semaphore:
+                with TRACER.span("discover_handle", kind="handle", handle=canonical_handle(handle)):
+                    return await scrape_handle_async(handle, executor=executor, **options)
+
+        return await asyncio.gather(*(run(handle) for handle in handles))
+
+
+def discover_handles(
+    handles,
+    *,
+    hours,
+    now,
+    retry_delays,
+    row_throttle_seconds,
+    decode_retry_cooldowns,
+    limit_per_handle=None,
+    debug=False,
+    concurrency=None,
+):
+    """Scrape ``handles`` and return the same result payload the CLI writes.
+
+    ``concurrency`` switches to the asyncio engine; ``None`` keeps the serial loop.
+    """
+    handles = [canonical_handle(handle) for handle in handles]
+    summary = {handle: build_empty_summary() for handle in handles}
+    rows = []
+    handle_errors = {}
+
+    options = {
+        "hours": hours,
+        "now": now,
+        "limit_per_handle": limit_per_handle,
+        "retry_delays": retry_delays,
+        "decode_retry_cooldowns": decode_retry_cooldowns,
+        "debug": debug,
+    }
+    if concurrency is not None:
+        results = asyncio.run(scrape_handles_async(handles, concurrency=concurrency, **options))
+    else:
+        results = (
+            scrape_handle(handle, row_throttle_seconds=row_throttle_seconds, **options)
+            for handle in handles
+        )
+
+    for handle, (handle_rows, handle_summary, handle_error) in zip(handles, results):
+        summary[handle] = handle_summary
+        if handle_error:
+            handle_errors[handle] = handle_error
+        rows.extend(handle_rows)
+
+    result = {
+        "lookback_hours": hours,
+        "generated_at": now.isoformat(),
+        "handles": handles,
+        "summary": summary,
+        "rows": rows,
+    }
+    if handle_errors:
+        result["handle_errors"] = handle_errors
+    return result
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Discover recent public X posts through Google News and extract text via oEmbed.",
@@ -753,6 +1048,43 @@ def main():
         default="15",
         help="Comma-separated cool-down delays in seconds for deferred Google News decode retries after rate limiting",
     )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Scrape handles concurrently; pacing comes from the adaptive rate limiter instead of --row-throttle-seconds",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Handles scraped at once with --async",
+    )
+    parser.add_argument(
+        "--endpoint-rate",
+        action="append",
+        default=[],
+        metavar="FAMILY=RATE[:BURST]",
+        help="Override an endpoint family's starting request rate (requests/second) and burst, e.g. google_news_rss=0.5:2",
+    )
+    parser.add_argument(
+        "--rate-state",
+        help="Load learned endpoint rates from this JSON file and save them back after the run",
+    )
+    parser.add_argument(
+        "--no-rate-control",
+        action="store_true",
+        help="Do not pace requests with the adaptive rate limiter (ignores --endpoint-rate and --rate-state)",
+    )
+    parser.add_argument(
+        "--rss-cache",
+        help="Send conditional RSS requests using validators from this JSON file and save it back after the run",
+    )
+    parser.add_argument(
+        "--known-posts",
+        help="Skip decode/oEmbed for candidates already extracted in this decode cache JSON",
+    )
+    parser.add_argument("--trace", help="Write per-phase timing spans for this run to this JSON file")
     parser.add_argument("--output", help="Write JSON output to this file")
     parser.add_argument(
         "--debug",
@@ -761,39 +1093,36 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.trace:
+        TRACER.start()
     now = datetime.now().astimezone()
     retry_delays = parse_retry_delays(args.retry_delays)
     decode_retry_cooldowns = parse_optional_float_list(args.decode_retry_cooldowns)
-    handles = [canonical_handle(handle) for handle in args.handles]
-    summary = {handle: build_empty_summary() for handle in handles}
-    rows = []
-    handle_errors = {}
-
-    for handle in handles:
-        handle_rows, handle_summary, handle_error = scrape_handle(
-            handle,
-            hours=args.hours,
-            now=now,
-            limit_per_handle=args.limit_per_handle,
-            retry_delays=retry_delays,
-            row_throttle_seconds=args.row_throttle_seconds,
-            decode_retry_cooldowns=decode_retry_cooldowns,
-            debug=args.debug,
-        )
-        summary[handle] = handle_summary
-        if handle_error:
-            handle_errors[handle] = handle_error
-        rows.extend(handle_rows)
-
-    result = {
-        "lookback_hours": args.hours,
-        "generated_at": now.isoformat(),
-        "handles": handles,
-        "summary": summary,
-        "rows": rows,
-    }
-    if handle_errors:
-        result["handle_errors"] = handle_errors
+    RATE_LIMITER.configure(parse_endpoint_rate_limits(args.endpoint_rate))
+    RATE_LIMITER.enabled = not args.no_rate_control
+    if args.rate_state and RATE_LIMITER.enabled:
+        RATE_LIMITER.load_state(args.rate_state)
+    if args.rss_cache:
+        RSS_CACHE.load(args.rss_cache)
+    if args.known_posts:
+        load_known_posts(load_decode_cache(args.known_posts)["entries"])
+    result = discover_handles(
+        args.handles,
+        hours=args.hours,
+        now=now,
+        limit_per_handle=args.limit_per_handle,
+        retry_delays=retry_delays,
+        row_throttle_seconds=args.row_throttle_seconds,
+        decode_retry_cooldowns=decode_retry_cooldowns,
+        debug=args.debug,
+        concurrency=args.concurrency if args.use_async else None,
+    )
+    if args.rate_state and RATE_LIMITER.enabled:
+        RATE_LIMITER.save_state(args.rate_state)
+    if args.rss_cache:
+        RSS_CACHE.save(args.rss_cache)
+    if args.trace:
+        TRACER.write(args.trace, handles=result["handles"])
 
     output_text = json.dumps(result, ensure_ascii=False, indent=2)
     if args.output:
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Shared, long-lived Gemini client for the curation scripts.
+
+Every script calls ``GeminiClient.generate`` with the key chosen by
+``GeminiKeyPool`` for the attempt. Transports are pluggable:
+
+- ``ApiTransport``: REST API; ``GEMINI_API_BASE_URL`` points it at another
+  server (e.g. a local stand-in for tests).
+- ``CliTransport``: ``gemini -p ... --output-format json``, one CLI process per
+  attempt.
+
+``DAILY_CURATION_GEMINI_BACKEND`` selects ``auto`` (the default: the API when
+an API key is available for the model, else the CLI), ``api`` or ``cli``. In
+``auto`` mode an attempt whose API request fails to connect (or gets a 5xx) is
+retried through the CLI. Each call's outcome and latency go back to the pool,
+which cools down keys that hit 429s or timeouts.
+"""
+
+import base64
+import json
+import mimetypes
+import os
+import re
+import signal
+import ssl
+import subprocess
+import time
+import urllib.error
+import urllib.parse
+from pathlib import Path
+
+from http_pool import ConnectionPool
+
+
+BACKEND_ENV = "DAILY_CURATION_GEMINI_BACKEND"
+API_BASE_URL_ENV = "GEMINI_API_BASE_URL"
+DEFAULT_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+DEFAULT_TIMEOUT_SECONDS = 120
+DEFAULT_BACKEND = "auto"
+# generateContent rejects requests over ~20 MB; inline attachments are base64 (+33%).
+API_INLINE_REQUEST_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_SSL_CONTEXT = ssl.create_default_context()
+INSECURE_SSL_CONTEXT = ssl._create_unverified_context()
+RATE_LIMIT_RE = re.compile(r"\b429\b|RESOURCE_EXHAUSTED|quota", re.IGNORECASE)
+
+
+class GeminiError(RuntimeError):
+    def __init__(self, message, *, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GeminiTimeout(GeminiError):
+    pass
+
+
+class GeminiTransportError(GeminiError):
+    """The API request never got a model response (connection failure or 5xx)."""
+
+
+def outcome_for_error(exc):
+    """Map a failed call to a key-pool outcome: rate_limited, timeout or error."""
+    if isinstance(exc, GeminiTimeout):
+        return "timeout"
+    if isinstance(exc, GeminiError) and (exc.status_code == 429 or RATE_LIMIT_RE.search(str(exc))):
+        return "rate_limited"
+    return "error"
+
+
+def cli_envelope_error(stdout):
+    """Return ``(message, code)`` from the CLI's ``{"error": ...}`` envelope, or ``None``."""
+    try:
+        envelope = json.loads(stdout)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    if not isinstance(envelope, dict) or not envelope.get("error"):
+        return None
+    error = envelope["error"]
+    if isinstance(error, dict):
+        code = error.get("code")
+        return str(error.get("message") or error.get("type") or error), code if isinstance(code, int) else None
+    return str(error), None
+
+
+def unwrap_cli_output(stdout):
+    """Return the model text from the CLI's ``{"response": ...}`` envelope (or stdout as-is)."""
+    try:
+        envelope = json.loads(stdout)
+    except (json.JSONDecodeError, TypeError):
+        return stdout
+    if isinstance(envelope, dict) and isinstance(envelope.get("response"), str):
+        return envelope["response"]
+    return stdout
+
+
+class ApiTransport:
+    name = "api"
+
+    def __init__(self, base_url=None, pool=None):
+        self.base_url = (base_url or os.environ.get(API_BASE_URL_ENV) or DEFAULT_API_BASE_URL).rstrip("/")
+        self.pool = pool or ConnectionPool(max_per_host=8, timeout=DEFAULT_TIMEOUT_SECONDS)
+
+    def generate(self, prompt, *, model, api_key, timeout, attachments=(), json_output=True):
+        parts = [{"text": prompt}]
+        for path in attachments:
+            path = Path(path)
+            mime_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            parts.append(
+                {"inline_data": {"mime_type": mime_type, "data": base64.b64encode(path.read_bytes()).decode("ascii")}}
+            )
+        body = {"contents": [{"role": "user", "parts": parts}]}
+        if json_output:
+            body["generationConfig"] = {"responseMimeType": "application/json"}
+
+        url = f"{self.base_url}/models/{urllib.parse.quote(model)}:generateContent"
+        headers = {"Content-Type": "application/json", "x-goog-api-key": api_key}
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        if len(data) > API_INLINE_REQUEST_MAX_BYTES:
+            raise GeminiError(
+                f"Gemini API request is {len(data) / (1024 * 1024):.1f} MB, over the "
+                f"{API_INLINE_REQUEST_MAX_BYTES // (1024 * 1024)} MB inline limit"
+            )
+        try:
+            try:
+                response = self.pool.request(
+                    url, method="POST", data=data, headers=headers, context=DEFAULT_SSL_CONTEXT, timeout=timeout
+                )
+            except urllib.error.URLError as exc:
+                if isinstance(exc, urllib.error.HTTPError) or not isinstance(
+                    getattr(exc, "reason", None), ssl.SSLCertVerificationError
+                ):
+                    raise
+                response = self.pool.request(
+                    url, method="POST", data=data, headers=headers, context=INSECURE_SSL_CONTEXT, timeout=timeout
+                )
+        except urllib.error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", errors="replace")[:300]
+            error_class = GeminiTransportError if exc.code >= 500 else GeminiError
+            raise error_class(f"Gemini API returned HTTP {exc.code}: {detail}", status_code=exc.code) from exc
+        except urllib.error.URLError as exc:
+            if isinstance(exc.reason, TimeoutError):
+                raise GeminiTimeout(f"Gemini API request timed out after {timeout}s") from exc
+            raise GeminiTransportError(f"Gemini API request failed: {exc.reason}") from exc
+
+        payload = json.loads(response.read().decode("utf-8"))
+        candidates = payload.get("candidates") or []
+        parts = ((candidates[0].get("content") or {}).get("parts") or []) if candidates else []
+        text = "".join(part.get("text", "") for part in parts)
+        if not text:
+            reason = (payload.get("promptFeedback") or {}).get("blockReason") or "no candidates"
+            raise GeminiError(f"Gemini API returned no text ({reason})")
+        return text
+
+
+class CliTransport:
+    name = "cli"
+
+    def generate(self, prompt, *, model, env, timeout, attachments=(), json_output=True):
+        command = ["gemini", "--model", model, "--output-format", "json"]
+        if attachments:
+            # The CLI reads files referenced as @name from the included directories.
+            references = "\n".join(f"@{Path(path).name}" for path in attachments)
+            directories = sorted({str(Path(path).resolve().parent) for path in attachments})
+            command[1:1] = ["-p", f"{prompt}\n\n{references}"]
+            for directory in directories:
+                command.extend(["--include-directories", directory])
+            stdin_payload = None
+        else:
+            command[1:1] = ["-p", "Generate JSON only as instructed."]
+            stdin_payload = prompt
+
+        try:
+            proc = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE if stdin_payload is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env,
+                start_new_session=True,  # 建立獨立進程組，方便整組 kill
+            )
+        except OSError as exc:
+            raise GeminiError(f"could not start gemini CLI: {exc}") from exc
+        try:
+            stdout, stderr = proc.communicate(input=stdin_payload, timeout=timeout)
+        except subprocess.TimeoutExpired as exc:
+            self.kill(proc)
+            raise GeminiTimeout(f"gemini CLI timed out after {timeout}s") from exc
+        except BaseException:
+            self.kill(proc)
+            raise
+
+        if proc.returncode not in (0, None):
+            print(f"   ⚠️ Gemini CLI exited with code {proc.returncode}.")
+        if stderr.strip():
+            print(f"   ⚠️ Gemini CLI stderr: {stderr.strip()[:300]}")
+        envelope_error = cli_envelope_error(stdout)
+        if envelope_error is not None:
+            message, code = envelope_error
+            raise GeminiError(f"gemini CLI error: {message[:300]}", status_code=code)
+        if proc.returncode not in (0, None) or not stdout.strip():
+            raise GeminiError(
+                stderr.strip()[:300] or f"gemini exited with code {proc.returncode} and {len(stdout)} chars of output"
+            )
+        return unwrap_cli_output(stdout)
+
+    @staticmethod
+    def kill(proc):
+        try:
+            os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+        except (ProcessLookupError, OSError):
+            proc.kill()
+        try:
+            proc.communicate(timeout=5)
+        except Exception:
+            pass
+
+
+class GeminiClient:
+    """One per process; picks the backend and key per attempt and keeps connections warm."""
+
+    def __init__(self, key_pool, *, backend=None, api_transport=None, cli_transport=None):
+        self.key_pool = key_pool
+        self.backend = (backend or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND).strip().lower()
+        if self.backend not in ("auto", "api", "cli"):
+            raise ValueError(f"Unsupported {BACKEND_ENV} {self.backend!r} (expected auto, api or cli)")
+        self.api_transport = api_transport or ApiTransport()
+        self.cli_transport = cli_transport or CliTransport()
+
+    def api_key_for_attempt(self, model, attempt_index):
+        key = self.key_pool.key_for_attempt(model, attempt_index)
+        if key is not None:
+            return key.value, key.label
+        value = (os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY") or "").strip()
+        return (value, "environment") if value else (None, "environment")
+
+    def describe_attempt(self, model, attempt_index):
+        """Return ``(backend name, key label)`` for logging before a request."""
+        api_key, key_label = self.api_key_for_attempt(model, attempt_index)
+        return self.transport_name(api_key), key_label
+
+    def transport_name(self, api_key):
+        if self.backend == "auto":
+            return "api" if api_key else "cli"
+        return self.backend
+
+    def generate(self, prompt, *, model, attempt_index=0, timeout=DEFAULT_TIMEOUT_SECONDS, attachments=(), json_output=True):
+        """Return the model's text for ``prompt``; raise ``GeminiError`` / ``GeminiTimeout``."""
+        key = self.key_pool.acquire(model, attempt_index)
+        started = time.monotonic()
+        outcome = None
+        try:
+            text = self._generate_with_key(key, prompt, model, timeout, attachments, json_output)
+            outcome = "success"
+            return text
+        except Exception as exc:
+            outcome = outcome_for_error(exc)
+            raise
+        finally:
+            self.key_pool.release(key, outcome, time.monotonic() - started)
+
+    def _generate_with_key(self, key, prompt, model, timeout, attachments, json_output):
+        if key is not None:
+            api_key = key.value
+        else:
+            api_key, _key_label = self.api_key_for_attempt(model, 0)
+        if self.transport_name(api_key) == "api":
+            if not api_key:
+                raise GeminiError(f"{BACKEND_ENV}=api but no Gemini API key is configured for {model}")
+            try:
+                return self.api_transport.generate(
+                    prompt,
+                    model=model,
+                    api_key=api_key,
+                    timeout=timeout,
+                    attachments=attachments,
+                    json_output=json_output,
+                )
+            except GeminiTransportError as exc:
+                if self.backend != "auto":
+                    raise
+                print(f"   ⚠️ {exc}; retrying this attempt with the gemini CLI.")
+
+        env, _key_label = self.key_pool.env_for_key(key)
+        return self.cli_transport.generate(
+            prompt,
+            model=model,
+            env=env,
+            timeout=timeout,
+            attachments=attachments,
+            json_output=json_output,
+        )
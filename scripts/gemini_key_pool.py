@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
 
+import fcntl
 import json
 import os
 import re
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parents[1]
 LOCAL_CONFIG = ROOT / "config/gemini_api_keys.local.json"
 SHARED_CONFIG = ROOT / "config/gemini_api_keys.json"
+HEALTH_STATE = ROOT / "reports/gemini_key_health.json"
+HEALTH_STATE_ENV = "DAILY_CURATION_GEMINI_KEY_HEALTH_FILE"
+HEALTH_VERSION = 1
+
+# 429 / timeout cool-downs double per consecutive failure: 30s, 60s, 120s ... capped at 15 min.
+COOLDOWN_BASE_SECONDS = 30
+COOLDOWN_MAX_SECONDS = 900
+LATENCY_EWMA_ALPHA = 0.3
+OUTCOMES = ("success", "rate_limited", "timeout", "error")
 
 
 PRO_MODEL_RE = re.compile(r"(^|[-_.])pro($|[-_.])", re.IGNORECASE)
@@ -26,12 +40,125 @@ class GeminiKey:
         return self.name or "unnamed-key"
 
 
+class KeyHealthState:
+    """Per-key success, latency, 429 and timeout stats shared by every process via a locked file.
+
+    Entries are keyed by key label; key material is never written.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self.entries = {}
+        self.loaded_mtime = None
+
+    @contextmanager
+    def locked(self, exclusive):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(self.lock_path, "a+")
+        except OSError:
+            # Read-only checkout: keep the stats in memory for this process only.
+            yield
+            return
+        with handle:
+            fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self.loaded_mtime:
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if payload.get("version") == HEALTH_VERSION:
+            self.entries = payload.get("keys") or {}
+            self.loaded_mtime = mtime
+
+    def refresh(self):
+        """Pick up outcomes other processes recorded since the last read."""
+        with self.locked(exclusive=False):
+            self._read()
+
+    def record(self, label, outcome, latency_seconds):
+        with self.locked(exclusive=True):
+            self._read()
+            entry = self.entries.setdefault(label, new_health_entry())
+            apply_outcome(entry, outcome, latency_seconds, time.time())
+            payload = {"version": HEALTH_VERSION, "keys": self.entries}
+            temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            try:
+                temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+                os.replace(temp_path, self.path)
+                self.loaded_mtime = self.path.stat().st_mtime_ns
+            except OSError:
+                pass
+            return dict(entry)
+
+
+def new_health_entry():
+    return {
+        "successes": 0,
+        "failures": 0,
+        "rate_limited": 0,
+        "timeouts": 0,
+        "consecutive_failures": 0,
+        "latency_ewma": None,
+        "cooldown_until": 0.0,
+        "last_outcome": None,
+        "updated_at": None,
+    }
+
+
+def apply_outcome(entry, outcome, latency_seconds, now):
+    if outcome not in OUTCOMES:
+        raise ValueError(f"Unknown Gemini key outcome {outcome!r}")
+    if outcome == "success":
+        entry["successes"] += 1
+        entry["consecutive_failures"] = 0
+        entry["cooldown_until"] = 0.0
+        if latency_seconds is not None:
+            previous = entry.get("latency_ewma")
+            entry["latency_ewma"] = round(
+                latency_seconds if previous is None
+                else LATENCY_EWMA_ALPHA * latency_seconds + (1 - LATENCY_EWMA_ALPHA) * previous,
+                3,
+            )
+    else:
+        entry["failures"] += 1
+        entry["consecutive_failures"] += 1
+        if outcome in ("rate_limited", "timeout"):
+            entry["rate_limited" if outcome == "rate_limited" else "timeouts"] += 1
+            backoff = min(COOLDOWN_BASE_SECONDS * 2 ** (entry["consecutive_failures"] - 1), COOLDOWN_MAX_SECONDS)
+            entry["cooldown_until"] = round(max(entry.get("cooldown_until") or 0.0, now + backoff), 3)
+    entry["last_outcome"] = outcome
+    entry["updated_at"] = datetime.fromtimestamp(now).astimezone().isoformat()
+
+
 class GeminiKeyPool:
-    """Select Gemini API keys by model family without logging key material."""
+    """Select Gemini API keys by model family and health without logging key material.
 
-    def __init__(self, config_path=None):
+    Keys that returned 429 or timed out cool down with exponential backoff;
+    among the rest the least-loaded, least-failing, fastest key is chosen.
+    Outcomes reported through ``acquire`` / ``release`` are persisted to
+    ``reports/gemini_key_health.json`` (``DAILY_CURATION_GEMINI_KEY_HEALTH_FILE``)
+    so every script and process shares them.
+    """
+
+    def __init__(self, config_path=None, health_path=None):
         self.config_path = Path(config_path) if config_path else self._default_config_path()
         self.keys = self._load_keys()
+        self.health = KeyHealthState(health_path or self._default_health_path())
+        self.lock = threading.Lock()
+        self.in_flight = {}
 
     @staticmethod
     def is_pro_model(model):
@@ -54,15 +181,83 @@ class GeminiKeyPool:
             return requested_attempts
         return max(requested_attempts, eligible_count)
 
+    def concurrency_for_model(self, model, limit=None):
+        """One in-flight request per eligible key (at least one), optionally capped at ``limit``."""
+        concurrency = max(1, len(self.keys_for_model(model)))
+        return min(concurrency, limit) if limit else concurrency
+
+    def key_for_attempt(self, model, attempt_index):
+        """Best key right now; ``attempt_index`` only rotates the order among equally good keys."""
+        eligible_keys = self.keys_for_model(model)
+        if not eligible_keys:
+            return None
+        self.health.refresh()
+        with self.lock:
+            return self._select(model, eligible_keys, attempt_index)
+
+    def _select(self, model, eligible_keys, attempt_index):
+        now = time.time()
+        prefer_pro = self.is_pro_model(model)
+        offset = attempt_index % len(eligible_keys)
+
+        def rank(position):
+            key = eligible_keys[position]
+            entry = self.health.entries.get(key.label) or {}
+            cooldown_until = entry.get("cooldown_until") or 0.0
+            latency = entry.get("latency_ewma")
+            return (
+                # Cooling keys last, soonest-recovering first when every key is cooling.
+                cooldown_until if cooldown_until > now else 0.0,
+                self.in_flight.get(key.label, 0),
+                entry.get("consecutive_failures", 0),
+                0 if not prefer_pro or key.scope == "pro" else 1,
+                round(latency) if latency is not None else 0,
+                (position - offset) % len(eligible_keys),
+            )
+
+        return eligible_keys[min(range(len(eligible_keys)), key=rank)]
+
+    def acquire(self, model, attempt_index):
+        """Pick a key and count it as in flight until ``release``; ``None`` when no key is configured."""
+        eligible_keys = self.keys_for_model(model)
+        if not eligible_keys:
+            return None
+        self.health.refresh()
+        with self.lock:
+            key = self._select(model, eligible_keys, attempt_index)
+            self.in_flight[key.label] = self.in_flight.get(key.label, 0) + 1
+        return key
+
+    def release(self, key, outcome=None, latency_seconds=None):
+        """Record ``outcome`` (success, rate_limited, timeout, error) for ``key``; ``None`` only frees it."""
+        if key is None:
+            return None
+        with self.lock:
+            self.in_flight[key.label] = max(0, self.in_flight.get(key.label, 0) - 1)
+        if outcome is None:
+            return None
+        return self.health.record(key.label, outcome, latency_seconds)
+
+    def health_report(self):
+        self.health.refresh()
+        now = time.time()
+        report = []
+        for key in self.keys:
+            entry = dict(self.health.entries.get(key.label) or new_health_entry())
+            entry["cooldown_remaining_seconds"] = round(max(0.0, (entry.get("cooldown_until") or 0.0) - now), 1)
+            report.append({"key": key.label, "scope": key.scope, **entry})
+        return report
+
     def env_for_attempt(self, model, attempt_index, base_env=None):
+        return self.env_for_key(self.key_for_attempt(model, attempt_index), base_env)
+
+    def env_for_key(self, key, base_env=None):
         env = dict(base_env or os.environ)
         env["NODE_TLS_REJECT_UNAUTHORIZED"] = "0"
 
-        eligible_keys = self.keys_for_model(model)
-        if not eligible_keys:
+        if key is None:
             return env, "environment"
 
-        key = eligible_keys[attempt_index % len(eligible_keys)]
         env["GEMINI_API_KEY"] = key.value
         env.pop("GOOGLE_API_KEY", None)
         env.pop("GOOGLE_GENAI_USE_VERTEXAI", None)
@@ -79,6 +274,11 @@ class GeminiKeyPool:
             return SHARED_CONFIG
         return LOCAL_CONFIG
 
+    @staticmethod
+    def _default_health_path():
+        override = (os.environ.get(HEALTH_STATE_ENV) or "").strip()
+        return Path(override).expanduser() if override else HEALTH_STATE
+
     def _load_keys(self):
         config_keys = self._load_config_keys()
         if config_keys:
@@ -134,3 +334,12 @@ class GeminiKeyPool:
         if not raw:
             return []
         return [value.strip() for value in raw.split(",") if value.strip()]
+
+
+def main():
+    print(json.dumps(GeminiKeyPool().health_report(), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,7 @@
+import hashlib
 import json
 import os
 import sys
-import signal
 import subprocess
 import urllib.request
 import urllib.parse
@@ -11,6 +11,8 @@ from datetime import datetime
 import xml.etree.ElementTree as ET
 import ssl
 
+from content_store import open_store
+from gemini_client import GeminiClient, GeminiTimeout
 from gemini_key_pool import GeminiKeyPool
 
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -19,8 +21,11 @@ SOURCES_FILE = 'deep_analysis_sources.json'
 STATE_FILE = 'analysis_state.json'
 NEWS_JSON = 'daily_news_temp.json'
 PROMPT_FILE = 'deep_analysis_prompt.md'
+ANALYSIS_CACHE_DIR = 'reports/deep_analysis_cache'
+ANALYSIS_CACHE_MAX_ENTRIES = 500
 DEEP_ANALYSIS_MODEL = 'gemini-3-flash-preview'
 GEMINI_KEYS = GeminiKeyPool()
+GEMINI = GeminiClient(GEMINI_KEYS)
 AI_REQUEST_TIMEOUT_SECONDS = 120
 FORMAT_REPAIR_TIMEOUT_SECONDS = 120
 AI_RETRY_DELAY_SECONDS = 5
@@ -52,73 +57,86 @@ def has_descriptive_analysis_headings(analysis_text):
 
     return True
 
-def extract_json_object_from_gemini_stdout(stdout):
-    """Extract the model's JSON object from Gemini CLI stdout."""
-    try:
-        cli_response = json.loads(stdout)
-        ai_output = cli_response.get("response", stdout)
-    except json.JSONDecodeError:
-        ai_output = stdout
-
+def extract_json_object_from_gemini_output(ai_output):
+    """Extract the model's JSON object from Gemini's response text."""
     match = re.search(r'\{.*\}', ai_output, re.DOTALL)
     if not match:
         return None, ai_output
 
     return json.loads(match.group(0)), ai_output
 
-def cleanup_process(proc):
-    if not proc:
-        return
-    if proc.poll() is not None:
-        return
-
-    try:
-        os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
-    except (ProcessLookupError, OSError):
-        proc.kill()
-    try:
-        proc.communicate(timeout=5)
-    except Exception:
-        pass
-
 def run_gemini_json_request(prompt, *, attempt_index, max_attempts, request_label, timeout_seconds=AI_REQUEST_TIMEOUT_SECONDS):
     """Run a bounded Gemini JSON request and return a parsed object, or None."""
-    proc = None
     try:
-        env, key_label = GEMINI_KEYS.env_for_attempt(DEEP_ANALYSIS_MODEL, attempt_index)
-        print(f"   🚀 {request_label} (Attempt {attempt_index + 1}/{max_attempts}, key: {key_label})...")
-        proc = subprocess.Popen(
-            ["gemini", "-p", "Generate JSON only as instructed.", "--model", DEEP_ANALYSIS_MODEL, "--output-format", "json"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env=env,
-            start_new_session=True
+        backend, key_label = GEMINI.describe_attempt(DEEP_ANALYSIS_MODEL, attempt_index)
+        print(f"   🚀 {request_label} (Attempt {attempt_index + 1}/{max_attempts}, backend: {backend}, key: {key_label})...")
+        print(f"   📡 已送出請求，等待回應 (上限 {timeout_seconds}s)...")
+        ai_output = GEMINI.generate(
+            prompt,
+            model=DEEP_ANALYSIS_MODEL,
+            attempt_index=attempt_index,
+            timeout=timeout_seconds,
         )
-        print(f"   📡 已送出請求 (PID: {proc.pid})，等待回應 (上限 {timeout_seconds}s)...")
-        stdout, stderr = proc.communicate(input=prompt, timeout=timeout_seconds)
-        print(f"   📥 收到回應 ({len(stdout)} chars)，開始解析...")
-        if proc.returncode not in (0, None):
-            print(f"   ⚠️ Gemini CLI exited with code {proc.returncode}.")
-        if stderr.strip():
-            print(f"   ⚠️ Gemini CLI stderr: {stderr.strip()[:300]}")
-
-        result, ai_output = extract_json_object_from_gemini_stdout(stdout)
+        print(f"   📥 收到回應 ({len(ai_output)} chars)，開始解析...")
+
+        result, ai_output = extract_json_object_from_gemini_output(ai_output)
         if result is None:
             print("   ⚠️ Failed to extract JSON from AI response:")
             print(ai_output[:200] + "...")
             return None
         return result
-    except subprocess.TimeoutExpired:
-        print("   ⚠️ AI request timed out — 終止進程組...")
+    except GeminiTimeout:
+        print("   ⚠️ AI request timed out.")
     except Exception as e:
         print(f"   ⚠️ AI request failed: {e}")
-    finally:
-        cleanup_process(proc)
 
     return None
 
+def analysis_cache_path(article_text, prompt_base, model=DEEP_ANALYSIS_MODEL):
+    """Content-addressed cache file for (article text, prompt, model)."""
+    article_hash = hashlib.sha256(article_text.encode('utf-8')).hexdigest()
+    prompt_hash = hashlib.sha256(prompt_base.encode('utf-8')).hexdigest()
+    key = hashlib.sha256(f"{article_hash}:{prompt_hash}:{model}".encode('utf-8')).hexdigest()
+    return os.path.join(ANALYSIS_CACHE_DIR, f"{key}.json")
+
+def load_cached_analysis(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    result = entry.get("result")
+    if isinstance(result, dict) and has_descriptive_analysis_headings(result.get("analysis_zh")):
+        os.utime(cache_path)  # recently used entries survive pruning
+        return result
+    return None
+
+def save_cached_analysis(cache_path, result, source_name="", source_url=""):
+    """Write one validated analysis atomically; keep only the newest ANALYSIS_CACHE_MAX_ENTRIES files."""
+    os.makedirs(ANALYSIS_CACHE_DIR, exist_ok=True)
+    entry = {
+        "model": DEEP_ANALYSIS_MODEL,
+        "source_name": source_name,
+        "source_url": source_url,
+        "cached_at": datetime.now().astimezone().isoformat(),
+        "result": result,
+    }
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, cache_path)
+
+    cached_files = sorted(
+        (os.path.join(ANALYSIS_CACHE_DIR, name) for name in os.listdir(ANALYSIS_CACHE_DIR) if name.endswith('.json')),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for stale_path in cached_files[ANALYSIS_CACHE_MAX_ENTRIES:]:
+        try:
+            os.remove(stale_path)
+        except OSError:
+            pass
+
 def repair_analysis_format(result, *, attempt_offset):
     """Ask Gemini to repair only the JSON/heading format before giving up."""
     if not isinstance(result, dict):
@@ -237,7 +255,7 @@ def fetch_clean_article(url, max_retries=3):
     return None
 
 def analyze_with_ai(article_text, source_name="", source_url="", rss_title="", max_retries=2):
-    """Call Gemini CLI to generate deep analysis JSON with retries."""
+    """Call Gemini to generate deep analysis JSON with retries."""
     if not os.path.exists(PROMPT_FILE):
         print(f"   ⚠️ {PROMPT_FILE} not found.")
         return None
@@ -245,6 +263,13 @@ def analyze_with_ai(article_text, source_name="", source_url="", rss_title="", m
     with open(PROMPT_FILE, 'r', encoding='utf-8') as f:
         prompt_base = f.read()
 
+    # Reruns (stage timeout, lost state file) reuse analyses of the same text with the same prompt.
+    cache_path = analysis_cache_path(article_text, prompt_base)
+    cached_result = load_cached_analysis(cache_path)
+    if cached_result:
+        print(f"   ♻️ Reusing cached analysis ({os.path.basename(cache_path)[:12]}), no Gemini request needed.")
+        return cached_result
+
     article_metadata = {
         "source_name": source_name,
         "rss_title": rss_title,
@@ -265,17 +290,19 @@ def analyze_with_ai(article_text, source_name="", source_url="", rss_title="", m
             full_text,
             attempt_index=attempt,
             max_attempts=max_attempts,
-            request_label="啟動 Gemini CLI 進程",
+            request_label="送出 Gemini 深度分析請求",
             timeout_seconds=AI_REQUEST_TIMEOUT_SECONDS,
         )
 
         if result and has_descriptive_analysis_headings(result.get("analysis_zh")):
+            save_cached_analysis(cache_path, result, source_name, source_url)
             return result
 
         if result:
             print("   ⚠️ Deep analysis headings are not descriptive enough.")
             repaired = repair_analysis_format(result, attempt_offset=max_attempts)
             if repaired:
+                save_cached_analysis(cache_path, repaired, source_name, source_url)
                 return repaired
                 
         if attempt < max_attempts - 1:
@@ -334,21 +361,46 @@ def main():
     with open(SOURCES_FILE, 'r') as f:
         sources_config = json.load(f)
     
-    state = {}
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
-
-    # Initialize or load daily news temp
-    if os.path.exists(NEWS_JSON):
-        with open(NEWS_JSON, 'r', encoding='utf-8') as f:
-            daily_data = json.load(f)
+    # With the optional content store, the store is authoritative for progress:
+    # opening it re-imports the JSON files only if something else rewrote them,
+    # each analysed source is one row upsert, and the JSON files are exported
+    # once at the end of the run.
+    store = open_store()
+    if store:
+        state = store.export_analysis_state()
+        daily_data = store.export_daily_news()
+        if daily_data is None:
+            daily_data = {"fetch_date": str(datetime.now().date()), "deep_analysis": {}}
+            store.import_daily_news(daily_data)
+        fetch_date = daily_data.get("fetch_date") or str(datetime.now().date())
     else:
-        daily_data = {"fetch_date": str(datetime.now().date()), "deep_analysis": {}}
+        state = {}
+        if os.path.exists(STATE_FILE):
+            with open(STATE_FILE, 'r') as f:
+                state = json.load(f)
+
+        # Initialize or load daily news temp
+        if os.path.exists(NEWS_JSON):
+            with open(NEWS_JSON, 'r', encoding='utf-8') as f:
+                daily_data = json.load(f)
+        else:
+            daily_data = {"fetch_date": str(datetime.now().date()), "deep_analysis": {}}
 
     if "deep_analysis" not in daily_data:
         daily_data["deep_analysis"] = {}
 
+    def save_progress(source_key, content, state_entry=None):
+        if store:
+            store.upsert_deep_analysis(fetch_date, source_key, content)
+            if state_entry is not None:
+                store.upsert_analysis_state(source_key, state_entry)
+            return
+        with open(NEWS_JSON, 'w', encoding='utf-8') as f:
+            json.dump(daily_data, f, ensure_ascii=False, indent=2)
+        if state_entry is not None:
+            with open(STATE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+
     updates_processed = 0
     deep_analysis_updates = []
 
@@ -389,8 +441,7 @@ def main():
                 # 如果今天還沒存進 temp，就標記更新以便觸發渲染
                 # (但不用重寫 state)
                 updates_processed += 1
-                with open(NEWS_JSON, 'w', encoding='utf-8') as f:
-                    json.dump(daily_data, f, ensure_ascii=False, indent=2)
+                save_progress(name, cached_content)
             continue
 
         print(f"   🆕 NEW ARTICLE DETECTED: {raw_title}")
@@ -444,17 +495,19 @@ def main():
             updates_processed += 1
 
             # ⚡ Incremental save
-            with open(NEWS_JSON, 'w', encoding='utf-8') as f:
-                json.dump(daily_data, f, ensure_ascii=False, indent=2)
-            with open(STATE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(state, f, ensure_ascii=False, indent=2)
+            save_progress(name, content_to_save, state[name])
             print(f"   💾 Progress saved.")
         else:
             print("   ❌ AI failed to generate valid analysis format.")
 
     daily_data["deep_analysis_updates"] = deep_analysis_updates
-    with open(NEWS_JSON, 'w', encoding='utf-8') as f:
-        json.dump(daily_data, f, ensure_ascii=False, indent=2)
+    if store:
+        store.import_daily_news(daily_data)
+        store.export_progress(fetch_date=fetch_date)
+        store.close()
+    else:
+        with open(NEWS_JSON, 'w', encoding='utf-8') as f:
+            json.dump(daily_data, f, ensure_ascii=False, indent=2)
 
     if updates_processed > 0:
         print(f"\n🎉 Processed {updates_processed} new deep analyses.")
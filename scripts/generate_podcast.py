@@ -5,7 +5,7 @@
 
 流程:
 1. 從 YouTube 抓取逐字稿 (yt-dlp)，若失敗則用 Jina Reader 抓文字
-2. 呼叫 Gemini CLI 進行章節式深度敘事分析 (繁中)
+2. 呼叫 Gemini 進行章節式深度敘事分析 (繁中)
 3. 輸出到 podcast_data.json
 4. 呼叫 render_podcast.py 注入 HTML
 5. 呼叫 publish.py 部署
@@ -21,6 +21,7 @@ import argparse
 import urllib.request
 from datetime import datetime
 
+from gemini_client import GeminiClient, GeminiError, GeminiTimeout
 from gemini_key_pool import GeminiKeyPool
 
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -31,8 +32,11 @@ JINA_PREFIX = "https://r.jina.ai/"
 PODCAST_JSON = "podcast_data.json"
 TEMP_DIR = "/tmp/podcast_workdir"
 GEMINI_AUDIO_MAX_MB = 19.0
+# REST requests carry audio as base64 inline_data (+33%) under a ~20 MB request limit.
+GEMINI_API_AUDIO_MAX_MB = 14.0
 PODCAST_MODEL = "gemini-3-flash-preview"
 GEMINI_KEYS = GeminiKeyPool()
+GEMINI = GeminiClient(GEMINI_KEYS)
 
 # --- Podcast Analysis Prompt ---
 PODCAST_PROMPT = """你是一位熟悉科技、創投與商業議題的台灣繁體中文 Podcast 編輯。
@@ -325,13 +329,13 @@ def enforce_taiwan_wording(data):
     return cleaned
 
 
-def prepare_audio_for_gemini(audio_path):
-    """Keep audio small enough for Gemini CLI @file ingestion."""
+def prepare_audio_for_gemini(audio_path, max_mb=GEMINI_AUDIO_MAX_MB):
+    """Keep audio under ``max_mb``: @file ingestion (CLI) or base64 inline upload (API)."""
     file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-    if file_size_mb <= GEMINI_AUDIO_MAX_MB:
+    if file_size_mb <= max_mb:
         return audio_path
 
-    print(f"   🔧 音檔 {file_size_mb:.1f} MB 超過 Gemini CLI 限制，先壓縮成分析用音檔...")
+    print(f"   🔧 音檔 {file_size_mb:.1f} MB 超過 Gemini 限制 ({max_mb:.0f} MB)，先壓縮成分析用音檔...")
     compressed_path = os.path.join(TEMP_DIR, "podcast_audio_gemini.mp3")
 
     for bitrate in ("32k", "24k", "16k"):
@@ -364,12 +368,12 @@ def prepare_audio_for_gemini(audio_path):
 
         compressed_size_mb = os.path.getsize(compressed_path) / (1024 * 1024)
         print(f"   ✅ 壓縮完成 ({bitrate}, {compressed_size_mb:.1f} MB)")
-        if compressed_size_mb <= GEMINI_AUDIO_MAX_MB:
+        if compressed_size_mb <= max_mb:
             return compressed_path
 
         print("   ⚠️ 壓縮後仍超過限制，改用更低 bitrate 重試...")
 
-    print("   ❌ 無法將音檔壓到 Gemini CLI 可接受大小")
+    print("   ❌ 無法將音檔壓到 Gemini 可接受大小")
     return None
 
 
@@ -378,68 +382,40 @@ def analyze_with_gemini(text, is_audio_file=False):
     print("   🧠 送入 Gemini 進行深度章節分析...")
 
     if is_audio_file:
-        audio_path = prepare_audio_for_gemini(text)
+        backend, _key_label = GEMINI.describe_attempt(PODCAST_MODEL, 0)
+        max_mb = GEMINI_API_AUDIO_MAX_MB if backend == "api" else GEMINI_AUDIO_MAX_MB
+        audio_path = prepare_audio_for_gemini(text, max_mb=max_mb)
         if not audio_path:
             return None
 
-        audio_filename = os.path.basename(audio_path)
-        audio_dir = os.path.dirname(audio_path)
-        audio_prompt = (
-            PODCAST_PROMPT
-            + f"\n\n@{audio_filename}\n\n"
-            + "請先轉錄並理解這個音檔，再依照上方規範輸出合法 JSON。"
-        )
-        cmd = [
-            "gemini", "-p", audio_prompt,
-            "--model", PODCAST_MODEL,
-            "--output-format", "json",
-            "--include-directories", audio_dir,
-        ]
-        stdin_payload = None
+        prompt = PODCAST_PROMPT + "\n\n請先轉錄並理解這個音檔，再依照上方規範輸出合法 JSON。"
+        attachments = [audio_path]
         timeout_secs = 600
     else:
-        full_prompt = PODCAST_PROMPT + "\n\n" + text[:150000]  # Cap at 150k chars
-        cmd = [
-            "gemini", "-p", "Generate JSON only as instructed.",
-            "--model", PODCAST_MODEL,
-            "--output-format", "json",
-        ]
-        stdin_payload = full_prompt
+        prompt = PODCAST_PROMPT + "\n\n" + text[:150000]  # Cap at 150k chars
+        attachments = []
         timeout_secs = 300
 
     max_attempts = GEMINI_KEYS.attempt_count_for_model(PODCAST_MODEL, 3)
     for attempt in range(max_attempts):
-        env, key_label = GEMINI_KEYS.env_for_attempt(PODCAST_MODEL, attempt)
-        print(f"   🚀 啟動 Gemini CLI 進程 (Attempt {attempt + 1}/{max_attempts}, key: {key_label})")
-        proc = subprocess.Popen(
-            cmd,
-            stdin=None if is_audio_file else subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env=env,
-        )
+        backend, key_label = GEMINI.describe_attempt(PODCAST_MODEL, attempt)
+        print(f"   🚀 送出 Gemini 請求 (Attempt {attempt + 1}/{max_attempts}, backend: {backend}, key: {key_label})")
 
         try:
-            stdout, stderr = proc.communicate(input=stdin_payload, timeout=timeout_secs)
-
-            if not stdout or not stdout.strip():
-                print("   ⚠️ Gemini 無輸出")
-                if stderr:
-                    print(f"      stderr: {stderr[:200]}")
-                continue
-
-            # Try to parse JSON from output
-            raw = stdout.strip()
-
-            # Handle Gemini CLI's session envelope: {"session_id": ..., "response": "..."}
-            try:
-                envelope = json.loads(raw)
-                if 'response' in envelope and isinstance(envelope['response'], str):
-                    raw = envelope['response'].strip()
-            except (json.JSONDecodeError, TypeError):
-                pass
-
+            raw = GEMINI.generate(
+                prompt,
+                model=PODCAST_MODEL,
+                attempt_index=attempt,
+                timeout=timeout_secs,
+                attachments=attachments,
+            ).strip()
+        except GeminiTimeout:
+            print("   ⚠️ Gemini 分析逾時")
+        except GeminiError as e:
+            print("   ⚠️ Gemini 無輸出")
+            print(f"      error: {str(e)[:200]}")
+            continue
+        else:
             # Try direct parse
             try:
                 data = json.loads(raw)
@@ -478,10 +454,6 @@ def analyze_with_gemini(text, is_audio_file=False):
             print("   ⚠️ 無法解析 Gemini 輸出的 JSON")
             print(f"      前 300 字元: {raw[:300]}")
 
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            print("   ⚠️ Gemini 分析逾時")
-
         if attempt < max_attempts - 1:
             print("   ⏳ 改用 key pool 下一把 key 重試...")
 
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Small keep-alive HTTP client shared by the X watch scripts.
+
+``urllib.request.urlopen`` opens a fresh connection (and TLS handshake) per
+request. ``ConnectionPool`` keeps idle ``http.client`` connections per host
+and reuses them, while raising the same ``urllib.error`` exceptions callers
+already handle: ``HTTPError`` for 4xx/5xx and ``URLError`` wrapping the
+original reason (e.g. ``ssl.SSLCertVerificationError``) for transport errors.
+"""
+
+import http.client
+import io
+import ssl
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+REDIRECT_STATUS = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+# A reused connection the server already closed fails on first use; retry those once.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class PooledResponse:
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def getcode(self):
+        return self.status
+
+    def read(self):
+        return self.body
+
+
+class ConnectionPool:
+    """Bounded per-host pool of persistent HTTP(S) connections; safe across threads."""
+
+    def __init__(self, max_per_host=6, timeout=30):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.slots = {}
+        self.stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0}
+
+    def request(self, url, *, method="GET", data=None, headers=None, context=None, timeout=None):
+        """``timeout`` overrides the pool's socket timeout for this request only."""
+        headers = dict(headers or {})
+        timeout = timeout or self.timeout
+        for _redirect in range(MAX_REDIRECTS + 1):
+            if self.uses_proxy(url):
+                return self.request_via_urllib(
+                    url, method=method, data=data, headers=headers, context=context, timeout=timeout
+                )
+            response = self.send(url, method=method, data=data, headers=headers, context=context, timeout=timeout)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_STATUS or not location:
+                break
+            url = urllib.parse.urljoin(url, location)
+            if response.status == 303 or (response.status in {301, 302} and method == "POST"):
+                method, data = "GET", None
+                headers.pop("Content-Type", None)
+
+        if response.status >= 400:
+            raise urllib.error.HTTPError(
+                response.url,
+                response.status,
+                response.reason,
+                response.headers,
+                io.BytesIO(response.body),
+            )
+        return response
+
+    def send(self, url, *, method, data, headers, context, timeout=None):
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in {"http", "https"}:
+            raise urllib.error.URLError(f"unsupported URL scheme: {parsed.scheme}")
+        key = (parsed.scheme, parsed.hostname, parsed.port, id(context) if parsed.scheme == "https" else None)
+        target = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+
+        slot = self.slot(key)
+        with slot:
+            for attempt in range(2):
+                connection, reused = self.checkout(key, parsed, context)
+                connection.timeout = timeout or self.timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(connection.timeout)
+                try:
+                    connection.request(method, target, body=data, headers=headers)
+                    raw = connection.getresponse()
+                    body = raw.read()
+                except STALE_CONNECTION_ERRORS as exc:
+                    connection.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise urllib.error.URLError(exc) from exc
+                except (OSError, http.client.HTTPException) as exc:
+                    connection.close()
+                    reason = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+                    raise urllib.error.URLError(reason) from exc
+
+                if raw.will_close:
+                    connection.close()
+                else:
+                    self.checkin(key, connection)
+                with self.lock:
+                    self.stats["requests"] += 1
+                return PooledResponse(url, raw.status, raw.reason, raw.msg, body)
+
+    def slot(self, key):
+        with self.lock:
+            if key not in self.slots:
+                self.slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return self.slots[key]
+
+    def checkout(self, key, parsed, context):
+        with self.lock:
+            idle = self.idle.get(key)
+            if idle:
+                self.stats["connections_reused"] += 1
+                return idle.pop(), True
+            self.stats["connections_opened"] += 1
+        if parsed.scheme == "https":
+            connection = http.client.HTTPSConnection(
+                parsed.hostname,
+                parsed.port,
+                timeout=self.timeout,
+                context=context or ssl.create_default_context(),
+            )
+        else:
+            connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=self.timeout)
+        return connection, False
+
+    def checkin(self, key, connection):
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def uses_proxy(self, url):
+        parsed = urllib.parse.urlsplit(url)
+        proxies = urllib.request.getproxies()
+        return parsed.scheme in proxies and not urllib.request.proxy_bypass(parsed.hostname or "")
+
+    def request_via_urllib(self, url, *, method, data, headers, context, timeout=None):
+        """Proxied requests go through urllib, which already speaks CONNECT and proxy auth."""
+        request = urllib.request.Request(url, data=data, headers=headers, method=method)
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout, context=context) as response:
+            return PooledResponse(response.geturl(), response.getcode(), response.reason, response.headers, response.read())
+
+    def close(self):
+        with self.lock:
+            connections = [connection for idle in self.idle.values() for connection in idle]
+            self.idle.clear()
+        for connection in connections:
+            connection.close()
@@ -6,6 +6,8 @@ import json
 import os
 from pathlib import Path
 
+from archive_manifest import MANIFEST_NAME, snapshot_paths
+
 CONFLICT_MARKER_RE = re.compile(r"^(<{7}|={7}|>{7})(?: .*)?$")
 SAFE_DAILY_PUBLISH_ENV = "DAILY_CURATION_SAFE_PUBLISH"
 SAFE_PUBLISH_KIND_ENV = "DAILY_CURATION_PUBLISH_KIND"
@@ -138,6 +140,10 @@ def daily_content_paths():
     ]
     optional_paths = [
         Path("analysis_state.json"),
+        Path("archives") / MANIFEST_NAME,
+        Path("data") / "chunks",
+        Path("data") / "search",
+        Path("search.html"),
         Path("assets") / "images" / "fallback-techmeme-headline.png",
         Path("assets") / "images" / "fallback-wsj-headline.png",
     ]
@@ -185,7 +191,11 @@ def podcast_content_paths():
         Path("podcast_highlights_feed.json"),
     ]
     archive_dir = Path("archives")
-    optional_paths = sorted(archive_dir.glob("podcast-*.html")) if archive_dir.exists() else []
+    optional_paths = snapshot_paths(archive_dir, "podcast") if archive_dir.exists() else []
+    optional_paths.append(archive_dir / MANIFEST_NAME)
+    for data_dir in (Path("data") / "chunks", Path("data") / "search"):
+        if data_dir.exists():
+            optional_paths.append(data_dir)
     current_archive = Path("archives") / f"podcast-{podcast_date}.html"
     if current_archive.exists() and current_archive not in optional_paths:
         optional_paths.append(current_archive)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Adaptive (AIMD) request pacing for the X watch scrapers.
+
+Each endpoint family (Google News RSS, search, decode, oEmbed) gets a token
+bucket whose rate grows additively after every successful request and is
+halved on a 429/503. A ``Retry-After`` header, or an exponential penalty
+when there is none, blocks the whole family until it expires. The learned
+rates and any pending block persist as JSON so the next run starts where the
+last one stopped instead of at hand-tuned constants.
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+
+STATE_VERSION = 1
+THROTTLE_STATUS = {429, 503}
+# family: (initial rate/s, min rate, max rate, burst)
+ENDPOINT_RATE_LIMITS = {
+    "google_news_rss": (1.0, 0.1, 4.0, 3),
+    "google_news_search": (0.5, 0.05, 2.0, 2),
+    "google_news_decode": (1.5, 0.1, 5.0, 4),
+    "oembed": (3.0, 0.2, 8.0, 6),
+}
+ADDITIVE_INCREASE = 0.02
+MULTIPLICATIVE_DECREASE = 0.5
+BASE_PENALTY_SECONDS = 5.0
+MAX_PENALTY_SECONDS = 180.0
+
+
+def endpoint_family(url):
+    parsed = urllib.parse.urlsplit(url)
+    host = parsed.hostname or ""
+    if host in {"publish.x.com", "publish.twitter.com"}:
+        return "oembed"
+    if host != "news.google.com":
+        return None
+    if parsed.path.startswith("/rss/"):
+        return "google_news_rss"
+    if parsed.path.startswith("/search"):
+        return "google_news_search"
+    return "google_news_decode"
+
+
+def parse_retry_after(value):
+    """Return Retry-After in seconds (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``reserve`` returns how long the caller must wait."""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.refill(time.monotonic())
+            self.rate = float(rate)
+
+    def reserve(self):
+        with self.lock:
+            self.refill(time.monotonic())
+            self.tokens -= 1.0
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class EndpointController:
+    def __init__(self, family, rate, min_rate, max_rate, burst):
+        self.family = family
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.bucket = TokenBucket(rate, burst)
+        self.lock = threading.Lock()
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.successes = 0
+        self.throttles = 0
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def wait(self):
+        """Sleep through any Retry-After block, then for a token; return seconds waited."""
+        waited = 0.0
+        blocked = self.blocked_until - time.time()
+        if blocked > 0:
+            time.sleep(blocked)
+            waited += blocked
+        delay = self.bucket.reserve()
+        if delay > 0:
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    def record(self, status, retry_after=None):
+        with self.lock:
+            if status in THROTTLE_STATUS:
+                self.throttles += 1
+                self.consecutive_throttles += 1
+                self.bucket.set_rate(max(self.min_rate, self.rate * MULTIPLICATIVE_DECREASE))
+                penalty = retry_after
+                if penalty is None:
+                    penalty = BASE_PENALTY_SECONDS * 2 ** (self.consecutive_throttles - 1)
+                penalty = min(MAX_PENALTY_SECONDS, penalty)
+                self.blocked_until = max(self.blocked_until, time.time() + penalty)
+            elif status is not None and status < 400:
+                self.successes += 1
+                self.consecutive_throttles = 0
+                self.bucket.set_rate(min(self.max_rate, self.rate + ADDITIVE_INCREASE))
+
+    def to_state(self):
+        return {
+            "rate": round(self.rate, 4),
+            "blocked_until": self.blocked_until,
+            "consecutive_throttles": self.consecutive_throttles,
+            "successes": self.successes,
+            "throttles": self.throttles,
+        }
+
+    def load_state(self, state):
+        rate = state.get("rate")
+        if isinstance(rate, (int, float)) and rate > 0:
+            self.bucket.set_rate(min(self.max_rate, max(self.min_rate, rate)))
+        self.blocked_until = float(state.get("blocked_until") or 0.0)
+        self.consecutive_throttles = int(state.get("consecutive_throttles") or 0)
+
+
+class AdaptiveRateLimiter:
+    """One ``EndpointController`` per family; URLs outside every family are not paced.
+
+    With ``enabled`` off, ``wait`` and ``record`` do nothing, so callers get
+    the unpaced timing they had before adaptive rate control.
+    """
+
+    def __init__(self, limits=None, enabled=True):
+        self.lock = threading.Lock()
+        self.enabled = enabled
+        self.configure(limits or ENDPOINT_RATE_LIMITS)
+
+    def configure(self, limits):
+        with self.lock:
+            self.controllers = {
+                family: EndpointController(family, rate, min_rate, max_rate, burst)
+                for family, (rate, min_rate, max_rate, burst) in limits.items()
+            }
+
+    def controller(self, url):
+        return self.controllers.get(endpoint_family(url))
+
+    def wait(self, url):
+        if not self.enabled:
+            return 0.0
+        controller = self.controller(url)
+        return controller.wait() if controller else 0.0
+
+    def record(self, url, status, retry_after=None):
+        if not self.enabled:
+            return
+        controller = self.controller(url)
+        if controller:
+            controller.record(status, retry_after)
+
+    def snapshot(self):
+        return {family: controller.to_state() for family, controller in self.controllers.items()}
+
+    def load_state(self, path):
+        path = Path(path)
+        if not path.exists():
+            return False
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return False
+        if not isinstance(payload, dict) or payload.get("version") != STATE_VERSION:
+            return False
+        for family, state in (payload.get("endpoints") or {}).items():
+            if family in self.controllers and isinstance(state, dict):
+                self.controllers[family].load_state(state)
+        return True
+
+    def save_state(self, path):
+        path = Path(path)
+        payload = {
+            "version": STATE_VERSION,
+            "updated_at": datetime.now().astimezone().isoformat(),
+            "endpoints": self.snapshot(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        os.replace(temp_path, path)
+
+
+def parse_endpoint_rate_limits(raw_values):
+    """Parse ``family=rate[:burst]`` overrides on top of ``ENDPOINT_RATE_LIMITS``."""
+    limits = dict(ENDPOINT_RATE_LIMITS)
+    for raw_value in raw_values or []:
+        family, _, spec = raw_value.partition("=")
+        rate, _, burst = spec.partition(":")
+        family = family.strip()
+        if family not in limits or not rate.strip():
+            raise ValueError(
+                f"Invalid endpoint rate: {raw_value!r} "
+                f"(expected family=rate[:burst], family one of {', '.join(limits)})"
+            )
+        rate = float(rate)
+        _initial, min_rate, max_rate, default_burst = limits[family]
+        limits[family] = (rate, min(min_rate, rate), max(max_rate, rate), float(burst) if burst else default_burst)
+    return limits
@@ -7,6 +7,8 @@ from datetime import datetime
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 
+from x_archive_store import load_archive
+
 
 ACCOUNT_COLORS = {
     "karpathy": "#3b82f6",
@@ -441,7 +443,7 @@ def main():
     parser.add_argument("--output", required=True, help="Output HTML path")
     args = parser.parse_args()
 
-    data = load_json(args.archive_json)
+    data = load_archive(args.archive_json)
     translations = load_json(args.translations_json)
     prepared_rows = prepare_rows(data, translations)
     html_output = build_html(prepared_rows, data.get("generated_at", ""))
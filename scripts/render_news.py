@@ -4,6 +4,8 @@ import os
 import sys
 from datetime import datetime
 
+from archive_manifest import record_snapshot
+
 # Configuration
 JSON_PATH = 'daily_news_temp.json'
 HTML_PATH = 'index.html'
@@ -190,6 +192,7 @@ def main():
     
     with open(archive_filepath, 'w', encoding='utf-8') as f:
         f.write(new_content)
+    record_snapshot(archive_filepath)
     
     print(f"📦 已將今日內容備份至：{archive_filepath}")
 
@@ -6,6 +6,8 @@ import re
 import subprocess
 from datetime import datetime
 
+from archive_manifest import record_snapshot
+
 
 def rebuild_podcast_highlights_page():
     section_builder = os.path.join("scripts", "build_section_pages.py")
@@ -195,6 +197,7 @@ def render_to_html(section_only=False):
                 try:
                     with open(old_archive_path, 'w', encoding='utf-8') as f:
                         f.write(html_content)
+                    record_snapshot(old_archive_path)
                     print(f"📦 已備份舊內容 ({file_date}) 至：{old_archive_path}")
                     
                     # 更新存檔清單 (避免重複)
@@ -9,6 +9,8 @@ import urllib.parse
 import ssl
 from datetime import datetime
 
+from content_store import sync_daily_news
+
 # Disable SSL verification for RSS fetching (macOS python environment fix)
 ssl._create_default_https_context = ssl._create_unverified_context
 
@@ -436,6 +438,7 @@ def refresh_existing_headline_images():
 
     with open(DAILY_NEWS_JSON, 'w', encoding='utf-8') as f:
         json.dump(daily_data, f, indent=2, ensure_ascii=False)
+    sync_daily_news()
 
     return True
 
@@ -566,6 +569,7 @@ def update_news_headlines():
     # Save raw data for agent to translate
     with open(DAILY_NEWS_JSON, 'w', encoding='utf-8') as f:
         json.dump(daily_data, f, indent=2, ensure_ascii=False)
+    sync_daily_news()
 
 def check_translation_quality():
     """
@@ -6,12 +6,17 @@ import os
 import shutil
 import subprocess
 import sys
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import discover_public_x_posts as discover_module
+from content_store import open_store
+from gemini_client import BACKEND_ENV
+from x_archive_store import DEFAULT_COMPACT_AFTER_ROWS, XArchiveStore, load_archive
+from x_decode_cache import build_cache_entry, load_decode_cache, save_decode_cache, touch_entry, update_decode_cache
+from x_watch_retention import DEFAULT_RETENTION_DAYS, apply_retention
+from x_watch_trace import TRACER, format_summary_table
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -25,6 +30,8 @@ WORKFLOW_SECRETS_CONFIG = ROOT / "config/x_watch_secrets.local.json"
 REPORTS_DIR = ROOT / "reports"
 PREVIEW_PATH = ROOT / "daily_curation_x_tab_preview.html"
 DECODE_CACHE_PATH = REPORTS_DIR / "x_watch_decode_cache.json"
+RATE_STATE_PATH = REPORTS_DIR / "x_watch_rate_state.json"
+RSS_CACHE_PATH = REPORTS_DIR / "x_watch_rss_cache.json"
 ARCHIVE_PATH = REPORTS_DIR / "x_watch_archive_latest.json"
 SITE_X_POSTS_PATH = Path.home() / "daily-curation" / "x-posts.html"
 SITE_REPO_PATH = SITE_X_POSTS_PATH.parent
@@ -35,6 +42,7 @@ SITE_X_POSTS_RELATIVE_PATHS = {
     "assets/styles.css",
     "data/x-posts.js",
 }
+SITE_X_POSTS_RELATIVE_DIRS = ("data/chunks/", "data/search/")
 SITE_PUBLISH_URL = "https://mobbymobbym-arch.github.io/daily-curation/x-posts.html"
 
 
@@ -65,6 +73,29 @@ def workflow_positive_int(workflow, key, default):
     return value
 
 
+def adaptive_rate_control(workflow):
+    return bool(workflow.get("adaptive_rate_control", False))
+
+
+def apply_adaptive_throttles(workflow):
+    """Zero the hand-tuned sleeps once the adaptive limiter paces every discover request.
+
+    Deferred decode retry rounds are kept, but they no longer wait a fixed
+    cool-down: the next request blocks on the endpoint's learned rate and
+    any Retry-After instead. The archive backfill runs in its own process
+    without the learned state, so its throttle stays as configured.
+    """
+    adapted = dict(workflow)
+    for key, value in workflow.items():
+        if key == "archive_backfill_row_throttle_seconds":
+            continue
+        if key.endswith("_row_throttle_seconds") or key.startswith("sleep_") or key == "pre_high_volume_cooldown_seconds":
+            adapted[key] = 0.0
+        elif key.endswith("_decode_retry_cooldowns"):
+            adapted[key] = ",".join("0" for _ in discover_module.parse_optional_float_list(value))
+    return adapted
+
+
 def load_workflow_secrets(path=WORKFLOW_SECRETS_CONFIG):
     if not path.exists():
         return {}
@@ -74,9 +105,12 @@ def load_workflow_secrets(path=WORKFLOW_SECRETS_CONFIG):
     return payload
 
 
-def build_translate_env():
+def build_translate_env(workflow=None):
     env = dict(os.environ)
     env["NODE_TLS_REJECT_UNAUTHORIZED"] = "0"
+    # An explicit DAILY_CURATION_GEMINI_BACKEND in the environment wins over the config.
+    if workflow and workflow.get("gemini_backend"):
+        env.setdefault(BACKEND_ENV, workflow["gemini_backend"])
     return env
 
 
@@ -100,7 +134,26 @@ def run_parallel_preserve_order(items, max_workers, worker):
     return results
 
 
-def run_discover(handles, *, hours, row_throttle_seconds, retry_delays, decode_retry_cooldowns, output_path):
+def run_discover(
+    handles,
+    *,
+    hours,
+    row_throttle_seconds,
+    retry_delays,
+    decode_retry_cooldowns,
+    output_path,
+    in_process=False,
+):
+    if in_process:
+        return run_discover_in_process(
+            handles,
+            hours=hours,
+            row_throttle_seconds=row_throttle_seconds,
+            retry_delays=retry_delays,
+            decode_retry_cooldowns=decode_retry_cooldowns,
+            output_path=output_path,
+        )
+
     command = [
         sys.executable,
         str(DISCOVER_SCRIPT),
@@ -116,21 +169,60 @@ def run_discover(handles, *, hours, row_throttle_seconds, retry_delays, decode_r
         "--output",
         str(output_path),
     ]
+    if not discover_module.RATE_LIMITER.enabled:
+        command.append("--no-rate-control")
+    elif RATE_STATE_PATH.exists():
+        # Start from the learned endpoint rates; the child saves what it learns back.
+        command.extend(["--rate-state", str(RATE_STATE_PATH)])
+    command.extend(["--rss-cache", str(RSS_CACHE_PATH)])
+    if DECODE_CACHE_PATH.exists():
+        command.extend(["--known-posts", str(DECODE_CACHE_PATH)])
+    trace_path = output_path.with_suffix(".trace.json")
+    if TRACER.enabled:
+        command.extend(["--trace", str(trace_path)])
     try:
-        subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        with TRACER.span("discover_subprocess", kind="handle", handle=",".join(handles)):
+            subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
     except subprocess.CalledProcessError as exc:
         details = (exc.stderr or exc.stdout or "").strip()
         if not details:
             details = str(exc)
         raise RuntimeError(f"discover failed for {', '.join(handles)}: {details}") from exc
+    if TRACER.enabled and trace_path.exists():
+        TRACER.merge(load_json(trace_path))
     return load_json(output_path)
 
 
+def run_discover_in_process(handles, *, hours, row_throttle_seconds, retry_delays, decode_retry_cooldowns, output_path):
+    """Call ``discover_module.discover_handles`` on the current worker thread.
+
+    Workers share the module's SSL contexts and per-host rate limiter; the
+    result is still written to ``output_path`` as the run record.
+    """
+    try:
+        result = discover_module.discover_handles(
+            handles,
+            hours=hours,
+            now=datetime.now().astimezone(),
+            retry_delays=discover_module.parse_retry_delays(retry_delays),
+            row_throttle_seconds=float(row_throttle_seconds),
+            decode_retry_cooldowns=discover_module.parse_optional_float_list(decode_retry_cooldowns),
+        )
+    except Exception as exc:
+        raise RuntimeError(f"discover failed for {', '.join(handles)}: {exc}") from exc
+    write_json(output_path, result)
+    return result
+
+
+def discover_in_process(workflow):
+    return bool(workflow.get("discover_in_process", True))
+
+
 def synthesize_handle_result(handle, *, hours, summary, generated_at, error=None):
     result = {
         "lookback_hours": hours,
@@ -172,7 +264,8 @@ def preflight_handle(handle, *, hours, now, retry_delays):
     cutoff = now - timedelta(hours=hours)
 
     try:
-        items = discover_module.fetch_rss_items(handle, retry_delays, hours)
+        with TRACER.bind(handle):
+            items = discover_module.fetch_rss_items(handle, retry_delays, hours)
     except discover_module.ScrapeError as exc:
         summary["failed"] += 1
         if discover_module.is_rate_limit_label(exc.label):
@@ -253,6 +346,7 @@ def run_primary_parallel(infos, *, hours, workflow, run_dir, concurrency):
             retry_delays=profile["retry_delays"],
             decode_retry_cooldowns=profile["decode_retry_cooldowns"],
             output_path=output_path,
+            in_process=discover_in_process(workflow),
         )
         return info["handle"], result
 
@@ -269,6 +363,7 @@ def run_rerun_like_parallel(handles, *, hours, workflow, run_dir, stage, concurr
             retry_delays=workflow["rerun_retry_delays"],
             decode_retry_cooldowns=workflow["rerun_decode_retry_cooldowns"],
             output_path=output_path,
+            in_process=discover_in_process(workflow),
         )
         return handle, result
 
@@ -291,197 +386,47 @@ def handle_for_row(row):
     return query.lstrip("@")
 
 
-def row_identity_candidates(row):
-    candidates = []
-    if row.get("google_news_url"):
-        candidates.append(("google_news_url", row["google_news_url"]))
-    if row.get("post_url"):
-        candidates.append(("post_url", row["post_url"]))
-    if row.get("post_id"):
-        candidates.append(("post_id", str(row["post_id"])))
-    return candidates
-
-
-def row_quality_score(row):
-    score = 0
-    if row.get("extraction_status") == "text_extracted":
-        score += 1000
-    if row.get("post_url"):
-        score += 100
-    if row.get("full_text_confident"):
-        score += 50
-    if row.get("text"):
-        score += min(len(row["text"]), 400)
-    if row.get("is_truncated"):
-        score -= 20
-    return score
-
-
-def build_archive_entry(row, seen_at):
-    entry = dict(row)
-    entry["archive_key"] = row.get("post_url") or row.get("google_news_url")
-    entry["first_seen_at"] = seen_at
-    entry["last_seen_at"] = seen_at
-    entry["last_seen_in_run_at"] = seen_at
-    entry["seen_count"] = 1
-    return entry
-
-
-def merge_archive_row(existing, incoming, seen_at):
-    existing_score = row_quality_score(existing)
-    incoming_score = row_quality_score(incoming)
-    if incoming_score >= existing_score:
-        merged = dict(existing)
-        merged.update(incoming)
-        updated = True
-    else:
-        merged = dict(existing)
-        updated = False
-
-    merged["archive_key"] = (
-        existing.get("archive_key")
-        or incoming.get("post_url")
-        or incoming.get("google_news_url")
-        or existing.get("post_url")
-        or existing.get("google_news_url")
-    )
-    merged["first_seen_at"] = existing.get("first_seen_at", seen_at)
-    merged["last_seen_at"] = seen_at
-    merged["last_seen_in_run_at"] = seen_at
-    merged["seen_count"] = int(existing.get("seen_count", 1)) + 1
-    return merged, updated
-
-
-def load_archive():
-    if ARCHIVE_PATH.exists():
-        return load_json(ARCHIVE_PATH)
+def load_archive_store():
+    store = XArchiveStore(ARCHIVE_PATH)
+    if store.exists():
+        return store
 
-    seeded_rows = []
     seed_stats = {"new_rows_added": 0, "rows_upgraded": 0, "rows_seen_again": 0}
     for path in sorted(REPORTS_DIR.glob("x_watch_results_*.json"), key=lambda item: item.stat().st_mtime):
         payload = load_json(path)
-        seeded_rows, step_stats = merge_rows_into_archive(
-            seeded_rows,
+        step_stats = store.upsert_rows(
             payload.get("rows", []),
             payload.get("generated_at") or datetime.now().astimezone().isoformat(),
         )
         for key, value in step_stats.items():
             seed_stats[key] += value
 
-    return {
-        "generated_at": datetime.now().astimezone().isoformat(),
-        "rows": seeded_rows,
-        "stats": seed_stats,
-    }
-
-
-def merge_rows_into_archive(existing_rows, incoming_rows, seen_at):
-    rows = [dict(row) for row in existing_rows]
-    index = {}
-    for idx, row in enumerate(rows):
-        for key in row_identity_candidates(row):
-            index[key] = idx
-
-    stats = {"new_rows_added": 0, "rows_upgraded": 0, "rows_seen_again": 0}
-
-    for incoming in incoming_rows:
-        match_index = None
-        for key in row_identity_candidates(incoming):
-            if key in index:
-                match_index = index[key]
-                break
-
-        if match_index is None:
-            entry = build_archive_entry(incoming, seen_at)
-            rows.append(entry)
-            new_index = len(rows) - 1
-            for key in row_identity_candidates(entry):
-                index[key] = new_index
-            stats["new_rows_added"] += 1
-            continue
+    store.set_meta(generated_at=datetime.now().astimezone().isoformat(), stats=seed_stats)
+    store.compact()
+    return store
 
-        merged_entry, updated = merge_archive_row(rows[match_index], incoming, seen_at)
-        rows[match_index] = merged_entry
-        for key in row_identity_candidates(merged_entry):
-            index[key] = match_index
-        if updated:
-            stats["rows_upgraded"] += 1
-        else:
-            stats["rows_seen_again"] += 1
 
-    return rows, stats
+def seed_known_posts(decode_cache, archive_store):
+    """Let discovery skip every candidate the archive or decode cache already extracted."""
+    entries = {}
+    for row in archive_store.rows:
+        if row.get("extraction_status") == "text_extracted" and row.get("google_news_url"):
+            entries[row["google_news_url"]] = build_cache_entry(row, row.get("last_seen_at"))
+    # Decode cache entries are shared by reference so skipped lookups refresh their LRU stamp.
+    entries.update(decode_cache["entries"])
+    return discover_module.load_known_posts(entries)
 
 
-def update_archive(archive_payload, result):
-    merged_rows, merge_stats = merge_rows_into_archive(
-        archive_payload.get("rows", []),
+def update_archive(store, result, workflow):
+    """Merge a run into the archive, appending only the touched rows to the journal."""
+    merge_stats = store.upsert_rows(
         result.get("rows", []),
         result.get("generated_at") or datetime.now().astimezone().isoformat(),
     )
-    return {
-        "generated_at": datetime.now().astimezone().isoformat(),
-        "rows": merged_rows,
-        "stats": merge_stats,
-    }
-
-
-def build_cache_entry(row, generated_at):
-    return {
-        "cached_from_generated_at": generated_at,
-        "google_news_url": row.get("google_news_url"),
-        "decoded_source_url": row.get("decoded_source_url"),
-        "post_url": row.get("post_url"),
-        "post_id": row.get("post_id"),
-        "screen_name": row.get("screen_name"),
-        "author_name": row.get("author_name"),
-        "author_url": row.get("author_url"),
-        "text": row.get("text"),
-        "text_length": row.get("text_length", 0),
-        "is_truncated": row.get("is_truncated", False),
-        "full_text_confident": row.get("full_text_confident", False),
-        "extraction_status": row.get("extraction_status"),
-        "oembed_status_code": row.get("oembed_status_code"),
-        "oembed_endpoint": row.get("oembed_endpoint"),
-    }
-
-
-def load_decode_cache():
-    entries = {}
-
-    if DECODE_CACHE_PATH.exists():
-        payload = load_json(DECODE_CACHE_PATH)
-        entries.update(payload.get("entries", {}))
-
-    for path in sorted(REPORTS_DIR.glob("x_watch_results_*.json"), key=lambda item: item.stat().st_mtime):
-        payload = load_json(path)
-        for row in payload.get("rows", []):
-            if row.get("extraction_status") != "text_extracted":
-                continue
-            google_news_url = row.get("google_news_url")
-            if not google_news_url:
-                continue
-            entries[google_news_url] = build_cache_entry(row, payload.get("generated_at"))
-
-    return {
-        "generated_at": datetime.now().astimezone().isoformat(),
-        "entries": entries,
-    }
-
-
-def update_decode_cache(cache_payload, result):
-    entries = dict(cache_payload.get("entries", {}))
-    for row in result.get("rows", []):
-        if row.get("extraction_status") != "text_extracted":
-            continue
-        google_news_url = row.get("google_news_url")
-        if not google_news_url:
-            continue
-        entries[google_news_url] = build_cache_entry(row, result.get("generated_at"))
-
-    return {
-        "generated_at": datetime.now().astimezone().isoformat(),
-        "entries": entries,
-    }
+    store.set_meta(generated_at=datetime.now().astimezone().isoformat(), stats=merge_stats)
+    store.flush()
+    store.maybe_compact(workflow.get("archive_compact_after_rows", DEFAULT_COMPACT_AFTER_ROWS))
+    return store.payload
 
 
 def apply_decode_cache(result, cache_payload):
@@ -499,6 +444,7 @@ def apply_decode_cache(result, cache_payload):
         cached = entries.get(google_news_url)
         if not cached or cached.get("extraction_status") != "text_extracted":
             continue
+        touch_entry(cached)
 
         handle = handle_for_row(row)
         summary = result["summary"][handle]
@@ -566,11 +512,16 @@ def replace_handle_result(base_result, replacement_result, handle):
 def load_known_translations():
     success = {}
     failed = {}
+    x_watch_latest = REPORTS_DIR / "x_watch_translations_latest.json"
+    # The latest file is rewritten with the union every run, so only hand-dropped
+    # x_post_translations files newer than it still need reading.
+    latest_mtime = x_watch_latest.stat().st_mtime if x_watch_latest.exists() else None
     for path in sorted(REPORTS_DIR.glob("x_post_translations*.json"), key=lambda item: item.stat().st_mtime):
+        if latest_mtime is not None and path.stat().st_mtime <= latest_mtime:
+            continue
         payload = load_json(path)
         success.update(payload.get("success_translations", {}))
         failed.update(payload.get("failed_candidate_translations", {}))
-    x_watch_latest = REPORTS_DIR / "x_watch_translations_latest.json"
     if x_watch_latest.exists():
         payload = load_json(x_watch_latest)
         success.update(payload.get("success_translations", {}))
@@ -647,6 +598,10 @@ def porcelain_path(line):
     return line[3:].strip()
 
 
+def is_site_x_posts_path(path):
+    return path in SITE_X_POSTS_RELATIVE_PATHS or path.startswith(SITE_X_POSTS_RELATIVE_DIRS)
+
+
 def inspect_site_worktree():
     completed = run_site_git(["status", "--porcelain"])
     if completed.returncode != 0:
@@ -659,12 +614,12 @@ def inspect_site_worktree():
     x_posts_changes = [
         line
         for line in changes
-        if porcelain_path(line) in SITE_X_POSTS_RELATIVE_PATHS
+        if is_site_x_posts_path(porcelain_path(line))
     ]
     unrelated_changes = [
         line
         for line in changes
-        if porcelain_path(line) not in SITE_X_POSTS_RELATIVE_PATHS
+        if not is_site_x_posts_path(porcelain_path(line))
     ]
     return {
         "changes": changes,
@@ -772,6 +727,11 @@ def publish_site_x_posts(workflow):
         }
 
     publish_paths = sorted(SITE_X_POSTS_RELATIVE_PATHS)
+    publish_paths.extend(
+        directory.rstrip("/")
+        for directory in SITE_X_POSTS_RELATIVE_DIRS
+        if (SITE_REPO_PATH / directory).exists()
+    )
     add = run_site_git(["add", "--", *publish_paths])
     if add.returncode != 0:
         return {
@@ -978,7 +938,7 @@ def translate_missing_archive_items(archive_path, translation_path, workflow):
         "--failed-batch-size",
         str(workflow["translation_batch_size_failed"]),
     ]
-    subprocess.run(command, check=True, env=build_translate_env())
+    subprocess.run(command, check=True, env=build_translate_env(workflow))
 
 
 def backfill_archive_failures(workflow):
@@ -1047,10 +1007,20 @@ def main():
     )
     args = parser.parse_args()
 
+    TRACER.start()
+    TRACER.stage("load_state")
     handles = load_json(HANDLES_CONFIG)["handles"]
     workflow = load_json(WORKFLOW_CONFIG)
-    decode_cache = load_decode_cache()
-    archive = load_archive()
+    rate_control_enabled = adaptive_rate_control(workflow)
+    # Off restores baseline timing: no pacing in-process or in discover subprocesses.
+    discover_module.RATE_LIMITER.enabled = rate_control_enabled
+    if rate_control_enabled:
+        discover_module.RATE_LIMITER.load_state(RATE_STATE_PATH)
+        workflow = apply_adaptive_throttles(workflow)
+    discover_module.RSS_CACHE.load(RSS_CACHE_PATH)
+    decode_cache = load_decode_cache(DECODE_CACHE_PATH, REPORTS_DIR)
+    archive_store = load_archive_store()
+    known_posts = seed_known_posts(decode_cache, archive_store)
     hours = args.hours or workflow["hours"]
     now = datetime.now().astimezone()
     timestamp = datetime.now().astimezone().strftime("%Y%m%d_%H%M%S")
@@ -1074,6 +1044,7 @@ def main():
         or workflow_positive_int(workflow, "limited_parallel_rerun_concurrency", 2),
     }
 
+    TRACER.stage("preflight")
     preflight_retry_delays = discover_module.parse_retry_delays(workflow["preflight_retry_delays"])
     if limited_parallel_enabled:
         preflight_infos = run_preflight_parallel(
@@ -1109,6 +1080,7 @@ def main():
         )
     )
 
+    TRACER.stage("primary_low_medium")
     low_medium_infos = [
         info for info in active_infos if info["candidate_count"] <= workflow["high_candidate_threshold"]
     ]
@@ -1137,9 +1109,10 @@ def main():
                 retry_delays=profile["retry_delays"],
                 decode_retry_cooldowns=profile["decode_retry_cooldowns"],
                 output_path=output_path,
+                in_process=discover_in_process(workflow),
             )
             primary_results_by_handle[info["handle"]] = result
-            time.sleep(profile["sleep_after_handle_seconds"])
+            TRACER.sleep(profile["sleep_after_handle_seconds"], "sleep_after_handle", info["handle"])
 
     rescue_handles = []
     for info in low_medium_infos:
@@ -1147,8 +1120,9 @@ def main():
         if should_rescue_before_high(summary):
             rescue_handles.append(info["handle"])
 
+    TRACER.stage("rescue")
     if rescue_handles:
-        time.sleep(workflow["pre_high_volume_cooldown_seconds"])
+        TRACER.sleep(workflow["pre_high_volume_cooldown_seconds"], "pre_high_volume_cooldown")
         if limited_parallel_enabled:
             rescue_results = run_rerun_like_parallel(
                 rescue_handles,
@@ -1171,11 +1145,13 @@ def main():
                     retry_delays=workflow["rerun_retry_delays"],
                     decode_retry_cooldowns=workflow["rerun_decode_retry_cooldowns"],
                     output_path=output_path,
+                    in_process=discover_in_process(workflow),
                 )
                 if score_handle_result(rescue_result, handle) > score_handle_result(primary_results_by_handle[handle], handle):
                     primary_results_by_handle[handle] = rescue_result
-                time.sleep(workflow["sleep_between_handles_seconds"])
+                TRACER.sleep(workflow["sleep_between_handles_seconds"], "sleep_between_handles", handle)
 
+    TRACER.stage("primary_high")
     if limited_parallel_enabled:
         primary_results_by_handle.update(
             run_primary_parallel(
@@ -1197,14 +1173,16 @@ def main():
                 retry_delays=profile["retry_delays"],
                 decode_retry_cooldowns=profile["decode_retry_cooldowns"],
                 output_path=output_path,
+                in_process=discover_in_process(workflow),
             )
             primary_results_by_handle[info["handle"]] = result
-            time.sleep(profile["sleep_after_handle_seconds"])
+            TRACER.sleep(profile["sleep_after_handle_seconds"], "sleep_after_handle", info["handle"])
 
     primary_results = [primary_results_by_handle[handle] for handle in handles]
     merged = merge_result_sets(handles, primary_results)
     apply_decode_cache(merged, decode_cache)
 
+    TRACER.stage("rerun")
     if workflow["rerun_rate_limited_handles"] and not args.skip_rerun:
         rerun_handles = list_rate_limited_handles(merged)
         if limited_parallel_enabled:
@@ -1230,11 +1208,17 @@ def main():
                     retry_delays=workflow["rerun_retry_delays"],
                     decode_retry_cooldowns=workflow["rerun_decode_retry_cooldowns"],
                     output_path=output_path,
+                    in_process=discover_in_process(workflow),
                 )
                 apply_decode_cache(rerun_result, decode_cache)
                 if score_handle_result(rerun_result, handle) > score_handle_result(merged, handle):
                     replace_handle_result(merged, rerun_result, handle)
-                time.sleep(workflow["sleep_between_rerun_handles_seconds"])
+                TRACER.sleep(workflow["sleep_between_rerun_handles_seconds"], "sleep_between_rerun_handles", handle)
+
+    TRACER.stage("persist_results")
+    if rate_control_enabled:
+        discover_module.RATE_LIMITER.save_state(RATE_STATE_PATH)
+    discover_module.RSS_CACHE.save(RSS_CACHE_PATH)
 
     merged["generated_at"] = datetime.now().astimezone().isoformat()
 
@@ -1243,18 +1227,26 @@ def main():
     write_json(latest_result_path, merged)
     write_json(timestamped_result_path, merged)
 
-    archive = update_archive(archive, merged)
-    write_json(ARCHIVE_PATH, archive)
+    TRACER.stage("archive_update")
+    archive = update_archive(archive_store, merged, workflow)
+    content_store = open_store()
 
     decode_cache = update_decode_cache(decode_cache, merged)
-    write_json(DECODE_CACHE_PATH, decode_cache)
+    decode_cache_evicted = save_decode_cache(
+        DECODE_CACHE_PATH,
+        decode_cache,
+        ttl_days=workflow.get("decode_cache_ttl_days", 30),
+        max_entries=workflow.get("decode_cache_max_entries", 5000),
+    )
 
+    TRACER.stage("archive_backfill")
     backfill_stats = {}
     if workflow.get("archive_backfill_retry_enabled", False):
         backfill_stats = backfill_archive_failures(workflow)
-        archive = load_json(ARCHIVE_PATH)
-        decode_cache = load_json(DECODE_CACHE_PATH)
+        archive = load_archive(ARCHIVE_PATH)
+        decode_cache = load_decode_cache(DECODE_CACHE_PATH)
 
+    TRACER.stage("translation")
     known_translations = load_known_translations()
     latest_translation_path = REPORTS_DIR / "x_watch_translations_latest.json"
     write_json(latest_translation_path, known_translations)
@@ -1269,25 +1261,57 @@ def main():
     write_json(REPORTS_DIR / f"x_watch_translations_missing_{timestamp}.json", missing_scaffold)
     write_json(REPORTS_DIR / f"x_watch_translations_{timestamp}.json", known_translations)
 
+    TRACER.stage("content_store_sync")
+    if content_store:
+        content_store.sync_x_archive(archive)
+        content_store.sync_x_translations(known_translations)
+        content_store.close()
+
+    TRACER.stage("preview_render")
     render_preview(ARCHIVE_PATH, latest_translation_path)
+    TRACER.stage("site_sync")
     site_x_posts_sync = sync_preview_to_daily_curation_site(workflow)
 
     restored_from_cache_rows = sum(1 for row in merged["rows"] if row.get("restored_from_cache"))
     archive_rows_total = len(archive["rows"])
 
+    TRACER.stage("retention")
+    retention_stats = apply_retention(
+        REPORTS_DIR,
+        days=workflow.get("reports_retention_days", DEFAULT_RETENTION_DAYS),
+        archive_path=ARCHIVE_PATH,
+        decode_cache_path=DECODE_CACHE_PATH,
+        translations_path=latest_translation_path,
+        decode_cache_ttl_days=workflow.get("decode_cache_ttl_days", 30),
+        decode_cache_max_entries=workflow.get("decode_cache_max_entries", 5000),
+    )
+    trace_path = REPORTS_DIR / f"x_watch_trace_{timestamp}.json"
+    trace = TRACER.write(trace_path, handles=handles, run_dir=str(run_dir))
+    print(format_summary_table(trace), file=sys.stderr)
+
     print(json.dumps(
         {
             "handles": handles,
             "hours": hours,
             "workflow_mode": "limited_parallel" if limited_parallel_enabled else "serial",
             "parallel_settings": parallel_settings if limited_parallel_enabled else None,
+            "discover_mode": "in_process" if discover_in_process(workflow) else "subprocess",
+            "rate_control": discover_module.RATE_LIMITER.snapshot() if rate_control_enabled else None,
             "run_dir": str(run_dir),
+            "trace": str(trace_path),
+            "trace_wall_clock_seconds": trace["wall_clock_seconds"],
             "latest_result": str(latest_result_path),
             "timestamped_result": str(timestamped_result_path),
             "archive": str(ARCHIVE_PATH),
             "latest_translations": str(latest_translation_path),
             "missing_translations": str(missing_translation_path),
             "decode_cache": str(DECODE_CACHE_PATH),
+            "decode_cache_entries": len(decode_cache["entries"]),
+            "decode_cache_evicted": decode_cache_evicted,
+            "known_posts": known_posts,
+            "known_posts_skipped": sum(
+                summary.get("known_posts_skipped", 0) for summary in merged["summary"].values()
+            ),
             "preview": str(PREVIEW_PATH),
             "site_x_posts_sync": site_x_posts_sync,
             "restored_from_cache_rows": restored_from_cache_rows,
@@ -1295,6 +1319,7 @@ def main():
             "new_rows_added_to_archive": archive["stats"]["new_rows_added"],
             "rows_upgraded_in_archive": archive["stats"]["rows_upgraded"],
             "archive_backfill": backfill_stats,
+            "reports_retention": retention_stats,
             "rate_limited_handles": list_rate_limited_handles(merged),
             "no_candidate_handles": list_no_candidate_handles(merged),
         },
@@ -1,24 +1,30 @@
 import json
 import os
-import signal
-import subprocess
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 
+from content_store import sync_daily_news
+from gemini_client import GeminiClient, GeminiTimeout
 from gemini_key_pool import GeminiKeyPool
+from translation_memory import TranslationMemory
 
 DAILY_NEWS_JSON = 'daily_news_temp.json'
 BATCH_TIMEOUT = 120
 MAX_RETRIES = 3
 TRANSLATION_BATCH_SIZE = 20
+MAX_CONCURRENT_BATCHES = 4
 TRANSLATION_MODEL = "gemini-3-flash-preview"
 GEMINI_KEYS = GeminiKeyPool()
+GEMINI = GeminiClient(GEMINI_KEYS)
+MEMORY = TranslationMemory(model=TRANSLATION_MODEL)
 
-def translate_batch(batch_items, retry_count=0):
+def translate_batch(batch_items, retry_count=0, key_offset=0):
     """
-    Translates a batch of items using gemini CLI.
+    Translates a batch of items using the shared Gemini client.
     batch_items: list of dicts with 'id', 'title_en', 'summary_en'
+    key_offset: starting key index, so concurrent batches begin on different keys
     Returns: list of dicts with 'id', 'title_zh', 'summary_zh', or None if failed.
     """
     if not batch_items:
@@ -50,32 +56,12 @@ def translate_batch(batch_items, retry_count=0):
     ]
     """
 
-    proc = None
     try:
-        env, key_label = GEMINI_KEYS.env_for_attempt(TRANSLATION_MODEL, retry_count)
-        print(f"   🚀 啟動 Gemini CLI 進程... (key: {key_label})")
-        proc = subprocess.Popen(
-            ["gemini", "-p", "Generate JSON only as instructed.", "--model", TRANSLATION_MODEL, "--output-format", "json"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env=env,
-            start_new_session=True  # 建立獨立進程組，方便整組 kill
-        )
-        print(f"   📡 已送出請求 (PID: {proc.pid})，等待回應 (上限 {BATCH_TIMEOUT}s)...")
-        stdout, stderr = proc.communicate(input=prompt, timeout=BATCH_TIMEOUT)
-        print(f"   📥 收到回應 ({len(stdout)} chars)，開始解析...")
-        if proc.returncode not in (0, None):
-            print(f"   ⚠️ Gemini CLI exited with code {proc.returncode}.")
-        if stderr.strip():
-            print(f"   ⚠️ Gemini CLI stderr: {stderr.strip()[:300]}")
-
-        try:
-            cli_response = json.loads(stdout)
-            ai_output = cli_response.get("response", stdout)
-        except json.JSONDecodeError:
-            ai_output = stdout
+        attempt_index = key_offset + retry_count
+        backend, key_label = GEMINI.describe_attempt(TRANSLATION_MODEL, attempt_index)
+        print(f"   🚀 送出 Gemini 請求... (backend: {backend}, key: {key_label})，等待回應 (上限 {BATCH_TIMEOUT}s)...")
+        ai_output = GEMINI.generate(prompt, model=TRANSLATION_MODEL, attempt_index=attempt_index, timeout=BATCH_TIMEOUT)
+        print(f"   📥 收到回應 ({len(ai_output)} chars)，開始解析...")
 
         match = re.search(r'\[.*\]', ai_output, re.DOTALL)
         if match:
@@ -87,33 +73,15 @@ def translate_batch(batch_items, retry_count=0):
         else:
             print(f"   ⚠️ Could not parse JSON array from response: {ai_output[:150]}")
 
-    except subprocess.TimeoutExpired:
-        print(f"   ⚠️ Translation timed out after {BATCH_TIMEOUT}s — 正在終止進程組...")
-        if proc:
-            try:
-                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
-            except (ProcessLookupError, OSError):
-                proc.kill()
-            try:
-                proc.communicate(timeout=5)
-            except Exception:
-                pass
+    except GeminiTimeout:
+        print(f"   ⚠️ Translation timed out after {BATCH_TIMEOUT}s")
     except Exception as e:
         print(f"   ⚠️ Translation error: {e}")
-        if proc:
-            try:
-                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
-            except (ProcessLookupError, OSError):
-                proc.kill()
-            try:
-                proc.communicate(timeout=5)
-            except Exception:
-                pass
                 
     if retry_count < max_attempts - 1:
         print("   ⏳ Retrying in 5 seconds...")
         time.sleep(5)
-        return translate_batch(batch_items, retry_count + 1)
+        return translate_batch(batch_items, retry_count + 1, key_offset)
         
     print("   ❌ Exhausted all retries for this batch.")
     return None
@@ -121,7 +89,8 @@ def translate_batch(batch_items, retry_count=0):
 def main():
     print("========================================")
     print(f"🈯️ Automated News Translator - {datetime.now()}")
-    print(f"   Batch timeout: {BATCH_TIMEOUT}s, Max Retries: {MAX_RETRIES}, Batch size: {TRANSLATION_BATCH_SIZE}")
+    concurrency = GEMINI_KEYS.concurrency_for_model(TRANSLATION_MODEL, MAX_CONCURRENT_BATCHES)
+    print(f"   Batch timeout: {BATCH_TIMEOUT}s, Max Retries: {MAX_RETRIES}, Batch size: {TRANSLATION_BATCH_SIZE}, Concurrency: {concurrency}")
     print("========================================")
 
     if not os.path.exists(DAILY_NEWS_JSON):
@@ -131,9 +100,12 @@ def main():
     with open(DAILY_NEWS_JSON, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
-    # 1. Gather all items to translate
+    # 1. Gather all items to translate; strings already in the translation memory are not sent again
+    MEMORY.load()
     batch_requests = []
     item_map = {} # Maps 'section_index' to actual item ref
+    remembered = {} # Maps 'section_index' to cached (title_zh, summary_zh), None where not cached
+    total_remembered = 0
 
     for section in ["techmeme", "wsj"]:
         items = data.get(section, [])
@@ -145,26 +117,53 @@ def main():
                 continue
 
             item_id = f"{section}_{i}"
+            cached = (MEMORY.lookup(title_en), MEMORY.lookup(summary_en))
+            if None not in cached:
+                item["title_zh"], item["summary_zh"] = cached
+                item.pop("_translation_skipped", None)
+                total_remembered += 1
+                continue
+
             batch_requests.append({
                 "id": item_id,
-                "title_en": title_en,
-                "summary_en": summary_en
+                "title_en": title_en if cached[0] is None else "",
+                "summary_en": summary_en if cached[1] is None else ""
             })
             item_map[item_id] = item
+            remembered[item_id] = cached
+
+    if total_remembered:
+        print(f"🧠 {total_remembered} item(s) served from the translation memory.")
 
     if not batch_requests:
         print("✅ No new items require translation.")
+        if total_remembered:
+            with open(DAILY_NEWS_JSON, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            sync_daily_news()
+            MEMORY.save()
         return
 
     print(f"📰 Found {len(batch_requests)} items to translate. Initiating batch request...")
     
-    # 2. Perform Batch Translation
+    # 2. Perform Batch Translation (one batch in flight per eligible key; results kept in batch order)
+    batches = [
+        batch_requests[start:start + TRANSLATION_BATCH_SIZE]
+        for start in range(0, len(batch_requests), TRANSLATION_BATCH_SIZE)
+    ]
+
+    def run_batch(index):
+        batch = batches[index]
+        start = index * TRANSLATION_BATCH_SIZE
+        print(f"   📦 Translating items {start + 1}-{start + len(batch)} of {len(batch_requests)}...")
+        return translate_batch(batch, key_offset=index)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        batch_outcomes = list(executor.map(run_batch, range(len(batches))))
+
     results = []
     failed_requests = []
-    for start in range(0, len(batch_requests), TRANSLATION_BATCH_SIZE):
-        batch = batch_requests[start:start + TRANSLATION_BATCH_SIZE]
-        print(f"   📦 Translating items {start + 1}-{start + len(batch)} of {len(batch_requests)}...")
-        batch_results = translate_batch(batch)
+    for batch, batch_results in zip(batches, batch_outcomes):
         if batch_results:
             results.extend(batch_results)
         else:
@@ -180,8 +179,13 @@ def main():
             item_id = res.get("id")
             if item_id in item_map:
                 item = item_map[item_id]
-                item["title_zh"] = res.get("title_zh", "")
-                item["summary_zh"] = res.get("summary_zh", "")
+                cached_title, cached_summary = remembered[item_id]
+                if cached_title is None:
+                    MEMORY.store(item.get("title_en", ""), res.get("title_zh", ""))
+                if cached_summary is None:
+                    MEMORY.store(item.get("summary_en", ""), res.get("summary_zh", ""))
+                item["title_zh"] = res.get("title_zh", "") if cached_title is None else cached_title
+                item["summary_zh"] = res.get("summary_zh", "") if cached_summary is None else cached_summary
                 item.pop("_translation_skipped", None)
                 total_translated += 1
 
@@ -199,8 +203,10 @@ def main():
     # 4. Save to Disk
     with open(DAILY_NEWS_JSON, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    sync_daily_news()
+    MEMORY.save()
 
-    print(f"\n✅ Translation complete: {total_translated} translated, {total_failed} skipped (fell back to English).")
+    print(f"\n✅ Translation complete: {total_remembered} from memory, {total_translated} translated, {total_failed} skipped (fell back to English).")
     if total_failed > 0:
         print("   ℹ️  Items marked '_translation_skipped: true' in the JSON can be re-run later to retry.")
 
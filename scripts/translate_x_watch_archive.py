@@ -2,20 +2,26 @@
 
 import argparse
 import json
-import os
 import re
-import signal
-import subprocess
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from gemini_client import GeminiClient, GeminiTimeout
 from gemini_key_pool import GeminiKeyPool
+from translation_memory import TranslationMemory
+from x_archive_store import load_archive
 
 
 BATCH_TIMEOUT = 180
 MAX_RETRIES = 3
+MAX_CONCURRENT_BATCHES = 4
 TRANSLATION_MODEL = "gemini-3-flash-preview"
 GEMINI_KEYS = GeminiKeyPool()
+GEMINI = GeminiClient(GEMINI_KEYS)
+MEMORY = TranslationMemory(model=TRANSLATION_MODEL)
+SOURCE_FIELDS = {"success": "text", "failed": "title"}
 
 
 def load_json(path):
@@ -66,57 +72,37 @@ def build_missing_requests(archive, translations):
     return success_requests, failed_requests
 
 
-def gemini_json_request(prompt, *, attempt_index=0):
-    proc = None
-    env, key_label = GEMINI_KEYS.env_for_attempt(TRANSLATION_MODEL, attempt_index)
+def recall_translations(translations, requests, *, mode):
+    """Fill translations the memory already holds; return the requests that still need Gemini."""
+    field = SOURCE_FIELDS[mode]
+    target = translations["success_translations"] if mode == "success" else translations["failed_candidate_translations"]
+    remaining = []
+    for request in requests:
+        cached = MEMORY.lookup(request[field])
+        if cached:
+            target[request["id"]] = cached
+        else:
+            remaining.append(request)
+    return remaining
 
+
+def gemini_json_request(prompt, *, attempt_index=0):
+    backend, key_label = GEMINI.describe_attempt(TRANSLATION_MODEL, attempt_index)
+    print(f"   🚀 Gemini X translation request (backend: {backend}, key: {key_label})")
     try:
-        print(f"   🚀 Gemini X translation request (key: {key_label})")
-        proc = subprocess.Popen(
-            [
-                "gemini",
-                "-p",
-                "Generate JSON only as instructed.",
-                "--model",
-                TRANSLATION_MODEL,
-                "--output-format",
-                "json",
-            ],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env=env,
-            start_new_session=True,
+        ai_output = GEMINI.generate(
+            prompt,
+            model=TRANSLATION_MODEL,
+            attempt_index=attempt_index,
+            timeout=BATCH_TIMEOUT,
         )
-        stdout, stderr = proc.communicate(input=prompt, timeout=BATCH_TIMEOUT)
-        if proc.returncode not in (0, None):
-            raise RuntimeError(stderr.strip() or f"gemini exited with code {proc.returncode}")
-
-        try:
-            cli_response = json.loads(stdout)
-            ai_output = cli_response.get("response", stdout)
-        except json.JSONDecodeError:
-            ai_output = stdout
-
-        match = re.search(r"\[.*\]", ai_output, re.DOTALL)
-        if not match:
-            raise RuntimeError(f"could not parse JSON array from response: {ai_output[:200]}")
-        return json.loads(match.group(0))
-    except subprocess.TimeoutExpired as exc:
-        if proc:
-            try:
-                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
-            except (ProcessLookupError, OSError):
-                proc.kill()
+    except GeminiTimeout as exc:
         raise RuntimeError("gemini translation timed out") from exc
-    except Exception:
-        if proc:
-            try:
-                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
-            except (ProcessLookupError, OSError):
-                proc.kill()
-        raise
+
+    match = re.search(r"\[.*\]", ai_output, re.DOTALL)
+    if not match:
+        raise RuntimeError(f"could not parse JSON array from response: {ai_output[:200]}")
+    return json.loads(match.group(0))
 
 
 def normalize_batch_results(batch_items, raw_results, *, mode):
@@ -158,7 +144,7 @@ def normalize_batch_results(batch_items, raw_results, *, mode):
     return [normalized_by_id[item_id] for item_id in expected_ids]
 
 
-def translate_batch(batch_items, *, mode, retry_count=0):
+def translate_batch(batch_items, *, mode, retry_count=0, key_offset=0):
     if not batch_items:
         return []
     max_attempts = GEMINI_KEYS.attempt_count_for_model(TRANSLATION_MODEL, MAX_RETRIES)
@@ -210,12 +196,12 @@ OUTPUT FORMAT:
 """
 
     try:
-        result = gemini_json_request(prompt, attempt_index=retry_count)
+        result = gemini_json_request(prompt, attempt_index=key_offset + retry_count)
         return normalize_batch_results(batch_items, result, mode=mode)
     except Exception:
         if retry_count < max_attempts - 1:
             time.sleep(5)
-            return translate_batch(batch_items, mode=mode, retry_count=retry_count + 1)
+            return translate_batch(batch_items, mode=mode, retry_count=retry_count + 1, key_offset=key_offset)
         raise
 
 
@@ -234,26 +220,57 @@ def main():
     parser.add_argument("translations_json")
     parser.add_argument("--success-batch-size", type=int, default=30)
     parser.add_argument("--failed-batch-size", type=int, default=30)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=f"Batches in flight at once; default one per eligible Gemini key, at most {MAX_CONCURRENT_BATCHES}",
+    )
     args = parser.parse_args()
 
-    archive = load_json(args.archive_json)
+    archive = load_archive(args.archive_json)
     translations = load_json(args.translations_json)
     translations.setdefault("success_translations", {})
     translations.setdefault("failed_candidate_translations", {})
 
     success_requests, failed_requests = build_missing_requests(archive, translations)
+    MEMORY.load()
+    pending_success = recall_translations(translations, success_requests, mode="success")
+    pending_failed = recall_translations(translations, failed_requests, mode="failed")
+    remembered = len(success_requests) + len(failed_requests) - len(pending_success) - len(pending_failed)
     translated_success = 0
     translated_failed = 0
 
-    for batch in chunked(success_requests, args.success_batch_size):
-        results = translate_batch(batch, mode="success")
-        apply_results(translations, results, mode="success")
-        translated_success += len(results)
+    batches = [(batch, "success") for batch in chunked(pending_success, args.success_batch_size)]
+    batches += [(batch, "failed") for batch in chunked(pending_failed, args.failed_batch_size)]
+    concurrency = args.concurrency or GEMINI_KEYS.concurrency_for_model(TRANSLATION_MODEL, MAX_CONCURRENT_BATCHES)
 
-    for batch in chunked(failed_requests, args.failed_batch_size):
-        results = translate_batch(batch, mode="failed")
-        apply_results(translations, results, mode="failed")
-        translated_failed += len(results)
+    def run_batch(index):
+        batch, mode = batches[index]
+        return translate_batch(batch, mode=mode, key_offset=index)
+
+    # Every batch runs to completion; each successful one is applied (in batch order) and
+    # remembered, and the translations are written before a failed batch fails the run.
+    failed_batches = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(run_batch, index) for index in range(len(batches))]
+            for (batch, mode), future in zip(batches, futures):
+                try:
+                    results = future.result()
+                except Exception as exc:
+                    print(f"❌ {mode} batch of {len(batch)} item(s) failed: {exc}")
+                    failed_batches.append(mode)
+                    continue
+                apply_results(translations, results, mode=mode)
+                for request, row in zip(batch, results):
+                    MEMORY.store(request[SOURCE_FIELDS[mode]], row["translation"])
+                if mode == "success":
+                    translated_success += len(results)
+                else:
+                    translated_failed += len(results)
+    finally:
+        MEMORY.save()
 
     write_json(args.translations_json, translations)
 
@@ -261,14 +278,17 @@ def main():
         {
             "success_requested": len(success_requests),
             "failed_requested": len(failed_requests),
+            "from_translation_memory": remembered,
             "success_translated": translated_success,
             "failed_translated": translated_failed,
+            "batches_failed": len(failed_batches),
             "translations_json": args.translations_json,
         },
         ensure_ascii=False,
         indent=2,
     ))
+    return 1 if failed_batches else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""zh-TW translation memory shared by the news and X post translators.
+
+Entries are keyed by the SHA-256 of the model name and the normalized source
+text (Unicode NFC, whitespace collapsed), so a Techmeme headline that is still
+on the front page tomorrow, or an X post seen again, is served from
+``reports/translation_memory.json`` without a Gemini call. Saving merges with
+the file on disk and keeps the ``max_entries`` most recently used entries.
+
+    python3 scripts/translation_memory.py        # entry count and size
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MEMORY_PATH = ROOT / "reports/translation_memory.json"
+MEMORY_PATH_ENV = "DAILY_CURATION_TRANSLATION_MEMORY_FILE"
+MEMORY_VERSION = 1
+DEFAULT_MAX_ENTRIES = 20000
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    return WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def memory_key(text, model):
+    return hashlib.sha256(f"{model}\n{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+def default_memory_path():
+    override = (os.environ.get(MEMORY_PATH_ENV) or "").strip()
+    return Path(override).expanduser() if override else MEMORY_PATH
+
+
+class TranslationMemory:
+    def __init__(self, path=None, model=None):
+        self.path = Path(path) if path else default_memory_path()
+        self.model = model
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def load(self):
+        self.entries = read_entries(self.path)
+        return self
+
+    def lookup(self, text, model=None):
+        """Return the cached translation of ``text`` (``""`` for blank text) or ``None``."""
+        if not normalize_text(text):
+            return ""
+        key = memory_key(text, model or self.model)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry["last_used_at"] = datetime.now().astimezone().isoformat()
+            self.hits += 1
+            return entry["translation"]
+
+    def store(self, text, translation, model=None):
+        translation = (translation or "").strip()
+        if not normalize_text(text) or not translation:
+            return
+        now = datetime.now().astimezone().isoformat()
+        with self.lock:
+            self.entries[memory_key(text, model or self.model)] = {
+                "translation": translation,
+                "model": model or self.model,
+                "created_at": now,
+                "last_used_at": now,
+            }
+            self.stored += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "stored": self.stored, "entries": len(self.entries)}
+
+    def save(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """Merge with the file on disk (latest use wins), evict least recently used beyond ``max_entries``."""
+        on_disk = read_entries(self.path)
+        with self.lock:
+            merged = dict(on_disk)
+            for key, entry in self.entries.items():
+                other = merged.get(key)
+                if other is None or other.get("last_used_at", "") <= entry.get("last_used_at", ""):
+                    merged[key] = entry
+            if len(merged) > max_entries:
+                newest = sorted(merged.items(), key=lambda item: item[1].get("last_used_at", ""), reverse=True)
+                merged = dict(newest[:max_entries])
+            self.entries = merged
+            text = json.dumps({"version": MEMORY_VERSION, "entries": merged}, ensure_ascii=False, indent=2) + "\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(text, encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+
+def read_entries(path):
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if payload.get("version") != MEMORY_VERSION:
+        return {}
+    return payload.get("entries") or {}
+
+
+def main():
+    path = default_memory_path()
+    entries = read_entries(path)
+    size = path.stat().st_size if path.exists() else 0
+    print(json.dumps({"path": str(path), "entries": len(entries), "bytes": size}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
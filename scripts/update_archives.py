@@ -2,6 +2,8 @@ import os
 import re
 import sys
 
+from archive_manifest import snapshots
+
 ARCHIVE_DIR = 'archives'
 INDEX_FILE = 'index.html'
 
@@ -10,22 +12,22 @@ def main():
         print(f"⚠️ 找不到 {ARCHIVE_DIR} 資料夾。")
         sys.exit(1)
 
-    files = [f for f in os.listdir(ARCHIVE_DIR) if f.endswith('.html')]
-    files.sort(reverse=True)  # 從最新排到最舊
+    # 純日報清單來自 archives/manifest.json，從最新排到最舊
+    entries = snapshots(ARCHIVE_DIR, "daily")
+    entries.reverse()
 
     daily_links = []
 
-    for filename in files:
-        # 純日報 (嚴格比對 YYYY-MM-DD.html)
-        if re.match(r'^\d{4}-\d{2}-\d{2}\.html$', filename):
-            date_str = filename.replace('.html', '')
-            import datetime
-            today_str = datetime.datetime.now().strftime('%Y-%m-%d')
-            
-            if date_str == today_str:
-                daily_links.append(f'<li><a href="index.html">📄 {date_str} (今日)</a></li>')
-            else:
-                daily_links.append(f'<li><a href="archives/{filename}">📄 {date_str}</a></li>')
+    for entry in entries:
+        filename = entry['file']
+        date_str = entry['date']
+        import datetime
+        today_str = datetime.datetime.now().strftime('%Y-%m-%d')
+
+        if date_str == today_str:
+            daily_links.append(f'<li><a href="index.html">📄 {date_str} (今日)</a></li>')
+        else:
+            daily_links.append(f'<li><a href="archives/{filename}">📄 {date_str}</a></li>')
 
     # 組合 HTML
     daily_html = "\n                " + "\n                ".join(daily_links) if daily_links else "<li>尚無日報存檔</li>"
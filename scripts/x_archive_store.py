@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Append-only storage for the cumulative X watch archive.
+
+``reports/x_watch_archive_latest.json`` is the last compacted snapshot. Every
+run appends only the rows it inserted or touched to
+``x_watch_archive_latest.journal.jsonl`` (one ``upsert`` record per row, keyed
+by its position, plus ``meta`` records for top-level fields). Readers call
+``load_archive`` to get the snapshot with the journal replayed. The identity
+index (google_news_url / post_url / post_id -> position) persists in
+``x_watch_archive_latest.index.json`` and is reused while the snapshot and
+journal it was built from are unchanged.
+
+``compact`` folds the journal into a new snapshot; the workflow runs it once
+the journal grows past a configured number of rows, or run it by hand:
+
+    python3 scripts/x_archive_store.py compact reports/x_watch_archive_latest.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+INDEX_SUFFIX = ".index.json"
+INDEX_VERSION = 1
+DEFAULT_COMPACT_AFTER_ROWS = 2000
+
+
+def row_identity_candidates(row):
+    candidates = []
+    if row.get("google_news_url"):
+        candidates.append(("google_news_url", row["google_news_url"]))
+    if row.get("post_url"):
+        candidates.append(("post_url", row["post_url"]))
+    if row.get("post_id"):
+        candidates.append(("post_id", str(row["post_id"])))
+    return candidates
+
+
+def row_quality_score(row):
+    score = 0
+    if row.get("extraction_status") == "text_extracted":
+        score += 1000
+    if row.get("post_url"):
+        score += 100
+    if row.get("full_text_confident"):
+        score += 50
+    if row.get("text"):
+        score += min(len(row["text"]), 400)
+    if row.get("is_truncated"):
+        score -= 20
+    return score
+
+
+def build_archive_entry(row, seen_at):
+    entry = dict(row)
+    entry["archive_key"] = row.get("post_url") or row.get("google_news_url")
+    entry["first_seen_at"] = seen_at
+    entry["last_seen_at"] = seen_at
+    entry["last_seen_in_run_at"] = seen_at
+    entry["seen_count"] = 1
+    return entry
+
+
+def merge_archive_row(existing, incoming, seen_at):
+    existing_score = row_quality_score(existing)
+    incoming_score = row_quality_score(incoming)
+    if incoming_score >= existing_score:
+        merged = dict(existing)
+        merged.update(incoming)
+        updated = True
+    else:
+        merged = dict(existing)
+        updated = False
+
+    merged["archive_key"] = (
+        existing.get("archive_key")
+        or incoming.get("post_url")
+        or incoming.get("google_news_url")
+        or existing.get("post_url")
+        or existing.get("google_news_url")
+    )
+    merged["first_seen_at"] = existing.get("first_seen_at", seen_at)
+    merged["last_seen_at"] = seen_at
+    merged["last_seen_in_run_at"] = seen_at
+    merged["seen_count"] = int(existing.get("seen_count", 1)) + 1
+    return merged, updated
+
+
+def identity_key(kind, value):
+    return f"{kind}:{value}"
+
+
+def journal_path_for(snapshot_path):
+    return Path(snapshot_path).with_suffix(JOURNAL_SUFFIX)
+
+
+def index_path_for(snapshot_path):
+    return Path(snapshot_path).with_suffix(INDEX_SUFFIX)
+
+
+def file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def read_journal(path):
+    """Yield journal records; a torn final line from an interrupted append is skipped."""
+    path = Path(path)
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def apply_record(payload, record):
+    rows = payload["rows"]
+    if record.get("op") == "upsert":
+        position = int(record["pos"])
+        while len(rows) <= position:
+            rows.append({})
+        rows[position] = record["row"]
+    elif record.get("op") == "meta":
+        payload.update(record.get("fields") or {})
+
+
+def load_archive(snapshot_path):
+    """Return the archive payload (``generated_at``, ``rows``, ``stats``) with the journal replayed."""
+    return XArchiveStore(snapshot_path, with_index=False).payload
+
+
+def write_json_atomic(path, payload):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+class XArchiveStore:
+    def __init__(self, snapshot_path, with_index=True):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = journal_path_for(self.snapshot_path)
+        self.index_path = index_path_for(self.snapshot_path)
+        self.payload = {"generated_at": None, "rows": [], "stats": {}}
+        if self.snapshot_path.exists():
+            self.payload = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            self.payload.setdefault("rows", [])
+
+        self.journal_rows = 0
+        for record in read_journal(self.journal_path):
+            apply_record(self.payload, record)
+            if record.get("op") == "upsert":
+                self.journal_rows += 1
+
+        self.pending_rows = {}
+        self.pending_meta = {}
+        self.index = None
+        if with_index:
+            self.index = self.load_index()
+            if self.index is None:
+                self.index = self.build_index()
+
+    @property
+    def rows(self):
+        return self.payload["rows"]
+
+    def exists(self):
+        return self.snapshot_path.exists() or self.journal_path.exists()
+
+    def index_signature(self):
+        return {
+            "snapshot": file_signature(self.snapshot_path),
+            "journal": file_signature(self.journal_path),
+            "rows": len(self.rows),
+        }
+
+    def load_index(self):
+        if not self.index_path.exists():
+            return None
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if payload.get("version") != INDEX_VERSION or payload.get("signature") != self.index_signature():
+            return None
+        return payload.get("keys") or {}
+
+    def build_index(self):
+        index = {}
+        for position, row in enumerate(self.rows):
+            for kind, value in row_identity_candidates(row):
+                index[identity_key(kind, value)] = position
+        return index
+
+    def save_index(self):
+        write_json_atomic(
+            self.index_path,
+            {"version": INDEX_VERSION, "signature": self.index_signature(), "keys": self.index},
+        )
+
+    def match(self, row):
+        for kind, value in row_identity_candidates(row):
+            position = self.index.get(identity_key(kind, value))
+            if position is not None:
+                return position
+        return None
+
+    def put_row(self, position, row):
+        """Store ``row`` at ``position`` (``None`` appends) and queue it for the journal."""
+        if position is None:
+            self.rows.append(row)
+            position = len(self.rows) - 1
+        else:
+            self.rows[position] = row
+        for kind, value in row_identity_candidates(row):
+            self.index[identity_key(kind, value)] = position
+        self.pending_rows[position] = row
+        return position
+
+    def upsert_rows(self, incoming_rows, seen_at):
+        stats = {"new_rows_added": 0, "rows_upgraded": 0, "rows_seen_again": 0}
+        for incoming in incoming_rows:
+            position = self.match(incoming)
+            if position is None:
+                self.put_row(None, build_archive_entry(incoming, seen_at))
+                stats["new_rows_added"] += 1
+                continue
+
+            merged_entry, updated = merge_archive_row(self.rows[position], incoming, seen_at)
+            self.put_row(position, merged_entry)
+            if updated:
+                stats["rows_upgraded"] += 1
+            else:
+                stats["rows_seen_again"] += 1
+        return stats
+
+    def set_meta(self, **fields):
+        self.payload.update(fields)
+        self.pending_meta.update(fields)
+
+    def flush(self):
+        """Append queued rows and meta fields to the journal, then persist the index."""
+        if not self.pending_rows and not self.pending_meta:
+            return 0
+        lines = [
+            json.dumps({"op": "upsert", "pos": position, "row": row}, ensure_ascii=False)
+            for position, row in sorted(self.pending_rows.items())
+        ]
+        if self.pending_meta:
+            lines.append(json.dumps({"op": "meta", "fields": self.pending_meta}, ensure_ascii=False))
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        written = len(self.pending_rows)
+        self.journal_rows += written
+        self.pending_rows = {}
+        self.pending_meta = {}
+        if self.index is not None:
+            self.save_index()
+        return written
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and start an empty journal."""
+        self.pending_rows = {}
+        self.pending_meta = {}
+        write_json_atomic(self.snapshot_path, self.payload)
+        # Replaying a journal over the snapshot it was folded into is idempotent,
+        # so a crash between these two steps loses nothing.
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.journal_rows = 0
+        if self.index is not None:
+            self.save_index()
+
+    def maybe_compact(self, after_rows=DEFAULT_COMPACT_AFTER_ROWS):
+        if self.journal_rows >= after_rows:
+            self.compact()
+            return True
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or compact the X watch archive journal.")
+    parser.add_argument("command", choices=("compact", "stats"))
+    parser.add_argument("archive_json", nargs="?", default="reports/x_watch_archive_latest.json")
+    args = parser.parse_args()
+
+    store = XArchiveStore(args.archive_json)
+    journal_rows = store.journal_rows
+    if args.command == "compact":
+        store.compact()
+    print(json.dumps(
+        {
+            "archive_json": str(store.snapshot_path),
+            "rows": len(store.rows),
+            "journal_rows": journal_rows,
+            "compacted": args.command == "compact",
+            "checked_at": datetime.now().astimezone().isoformat(),
+        },
+        ensure_ascii=False,
+        indent=2,
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Google News URL -> decoded X post cache for the X watch workflow.
+
+``reports/x_watch_decode_cache.json`` is the single source of truth: entries
+are keyed by ``google_news_url`` and carry ``last_used_at`` so saving can
+evict entries past their TTL and, beyond ``max_entries``, the least recently
+used ones. Version 1 caches were rebuilt on every load by rescanning every
+``x_watch_results_*.json``; that scan now runs once, as a migration.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+CACHE_VERSION = 2
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def build_cache_entry(row, generated_at):
+    return {
+        "cached_from_generated_at": generated_at,
+        "google_news_url": row.get("google_news_url"),
+        "decoded_source_url": row.get("decoded_source_url"),
+        "post_url": row.get("post_url"),
+        "post_id": row.get("post_id"),
+        "screen_name": row.get("screen_name"),
+        "author_name": row.get("author_name"),
+        "author_url": row.get("author_url"),
+        "text": row.get("text"),
+        "text_length": row.get("text_length", 0),
+        "is_truncated": row.get("is_truncated", False),
+        "full_text_confident": row.get("full_text_confident", False),
+        "extraction_status": row.get("extraction_status"),
+        "oembed_status_code": row.get("oembed_status_code"),
+        "oembed_endpoint": row.get("oembed_endpoint"),
+    }
+
+
+def now_iso():
+    return datetime.now().astimezone().isoformat()
+
+
+def parse_timestamp(value):
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def entry_last_used(entry):
+    return (
+        parse_timestamp(entry.get("last_used_at"))
+        or parse_timestamp(entry.get("cached_from_generated_at"))
+        or datetime.fromtimestamp(0).astimezone()
+    )
+
+
+def add_result_rows(entries, result, used_at):
+    """Cache every extracted row of a discover result; return how many were added."""
+    added = 0
+    for row in result.get("rows", []):
+        if row.get("extraction_status") != "text_extracted":
+            continue
+        google_news_url = row.get("google_news_url")
+        if not google_news_url:
+            continue
+        entry = build_cache_entry(row, result.get("generated_at"))
+        entry["last_used_at"] = used_at
+        entries[google_news_url] = entry
+        added += 1
+    return added
+
+
+def migrate_from_results(entries, reports_dir):
+    """One-time import of the rows v1 caches rebuilt from every results file."""
+    for path in sorted(Path(reports_dir).glob("x_watch_results_*.json"), key=lambda item: item.stat().st_mtime):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        add_result_rows(entries, payload, payload.get("generated_at") or now_iso())
+
+
+def load_decode_cache(path, reports_dir=None):
+    """Load the cache in O(entries); v1 files are migrated from the results history once."""
+    path = Path(path)
+    payload = {}
+    if path.exists():
+        payload = json.loads(path.read_text(encoding="utf-8"))
+
+    entries = dict(payload.get("entries", {}))
+    if payload.get("version") != CACHE_VERSION:
+        if reports_dir is not None:
+            migrate_from_results(entries, reports_dir)
+        for entry in entries.values():
+            entry.setdefault("last_used_at", entry.get("cached_from_generated_at"))
+
+    return {
+        "version": CACHE_VERSION,
+        "generated_at": now_iso(),
+        "entries": entries,
+    }
+
+
+def update_decode_cache(cache_payload, result):
+    entries = dict(cache_payload.get("entries", {}))
+    add_result_rows(entries, result, now_iso())
+    return {
+        "version": CACHE_VERSION,
+        "generated_at": now_iso(),
+        "entries": entries,
+    }
+
+
+def touch_entry(entry):
+    entry["last_used_at"] = now_iso()
+
+
+def evict_entries(entries, *, ttl_days=DEFAULT_TTL_DAYS, max_entries=DEFAULT_MAX_ENTRIES):
+    """Drop entries unused for ``ttl_days``, then the least recently used past ``max_entries``."""
+    cutoff = datetime.now().astimezone() - timedelta(days=ttl_days)
+    kept = {url: entry for url, entry in entries.items() if entry_last_used(entry) >= cutoff}
+    if max_entries is not None and len(kept) > max_entries:
+        newest = sorted(kept.items(), key=lambda item: entry_last_used(item[1]), reverse=True)[:max_entries]
+        kept = dict(newest)
+    return kept, len(entries) - len(kept)
+
+
+def save_decode_cache(path, cache_payload, *, ttl_days=DEFAULT_TTL_DAYS, max_entries=DEFAULT_MAX_ENTRIES):
+    path = Path(path)
+    entries, evicted = evict_entries(cache_payload.get("entries", {}), ttl_days=ttl_days, max_entries=max_entries)
+    payload = {
+        "version": CACHE_VERSION,
+        "generated_at": now_iso(),
+        "entries": entries,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp_path, path)
+    cache_payload.update(payload)
+    return evicted
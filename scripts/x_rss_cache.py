@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Validators, parsed items and known outcomes per Google News RSS URL.
+
+``discover_public_x_posts.fetch_rss_feed`` sends ``If-None-Match`` /
+``If-Modified-Since`` from here and, on a 304 (or a body whose hash has not
+changed), reuses the stored parse instead of the response. Rows that were
+already resolved for an unchanged feed are kept as ``outcomes`` so the next
+pass can skip their decode and oEmbed requests.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+CACHE_VERSION = 1
+DEFAULT_TTL_HOURS = 72
+
+
+def body_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RssCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, url):
+        with self.lock:
+            entry = self.entries.get(url)
+            return copy.deepcopy(entry) if entry else None
+
+    def conditional_headers(self, url):
+        with self.lock:
+            entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, *, etag, last_modified, digest, items):
+        """Record a fresh parse; outcomes survive only for items still in the feed."""
+        with self.lock:
+            previous = self.entries.get(url) or {}
+            live_urls = {item.get("google_news_url") for item in items}
+            outcomes = {
+                key: row for key, row in (previous.get("outcomes") or {}).items() if key in live_urls
+            }
+            self.entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body_sha256": digest,
+                "items": copy.deepcopy(items),
+                "outcomes": outcomes,
+                "fetched_at": datetime.now().astimezone().isoformat(),
+            }
+
+    def touch(self, url):
+        with self.lock:
+            if url in self.entries:
+                self.entries[url]["fetched_at"] = datetime.now().astimezone().isoformat()
+
+    def record_outcomes(self, url, rows):
+        """Remember rows with final text for this feed, keyed by their google_news_url."""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return
+            for row in rows:
+                if row.get("extraction_status") == "text_extracted" and row.get("google_news_url"):
+                    entry.setdefault("outcomes", {})[row["google_news_url"]] = copy.deepcopy(row)
+
+    def load(self, path):
+        path = Path(path)
+        if not path.exists():
+            return False
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return False
+        if payload.get("version") != CACHE_VERSION:
+            return False
+        with self.lock:
+            self.entries.update(payload.get("entries") or {})
+        return True
+
+    def save(self, path, ttl_hours=DEFAULT_TTL_HOURS):
+        """Write the cache atomically, dropping feeds not fetched within ``ttl_hours``.
+
+        Entries already on disk (e.g. from a discover subprocess) are merged:
+        the newer fetch wins and known outcomes are combined.
+        """
+        path = Path(path)
+        on_disk = RssCache()
+        on_disk.load(path)
+        cutoff = datetime.now().astimezone() - timedelta(hours=ttl_hours)
+        with self.lock:
+            merged = dict(on_disk.entries)
+            for url, entry in self.entries.items():
+                other = merged.get(url)
+                if other and other["fetched_at"] > entry["fetched_at"]:
+                    other.setdefault("outcomes", {}).update(
+                        {key: row for key, row in entry.get("outcomes", {}).items() if key not in other["outcomes"]}
+                    )
+                else:
+                    if other:
+                        live_urls = {item.get("google_news_url") for item in entry.get("items", [])}
+                        for key, row in other.get("outcomes", {}).items():
+                            if key in live_urls:
+                                entry.setdefault("outcomes", {}).setdefault(key, row)
+                    merged[url] = entry
+            entries = {
+                url: entry
+                for url, entry in merged.items()
+                if datetime.fromisoformat(entry["fetched_at"]) >= cutoff
+            }
+            payload = {"version": CACHE_VERSION, "entries": entries}
+            text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(text, encoding="utf-8")
+        os.replace(temp_path, path)
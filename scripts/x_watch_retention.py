@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Retention for the raw per-run files the X watch workflow leaves in reports/.
+
+Every run writes ``x_watch_results_<ts>.json``, ``x_watch_translations_<ts>.json``,
+``x_watch_translations_missing_<ts>.json``, ``x_watch_trace_<ts>.json`` and an
+``x_watch_runs_<ts>/`` directory. Once they are older than the retention
+window their content is folded into the stores the loaders read — the
+archive journal, the decode cache and ``x_watch_translations_latest.json`` —
+and the raw files are deleted. Hand-dropped ``x_post_translations*.json``
+files are folded into the translations store the same way; only the newest
+one is kept:
+
+    python3 scripts/x_watch_retention.py --days 14 --dry-run
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from x_archive_store import XArchiveStore
+from x_decode_cache import add_result_rows, load_decode_cache, save_decode_cache
+
+
+DEFAULT_RETENTION_DAYS = 14
+RAW_RUN_PATTERN = re.compile(
+    r"^x_watch_(?P<kind>results|translations_missing|translations|trace|runs)_(?P<ts>\d{8}_\d{6})(?:\.json)?$"
+)
+POST_TRANSLATIONS_GLOB = "x_post_translations*.json"
+TRANSLATION_KEYS = ("success_translations", "failed_candidate_translations")
+
+
+def raw_run_files(reports_dir):
+    """Yield ``(kind, run timestamp, path)`` for every raw per-run file or directory."""
+    reports_dir = Path(reports_dir)
+    if not reports_dir.is_dir():
+        return
+    for path in reports_dir.iterdir():
+        match = RAW_RUN_PATTERN.match(path.name)
+        if not match:
+            continue
+        try:
+            run_at = datetime.strptime(match.group("ts"), "%Y%m%d_%H%M%S").astimezone()
+        except ValueError:
+            run_at = datetime.fromtimestamp(path.stat().st_mtime).astimezone()
+        yield match.group("kind"), run_at, path
+
+
+def expired_run_files(reports_dir, days, now=None):
+    cutoff = (now or datetime.now().astimezone()) - timedelta(days=days)
+    expired = [(kind, run_at, path) for kind, run_at, path in raw_run_files(reports_dir) if run_at < cutoff]
+    expired.sort(key=lambda item: item[1])
+    return expired
+
+
+def post_translation_files(reports_dir):
+    """``x_post_translations*.json`` files, oldest first; all but the last are superseded."""
+    reports_dir = Path(reports_dir)
+    if not reports_dir.is_dir():
+        return []
+    return sorted(reports_dir.glob(POST_TRANSLATIONS_GLOB), key=lambda path: path.stat().st_mtime)
+
+
+def fold_results(store, decode_entries, payload):
+    """Add rows the archive and decode cache do not know yet; known rows are left untouched."""
+    seen_at = payload.get("generated_at") or datetime.now().astimezone().isoformat()
+    missing = [row for row in payload.get("rows", []) if store.match(row) is None]
+    added = store.upsert_rows(missing, seen_at)["new_rows_added"] if missing else 0
+    unknown = {
+        "generated_at": payload.get("generated_at"),
+        "rows": [row for row in payload.get("rows", []) if row.get("google_news_url") not in decode_entries],
+    }
+    # Entries keep the run's timestamp as last use, so TTL eviction still applies to them.
+    cached = add_result_rows(decode_entries, unknown, seen_at)
+    return added, cached
+
+
+def fold_translations(known, payload):
+    added = 0
+    for key in TRANSLATION_KEYS:
+        target = known.setdefault(key, {})
+        for item_key, value in (payload.get(key) or {}).items():
+            if item_key not in target:
+                target[item_key] = value
+                added += 1
+    return added
+
+
+def load_json_or_none(path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def write_json_atomic(path, payload):
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def apply_retention(
+    reports_dir,
+    *,
+    days=DEFAULT_RETENTION_DAYS,
+    archive_path=None,
+    decode_cache_path=None,
+    translations_path=None,
+    decode_cache_ttl_days=None,
+    decode_cache_max_entries=None,
+    dry_run=False,
+):
+    """Fold expired raw run files into the stores, then delete them; return counts."""
+    reports_dir = Path(reports_dir)
+    archive_path = Path(archive_path or reports_dir / "x_watch_archive_latest.json")
+    decode_cache_path = Path(decode_cache_path or reports_dir / "x_watch_decode_cache.json")
+    translations_path = Path(translations_path or reports_dir / "x_watch_translations_latest.json")
+
+    expired = expired_run_files(reports_dir, days)
+    post_translations = post_translation_files(reports_dir)
+    expired += [("post_translations", None, path) for path in post_translations[:-1]]
+    stats = {
+        "retention_days": days,
+        "expired_files": len(expired),
+        "archive_rows_added": 0,
+        "decode_cache_rows_added": 0,
+        "translations_added": 0,
+        "deleted": 0,
+        "bytes_freed": 0,
+        "dry_run": dry_run,
+    }
+    if not expired:
+        return stats
+
+    store = XArchiveStore(archive_path)
+    decode_cache = load_decode_cache(decode_cache_path)
+    known_translations = load_json_or_none(translations_path) or {key: {} for key in TRANSLATION_KEYS}
+
+    for kind, _run_at, path in expired:
+        if kind == "results":
+            payload = load_json_or_none(path)
+            if payload:
+                added, cached = fold_results(store, decode_cache["entries"], payload)
+                stats["archive_rows_added"] += added
+                stats["decode_cache_rows_added"] += cached
+        elif kind in ("translations", "post_translations"):
+            payload = load_json_or_none(path)
+            if payload:
+                stats["translations_added"] += fold_translations(known_translations, payload)
+
+    if stats["translations_added"] and post_translations:
+        # Rewriting the store makes it newer than the kept file, which the workflow
+        # would then stop reading; fold that file in too (it stays on disk).
+        stats["translations_added"] += fold_translations(known_translations, load_json_or_none(post_translations[-1]) or {})
+
+    if dry_run:
+        return stats
+
+    if stats["archive_rows_added"]:
+        store.set_meta(generated_at=datetime.now().astimezone().isoformat())
+        store.flush()
+    if stats["decode_cache_rows_added"]:
+        options = {}
+        if decode_cache_ttl_days is not None:
+            options["ttl_days"] = decode_cache_ttl_days
+        if decode_cache_max_entries is not None:
+            options["max_entries"] = decode_cache_max_entries
+        save_decode_cache(decode_cache_path, decode_cache, **options)
+    if stats["translations_added"]:
+        write_json_atomic(translations_path, known_translations)
+
+    # Only delete once everything the files held is durable in the stores.
+    for _kind, _run_at, path in expired:
+        if path.is_dir():
+            size = sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+            shutil.rmtree(path)
+        else:
+            size = path.stat().st_size
+            path.unlink()
+        stats["deleted"] += 1
+        stats["bytes_freed"] += size
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fold old X watch run files into the stores and delete them.")
+    parser.add_argument("--reports-dir", default="reports")
+    parser.add_argument("--days", type=float, default=DEFAULT_RETENTION_DAYS, help="Keep raw run files this many days")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be folded and deleted")
+    args = parser.parse_args()
+
+    stats = apply_retention(args.reports_dir, days=args.days, dry_run=args.dry_run)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Per-phase spans for X watch runs.
+
+``TRACER`` is shared by the workflow and ``discover_public_x_posts``; it does
+nothing until ``start()`` is called. Spans have a ``kind``:
+
+- ``stage``: a workflow step (preflight, primary, rerun, translation, ...)
+- ``handle``: one discover pass over one handle
+- ``http``: one request attempt, named by endpoint family, with status and bytes
+- ``sleep``: a throttle, cool-down, backoff or rate-limit wait, named by reason
+
+Spans started while a handle is bound (``bind``) are attributed to it. The
+workflow writes ``reports/x_watch_trace_<timestamp>.json`` for every run;
+print the wall-clock table of an existing trace with:
+
+    python3 scripts/x_watch_trace.py reports/x_watch_trace_<timestamp>.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+TRACE_VERSION = 1
+
+
+class Tracer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset(enabled=False)
+
+    def reset(self, enabled):
+        with self.lock:
+            self.enabled = enabled
+            self.spans = []
+            self.started_at = time.time()
+            self.started_monotonic = time.monotonic()
+            self.open_stage = None
+
+    def start(self):
+        self.reset(enabled=True)
+
+    def offset(self, monotonic_value):
+        return round(monotonic_value - self.started_monotonic, 4)
+
+    @contextmanager
+    def bind(self, handle):
+        previous = getattr(self.local, "handle", None)
+        self.local.handle = handle
+        try:
+            yield
+        finally:
+            self.local.handle = previous
+
+    def current_handle(self):
+        return getattr(self.local, "handle", None)
+
+    def append(self, record):
+        with self.lock:
+            self.spans.append(record)
+
+    @contextmanager
+    def span(self, name, *, kind="stage", handle=None, **attrs):
+        """Time the enclosed block; the yielded dict takes extra attributes (status, bytes, ...)."""
+        record = {"kind": kind, "name": name, "handle": handle or self.current_handle(), **attrs}
+        if not self.enabled:
+            yield record
+            return
+        started = time.monotonic()
+        try:
+            yield record
+        except BaseException as exc:
+            record.setdefault("error", getattr(exc, "label", None) or type(exc).__name__)
+            raise
+        finally:
+            ended = time.monotonic()
+            record["start"] = self.offset(started)
+            record["end"] = self.offset(ended)
+            record["seconds"] = round(ended - started, 4)
+            record["thread"] = threading.current_thread().name
+            self.append(record)
+
+    def stage(self, name):
+        """Close the running stage (if any) and start ``name``; for long sequential mains."""
+        self.end_stage()
+        if self.enabled:
+            self.open_stage = (name, time.monotonic())
+
+    def end_stage(self):
+        if self.open_stage is None:
+            return
+        name, started = self.open_stage
+        self.open_stage = None
+        ended = time.monotonic()
+        self.append(
+            {
+                "kind": "stage",
+                "name": name,
+                "handle": None,
+                "start": self.offset(started),
+                "end": self.offset(ended),
+                "seconds": round(ended - started, 4),
+                "thread": threading.current_thread().name,
+            }
+        )
+
+    def record_sleep(self, seconds, reason, handle=None):
+        if not self.enabled or seconds <= 0:
+            return
+        ended = time.monotonic()
+        self.append(
+            {
+                "kind": "sleep",
+                "name": reason,
+                "handle": handle or self.current_handle(),
+                "start": self.offset(ended - seconds),
+                "end": self.offset(ended),
+                "seconds": round(seconds, 4),
+                "thread": threading.current_thread().name,
+            }
+        )
+
+    def sleep(self, seconds, reason, handle=None):
+        time.sleep(seconds)
+        self.record_sleep(seconds, reason, handle)
+
+    def merge(self, payload):
+        """Fold a child process's trace (e.g. a discover subprocess) into this one."""
+        if not self.enabled or not payload:
+            return
+        shift = float(payload.get("started_at") or self.started_at) - self.started_at
+        for record in payload.get("spans", []):
+            record = dict(record)
+            record["start"] = round(record.get("start", 0.0) + shift, 4)
+            record["end"] = round(record.get("end", 0.0) + shift, 4)
+            self.append(record)
+
+    def to_payload(self, **meta):
+        self.end_stage()
+        with self.lock:
+            spans = sorted(self.spans, key=lambda record: record["start"])
+        wall_clock = round(time.monotonic() - self.started_monotonic, 4)
+        return {
+            "version": TRACE_VERSION,
+            "started_at": self.started_at,
+            "started_at_iso": datetime.fromtimestamp(self.started_at).astimezone().isoformat(),
+            "wall_clock_seconds": wall_clock,
+            **meta,
+            "summary": summarize_spans(spans, wall_clock),
+            "spans": spans,
+        }
+
+    def write(self, path, **meta):
+        path = Path(path)
+        payload = self.to_payload(**meta)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        os.replace(temp_path, path)
+        return payload
+
+
+def summarize_spans(spans, wall_clock_seconds):
+    """Total seconds, counts, bytes and HTTP outcomes per (kind, name) and per handle."""
+    totals = {}
+    handles = {}
+    for record in spans:
+        key = f"{record['kind']}:{record['name']}"
+        entry = totals.setdefault(
+            key,
+            {"kind": record["kind"], "name": record["name"], "count": 0, "seconds": 0.0, "bytes": 0, "errors": 0},
+        )
+        entry["count"] += 1
+        entry["seconds"] += record.get("seconds", 0.0)
+        entry["bytes"] += record.get("bytes") or 0
+        if record.get("error") or (record.get("status") or 0) >= 400:
+            entry["errors"] += 1
+        if record["kind"] == "http" and record.get("attempt"):
+            entry["retries"] = entry.get("retries", 0) + 1
+
+        if record.get("handle") and record["kind"] in {"http", "sleep"}:
+            handle_entry = handles.setdefault(record["handle"], {})
+            handle_entry[key] = round(handle_entry.get(key, 0.0) + record.get("seconds", 0.0), 4)
+
+    phases = sorted(totals.values(), key=lambda entry: entry["seconds"], reverse=True)
+    for entry in phases:
+        entry["seconds"] = round(entry["seconds"], 4)
+        entry["share_of_wall_clock"] = round(entry["seconds"] / wall_clock_seconds, 4) if wall_clock_seconds else 0.0
+    return {"phases": phases, "handles": handles}
+
+
+def format_summary_table(payload):
+    """Render where the wall-clock went; http/sleep spans may overlap when handles run in parallel."""
+    lines = [
+        f"trace wall clock: {payload['wall_clock_seconds']:.1f}s",
+        f"{'kind':<7} {'phase':<34} {'count':>6} {'seconds':>10} {'wall%':>7} {'bytes':>11} {'errors':>6}",
+    ]
+    for entry in payload["summary"]["phases"]:
+        lines.append(
+            f"{entry['kind']:<7} {entry['name'][:34]:<34} {entry['count']:>6} {entry['seconds']:>10.1f} "
+            f"{entry['share_of_wall_clock'] * 100:>6.1f}% {entry['bytes']:>11} {entry['errors']:>6}"
+        )
+    return "\n".join(lines)
+
+
+TRACER = Tracer()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the wall-clock breakdown of an X watch trace.")
+    parser.add_argument("trace_json")
+    args = parser.parse_args()
+    payload = json.loads(Path(args.trace_json).read_text(encoding="utf-8"))
+    print(format_summary_table(payload))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())